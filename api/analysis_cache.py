@@ -0,0 +1,153 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from utils.config import ANALYSIS_CACHE_SIZE
+from utils.db_handler import insert_analysis_cache, select_analysis_cache
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def make_cache_key(image_data: bytes, prompt: str, model: str) -> str:
+    """
+    (이미지 바이트, 프롬프트, 모델) 조합의 SHA-256 해시를 캐시 키로 반환.
+    """
+    digest = hashlib.sha256()
+    for part in (model.encode("utf-8"), prompt.encode("utf-8"), image_data):
+        # 경계가 모호해지지 않도록 각 구간 길이를 함께 해싱
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class _InFlight:
+    """
+    동일 키에 대해 진행 중인 API 호출. 후속 요청은 event 로 결과를 기다림.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class AnalysisCache:
+    """
+    GPT 분석 결과 캐시. 메모리 LRU 를 앞단에 두고 DB(analysis_cache 테이블)를 백엔드로 사용.
+    같은 키로 동시에 들어온 요청은 하나의 API 호출 결과를 공유함.
+    """
+
+    def __init__(self, max_size: int = ANALYSIS_CACHE_SIZE):
+        self.max_size = max_size
+        self._lru = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0
+
+    def _remember(self, key: str, value: str) -> None:
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        key: str,
+        model: str,
+        compute: Callable[[], Optional[str]],
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[str]:
+        """
+        캐시에서 key 를 찾고, 없으면 compute() 로 생성해 저장한 뒤 반환.
+        compute() 가 None 을 반환하거나 예외를 던지면 캐시하지 않으며, 예외는 대기 중인 요청에도 전달됨.
+        validate 를 주면 validate(결과) 가 참인 결과만 저장하고, DB 에 남아 있던 통과하지 못하는 결과는 없는 것으로 봄
+        (잘린 응답 등이 저장되어 같은 사진을 다시 분석해도 계속 같은 오류가 나지 않도록).
+        """
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self.memory_hits += 1
+                logger.info(f"분석 캐시 메모리 적중: {key[:12]}")
+                return self._lru[key]
+            in_flight = self._in_flight.get(key)
+            owner = in_flight is None
+            if owner:
+                in_flight = _InFlight()
+                self._in_flight[key] = in_flight
+
+        if not owner:
+            in_flight.event.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            with self._lock:
+                self.shared_hits += 1
+            logger.info(f"분석 캐시 진행 중 요청 공유: {key[:12]}")
+            return in_flight.result
+
+        try:
+            stored = select_analysis_cache(key)
+            if stored is not None and validate is not None and not validate(stored):
+                logger.warning(f"분석 캐시 DB 결과 형식 오류, 다시 분석: {key[:12]}")
+                stored = None
+            if stored is not None:
+                with self._lock:
+                    self.db_hits += 1
+                logger.info(f"분석 캐시 DB 적중: {key[:12]}")
+                self._remember(key, stored)
+                in_flight.result = stored
+                return stored
+
+            started = time.perf_counter()
+            result = compute()
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.misses += 1
+                self.miss_seconds += elapsed
+            if result is not None and validate is not None and not validate(result):
+                logger.warning(f"분석 결과 형식 오류, 캐시하지 않음: {key[:12]}")
+            elif result is not None:
+                insert_analysis_cache(key, model, result)
+                self._remember(key, result)
+            in_flight.result = result
+            return result
+        except Exception as e:
+            in_flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            in_flight.event.set()
+
+    def stats(self) -> dict:
+        """
+        적중/미스 카운터와, 평균 API 지연 시간 기준으로 절약된 시간 추정치를 반환.
+        """
+        with self._lock:
+            hits = self.memory_hits + self.db_hits + self.shared_hits
+            avg_miss = self.miss_seconds / self.misses if self.misses else 0.0
+            return {
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "shared_hits": self.shared_hits,
+                "hits": hits,
+                "misses": self.misses,
+                "hit_rate": hits / (hits + self.misses) if hits + self.misses else 0.0,
+                "avg_miss_seconds": avg_miss,
+                "saved_seconds": hits * avg_miss,
+                "saved_api_calls": hits,
+            }
+
+
+analysis_cache = AnalysisCache()
+
+
+def get_cache_stats() -> dict:
+    return analysis_cache.stats()
@@ -0,0 +1,197 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+from api.food_analysis import clean_response, parse_foods
+from api.openai_api import describe_image
+from utils.config import BATCH_MAX_RETRIES, BATCH_MAX_WORKERS, BATCH_RATE_PER_MINUTE
+from utils.db_handler import insert_analysis_results
+from utils.image_store import read_image_file
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+class BatchCancelledError(RuntimeError):
+    """토큰을 기다리는 중 일괄 분석이 취소됨."""
+
+
+class TokenBucket:
+    """
+    분당 rate_per_minute 건으로 요청을 제한하는 토큰 버킷. capacity 만큼의 순간 버스트를 허용.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, should_cancel: Callable[[], bool] = lambda: False) -> bool:
+        """
+        토큰 하나를 얻을 때까지 대기. 대기 중 취소되면 False 반환.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if should_cancel():
+                return False
+            time.sleep(min(wait, 0.5))
+
+
+def find_images(directory: str) -> List[str]:
+    """
+    디렉토리 안의 이미지 파일 경로를 이름순으로 반환 (하위 폴더 제외).
+    """
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+class BatchItemResult:
+    """
+    이미지 한 장의 분석 결과. 실패 시 error 에 메시지가 들어감.
+    image 는 바이트를 놓은(release) IngestedImage 로, 저장할 때 images 에 없는 이미지만 파일에서 다시 읽음.
+    그 사이 파일이 지워지거나 바뀌었으면 그 결과만 이미지 없이 저장됨 (image_store.store_image 참고).
+    """
+
+    def __init__(self, image_path, image=None, response=None, foods=None, error=None, elapsed=0.0):
+        self.image_path = image_path
+        self.image = image
+        self.response = response
+        self.foods = foods or []
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class BatchSummary:
+    """
+    일괄 분석 전체 결과와 처리량(이미지/분).
+    """
+
+    def __init__(self, results, elapsed, cancelled=False):
+        self.results = results
+        self.elapsed = elapsed
+        self.cancelled = cancelled
+
+    @property
+    def succeeded(self):
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self):
+        return len(self.results) - self.succeeded
+
+    @property
+    def images_per_minute(self):
+        return len(self.results) / self.elapsed * 60 if self.elapsed > 0 else 0.0
+
+
+def analyze_one(image_path, prompt, max_retries=BATCH_MAX_RETRIES, before_attempt=None):
+    """
+    이미지 한 장을 재시도 포함으로 분석. 예외는 BatchItemResult.error 로 변환.
+    before_attempt 는 재시도를 포함한 매 API 요청 직전에 호출됨 (analyze_batch 의 요청 속도 제한).
+    """
+    started = time.perf_counter()
+    try:
+        image = read_image_file(image_path)
+        response = clean_response(describe_image(image.data, prompt, max_retries, before_attempt))
+        if response is None:
+            raise ValueError("음식 분석 결과가 없습니다.")
+        foods = parse_foods(response)
+        for food in foods:
+            food["calories"] = int(food["calories"])
+        # 결과 저장 전까지 이미지 바이트를 모두 들고 있지 않도록 해시만 남김
+        image.release()
+        return BatchItemResult(
+            image_path, image, response, foods, elapsed=time.perf_counter() - started
+        )
+    except Exception as e:
+        logger.error(f"일괄 분석 실패: {image_path}, 에러: {e}")
+        return BatchItemResult(image_path, error=str(e), elapsed=time.perf_counter() - started)
+
+
+def analyze_batch(
+    image_paths: List[str],
+    prompt: str,
+    max_workers: int = BATCH_MAX_WORKERS,
+    rate_per_minute: float = BATCH_RATE_PER_MINUTE,
+    max_retries: int = BATCH_MAX_RETRIES,
+    on_progress: Optional[Callable[[int, int, BatchItemResult], None]] = None,
+    should_cancel: Callable[[], bool] = lambda: False,
+) -> BatchSummary:
+    """
+    여러 이미지를 동시 실행 수 max_workers, 분당 rate_per_minute 제한으로 분석.
+    속도 제한은 재시도를 포함한 실제 API 요청마다 적용되고, 분석 캐시 적중은 토큰을 쓰지 않음.
+    각 이미지가 끝날 때마다 on_progress(완료 수, 전체 수, 결과) 호출. DB 저장은 하지 않음.
+    """
+    bucket = TokenBucket(rate_per_minute)
+    total = len(image_paths)
+    logger.info(f"일괄 분석 시작: {total}건, 동시 실행 {max_workers}, 분당 {rate_per_minute}건")
+
+    def before_attempt():
+        if not bucket.acquire(should_cancel):
+            raise BatchCancelledError("일괄 분석이 취소되었습니다.")
+
+    def task(path):
+        if should_cancel():
+            return None
+        result = analyze_one(path, prompt, max_retries, before_attempt)
+        # 토큰을 기다리다 취소된 이미지는 실패로 세지 않음
+        return None if should_cancel() and not result.ok else result
+
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(task, path) for path in image_paths]
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            result = future.result()
+            if result is None:
+                continue
+            results.append(result)
+            if on_progress is not None:
+                on_progress(len(results), total, result)
+            if should_cancel():
+                for pending in futures:
+                    pending.cancel()
+    summary = BatchSummary(results, time.perf_counter() - started, should_cancel())
+    logger.info(
+        f"일괄 분석 완료: 성공 {summary.succeeded}건, 실패 {summary.failed}건, "
+        f"{summary.elapsed:.1f}초, {summary.images_per_minute:.1f} 이미지/분"
+    )
+    return summary
+
+
+def save_batch_results(summary: BatchSummary, prompt: str, date: str) -> int:
+    """
+    성공한 분석 결과를 gpt_requests, calories 에 한 번의 트랜잭션으로 저장. 저장된 음식 수 반환.
+    """
+    gpt_rows = []
+    calorie_rows = []
+    for result in summary.results:
+        if not result.ok:
+            continue
+        gpt_rows.append((result.image, prompt, result.response))
+        for food in result.foods:
+            calorie_rows.append((food["food_name"], food["calories"], date))
+    insert_analysis_results(gpt_rows, calorie_rows)
+    return len(calorie_rows)
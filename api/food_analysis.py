@@ -0,0 +1,114 @@
+import json
+from typing import Any, Dict, List, Optional
+
+FOOD_ANALYSIS_PROMPT = (
+    "너는 음식 분석 전문가입니다.\n"
+    "이미지를 보고 음식의 이름과 칼로리를 분석해줘.\n"
+    "- 결과는 JSON 형식의 문자열로만 반환해줘.\n"
+    "- 여러 음식이 한 사진에 있을 경우, 각 음식의 이름과 칼로리를 분석해줘.\n"
+    "- [주의사항] 예시:\n"
+    "{\n"
+    '\t"output": [\n'
+    "\t\t{\n"
+    '\t\t\t"food_name": "치킨",\n'
+    '\t\t\t"calories": "100"\n'
+    "\t\t},\n"
+    "\t\t{\n"
+    '\t\t\t"food_name": "피자",\n'
+    '\t\t\t"calories": "200"\n'
+    "\t\t}\n"
+    "\t]\n"
+    "}\n"
+    "- 만약, 음식 사진이 아닌경우, 결과는 빈 배열로 반환해줘.\n"
+    "- [주의사항] 예시:\n"
+    "{\n"
+    '\t"output": []\n'
+    "}"
+)
+
+
+def clean_response(result: Optional[str]) -> Optional[str]:
+    """
+    GPT 응답에서 ```json 코드펜스를 제거.
+    """
+    if result is None:
+        return None
+    return result.replace("```json", "").replace("```", "").strip()
+
+
+def parse_foods(result: str) -> List[Dict[str, Any]]:
+    """
+    정리된 GPT 응답(JSON 문자열)에서 음식 목록을 추출. 형식 오류 시 json.JSONDecodeError 발생.
+    """
+    return json.loads(result)["output"]
+
+
+def is_food_response(result: Optional[str]) -> bool:
+    """
+    코드펜스를 제거한 뒤 parse_foods 로 음식 목록을 읽을 수 있는 응답인지 확인. 분석 캐시에 저장할지 판단할 때 사용.
+    """
+    try:
+        return isinstance(parse_foods(clean_response(result)), list)
+    except (ValueError, KeyError, TypeError):
+        return False
+
+
+class FoodStreamParser:
+    """
+    스트리밍으로 들어오는 GPT 응답 조각을 받아, {"output": [...]} 배열 안의 음식 객체가 닫히는 즉시 반환하는 점진 파서.
+    문자열 안의 괄호/이스케이프는 무시하며, ```json 코드펜스처럼 JSON 바깥의 문자는 건너뜀.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.stack = []
+        self.in_string = False
+        self.escaped = False
+        self.item_chars = None
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        응답 조각을 추가하고, 이번 조각으로 완성된 음식 객체 목록을 반환.
+        """
+        self.parts.append(text)
+        items = []
+        for char in text:
+            if self.item_chars is not None:
+                self.item_chars.append(char)
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+            if char == '"':
+                self.in_string = bool(self.stack)
+            elif char in "{[":
+                # 최상위 객체 > output 배열 바로 아래의 객체가 음식 항목
+                if char == "{" and self.stack == ["{", "["]:
+                    self.item_chars = [char]
+                self.stack.append(char)
+            elif char in "}]" and self.stack:
+                self.stack.pop()
+                if char == "}" and self.item_chars is not None and self.stack == ["{", "["]:
+                    item = self._parse_item("".join(self.item_chars))
+                    self.item_chars = None
+                    if item is not None:
+                        items.append(item)
+        return items
+
+    @staticmethod
+    def _parse_item(text: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(item, dict) or "food_name" not in item or "calories" not in item:
+            return None
+        return item
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
@@ -1,45 +1,199 @@
 import base64
+import threading
+import time
 
-from openai import OpenAI
-
-from utils.config import OPENAI_API_KEY
+from api.analysis_cache import analysis_cache, make_cache_key
+from api.food_analysis import is_food_response
+from api.resilience import (
+    CircuitBreaker,
+    DeadlineExceededError,
+    StreamInterruptedError,
+    call_with_resilience,
+)
+from utils.config import OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MAX_RETRIES, OPENAI_MODEL
+from utils.image_processor import prepare_image
+from utils.image_store import read_image_file
 from utils.log_config import get_logger
+from utils.tracing import span, tracer
 
 logger = get_logger(__name__)
-client = OpenAI(api_key=OPENAI_API_KEY)
+_client = None
+_client_lock = threading.Lock()
+breaker = CircuitBreaker()
 
 
-def get_image_description(image_path, prompt):
+def get_client():
     """
-    파일읽기, base64 인코딩, API 호출 예외처리
+    OpenAI 클라이언트를 처음 호출될 때 생성해 재사용. openai 패키지 import 와 API 키 확인도 이때 수행하므로
+    키가 없어도 프로그램은 시작되고, 분석 요청 시점에 오류가 남.
     """
-    logger.info(f"GPT API 호출, image_path: {image_path}, prompt: {prompt}")
+    global _client
+    with _client_lock:
+        if _client is None:
+            if not OPENAI_API_KEY:
+                raise ValueError("API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+            from openai import OpenAI
+
+            # 재시도/제한 시간은 call_with_resilience 에서 처리하므로 SDK 자체 재시도는 끔
+            _client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)
+    return _client
 
-    try:
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-        base64_image = base64.b64encode(image_data).decode("utf-8")
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+def _build_messages(image_data, prompt):
+    """
+    이미지 축소/재인코딩, base64 인코딩 후 chat.completions 메시지와 사용한 detail 레벨을 반환.
+    """
+    with span("openai.prepare_image", "openai", original_bytes=len(image_data)) as args:
+        prepared = prepare_image(image_data)
+        args["processed_bytes"] = prepared.processed_bytes
+    with span("openai.base64_encode", "openai", bytes=prepared.processed_bytes):
+        base64_image = base64.b64encode(prepared.data).decode("utf-8")
+    messages = [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
                 {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}"
-                            },
-                        },
-                    ],
-                }
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{prepared.mime_type};base64,{base64_image}",
+                        "detail": prepared.detail,
+                    },
+                },
             ],
-            max_tokens=300,
-        )
+        }
+    ]
+    return messages, prepared.detail
+
+
+def _record_usage(usage, args):
+    if usage is not None:
+        args["prompt_tokens"] = usage.prompt_tokens
+        args["completion_tokens"] = usage.completion_tokens
+    tracer.record_usage(usage)
+
 
+def _request_image_description(image_data, prompt, max_retries=OPENAI_MAX_RETRIES, before_attempt=None):
+    """
+    전처리한 이미지로 API 호출. 제한 시간, 재시도, hedge, 차단기는 call_with_resilience 가 처리.
+    before_attempt 는 재시도를 포함한 매 요청 직전에 호출됨. 예외는 호출자에게 전달.
+    """
+    messages, detail = _build_messages(image_data, prompt)
+    client = get_client()
+
+    def attempt(timeout):
+        with span("openai.chat_completion", "openai", model=OPENAI_MODEL, detail=detail) as args:
+            response = client.chat.completions.create(
+                model=OPENAI_MODEL, messages=messages, max_tokens=300, timeout=timeout
+            )
+            _record_usage(getattr(response, "usage", None), args)
         return response.choices[0].message.content
+
+    return call_with_resilience(attempt, max_retries=max_retries, breaker=breaker, before_attempt=before_attempt)
+
+
+def _stream_image_description(image_data, prompt, on_delta, cancel_event, max_retries=OPENAI_MAX_RETRIES):
+    """
+    스트리밍 API 로 호출하며 받은 응답 조각을 on_delta(text) 로 바로 전달하고, 전체 응답을 반환.
+    첫 조각 전의 오류만 재시도하며(hedge 는 사용 안 함), cancel_event 가 설정되면 스트림을 닫고 None 반환.
+    """
+    messages, detail = _build_messages(image_data, prompt)
+    client = get_client()
+
+    def attempt(timeout):
+        started_ns = time.perf_counter_ns()
+        deadline_at = time.monotonic() + timeout
+        parts = []
+        with span("openai.chat_completion_stream", "openai", model=OPENAI_MODEL, detail=detail) as args:
+            stream = client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=messages,
+                max_tokens=300,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=timeout,
+            )
+            try:
+                for chunk in stream:
+                    if cancel_event.is_set():
+                        args["cancelled"] = True
+                        return None
+                    if chunk.usage is not None:
+                        _record_usage(chunk.usage, args)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if not parts:
+                            tracer.record("openai.time_to_first_token", "openai", started_ns)
+                        parts.append(chunk.choices[0].delta.content)
+                        on_delta(parts[-1])
+                    if time.monotonic() > deadline_at:
+                        raise DeadlineExceededError(f"{timeout:.1f}초 안에 응답이 끝나지 않았습니다.")
+            except Exception as e:
+                if parts:
+                    raise StreamInterruptedError(f"응답 수신 중 중단되었습니다: {e}") from e
+                raise
+            finally:
+                stream.close()
+        return "".join(parts)
+
+    return call_with_resilience(
+        attempt, max_retries=max_retries, hedge_after=0, breaker=breaker, cancel_event=cancel_event
+    )
+
+
+def stream_describe_image(image_data, prompt, on_delta, cancel_event=None):
+    """
+    describe_image 의 스트리밍 버전. 응답 조각을 받는 대로 on_delta(text) 로 전달하고 전체 응답을 반환.
+    캐시에 있던 결과는 한 번에 on_delta 로 전달함. cancel_event(threading.Event)가 설정되면 None 반환 (캐시하지 않음).
+    """
+    if cancel_event is None:
+        cancel_event = threading.Event()
+    received = []
+
+    def deliver(text):
+        received.append(text)
+        on_delta(text)
+
+    with span("openai.describe_image", "openai", stream=True):
+        key = make_cache_key(image_data, prompt, OPENAI_MODEL)
+        result = analysis_cache.get_or_compute(
+            key,
+            OPENAI_MODEL,
+            lambda: _stream_image_description(image_data, prompt, deliver, cancel_event),
+            is_food_response,
+        )
+    if result is not None and not received:
+        on_delta(result)
+    logger.info(f"분석 캐시 통계: {analysis_cache.stats()}")
+    return result
+
+
+def describe_image(image_data, prompt, max_retries=OPENAI_MAX_RETRIES, before_attempt=None):
+    """
+    이미지 바이트를 캐시 경유로 분석. 재시도 후에도 실패하면 예외로 전달
+    (DeadlineExceededError, CircuitOpenError, openai.APIError 등).
+    before_attempt 는 실제 API 요청(재시도 포함) 직전마다 호출되며, 캐시 적중 시에는 호출되지 않음.
+    """
+    with span("openai.describe_image", "openai"):
+        key = make_cache_key(image_data, prompt, OPENAI_MODEL)
+        result = analysis_cache.get_or_compute(
+            key,
+            OPENAI_MODEL,
+            lambda: _request_image_description(image_data, prompt, max_retries, before_attempt),
+            is_food_response,
+        )
+    logger.info(f"분석 캐시 통계: {analysis_cache.stats()}")
+    return result
+
+
+def get_image_description(image_path, prompt):
+    """
+    파일읽기, 캐시 조회, base64 인코딩, API 호출 예외처리
+    동일한 (이미지, 프롬프트, 모델) 조합은 캐시된 응답을 반환.
+    """
+    logger.info(f"GPT API 호출, image_path: {image_path}, prompt: {prompt}")
+
+    try:
+        return describe_image(read_image_file(image_path).data, prompt)
     except Exception as e:
         logger.error(f"GPT API 오류: {str(e)}")
         return None
@@ -0,0 +1,238 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional, TypeVar
+
+from utils.config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    OPENAI_HEDGE_AFTER,
+    OPENAI_MAX_RETRIES,
+    OPENAI_TIMEOUT,
+)
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class DeadlineExceededError(TimeoutError):
+    """요청 전체 제한 시간(재시도 포함)을 넘김."""
+
+
+class CircuitOpenError(RuntimeError):
+    """연속 실패로 차단기가 열려 있어 요청을 보내지 않고 바로 실패함."""
+
+
+class StreamInterruptedError(RuntimeError):
+    """스트리밍 응답 일부를 이미 전달한 뒤 끊김. 같은 내용이 중복 전달되지 않도록 재시도하지 않음."""
+
+
+class CircuitBreaker:
+    """
+    연속 failure_threshold 번 실패하면 reset_timeout 초 동안 요청을 차단(open)하고,
+    그 뒤 한 건만 시험 삼아 통과(half-open)시켜 성공하면 다시 닫음(closed).
+    시험 요청이 결과를 남기지 못하고 끝나도 reset_timeout 뒤에는 다시 한 건을 통과시킴.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        요청 전에 호출. 차단 중이면 CircuitOpenError 발생.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining <= 0:
+                self.state = self.HALF_OPEN
+                # 시험 요청이 진행 중인 동안은 차단하고, 그 요청이 결과 없이 끝났으면 reset_timeout 뒤 다시 허용
+                self.opened_at = time.monotonic()
+                logger.info("차단기 half-open: 시험 요청 1건 허용")
+                return
+            raise CircuitOpenError(
+                f"OpenAI 서버 오류가 계속되어 요청을 잠시 중단했습니다. {max(remaining, 0):.0f}초 후 다시 시도하세요."
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("차단기 closed: 서버 응답 정상화")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    @property
+    def half_open(self) -> bool:
+        with self._lock:
+            return self.state == self.HALF_OPEN
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"차단기 open: 연속 {self.failures}회 실패, {self.reset_timeout:.0f}초간 요청 차단")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    다시 시도할 만한 오류인지 판단. 429, 5xx, 시간 초과, 연결 오류만 재시도하고 나머지 4xx 는 바로 실패.
+    """
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    import openai
+
+    return isinstance(error, openai.APIConnectionError)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    429/503 응답의 Retry-After 헤더(초)가 있으면 반환.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+_hedge_executor = None
+_hedge_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="openai-hedge")
+    return _hedge_executor
+
+
+def hedged_call(func: Callable[[float], T], timeout: float, hedge_after: float) -> T:
+    """
+    func(timeout) 을 실행하고 hedge_after 초 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 성공한 결과를 사용.
+    둘 다 실패하면 마지막 예외를 전달. 늦게 끝난 요청의 결과는 버림 (진행 중인 HTTP 요청은 취소할 수 없음).
+    """
+    executor = _get_hedge_executor()
+    started = time.monotonic()
+    pending = {executor.submit(func, timeout)}
+    hedged = False
+    error = None
+    while True:
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            raise DeadlineExceededError(f"{timeout:.1f}초 안에 응답이 없습니다.")
+        wait_for = remaining if hedged else min(hedge_after, remaining)
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except Exception as e:
+                error = e
+        if not pending:
+            raise error
+        remaining = timeout - (time.monotonic() - started)
+        if not hedged and not done and remaining > 0:
+            hedged = True
+            logger.info(f"hedge 요청 전송 ({time.monotonic() - started:.2f}초 경과)")
+            pending.add(executor.submit(func, remaining))
+
+
+def _with_before_attempt(func: Callable[[float], T], before_attempt: Callable[[], None]) -> Callable[[float], T]:
+    def attempt(timeout: float) -> T:
+        started = time.monotonic()
+        before_attempt()
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            raise DeadlineExceededError(f"{timeout:.1f}초 안에 요청을 보내지 못했습니다.")
+        return func(remaining)
+
+    return attempt
+
+
+def call_with_resilience(
+    func: Callable[[float], T],
+    deadline: float = OPENAI_TIMEOUT,
+    max_retries: int = OPENAI_MAX_RETRIES,
+    hedge_after: float = OPENAI_HEDGE_AFTER,
+    breaker: Optional[CircuitBreaker] = None,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    before_attempt: Optional[Callable[[], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Optional[T]:
+    """
+    func(timeout) 을 전체 제한 시간 deadline 안에서 실행. func 는 남은 시간을 timeout 으로 받아 요청에 사용해야 함.
+    - 429/5xx/시간 초과/연결 오류는 지터를 섞은 지수 백오프(Retry-After 우선)로 최대 max_retries 번 재시도
+    - hedge_after > 0 이면 그 시간 안에 응답이 없을 때 같은 요청을 하나 더 보냄
+    - breaker 가 열려 있으면 요청 없이 CircuitOpenError 발생
+    - before_attempt 를 주면 재시도와 hedge 를 포함한 모든 요청 직전에 호출 (예: 토큰 버킷 대기).
+      기다린 시간은 그 요청의 timeout 에서 빠지며, 예외를 던지면 요청하지 않고 그대로 전달
+    - cancel_event 가 설정되면 재시도 대기를 바로 끝내고 None 반환. 취소된 요청은 차단기에 성공도 실패도 기록하지 않음
+    """
+    if before_attempt is not None:
+        func = _with_before_attempt(func, before_attempt)
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            raise DeadlineExceededError(f"{deadline:.1f}초 안에 응답이 없습니다.")
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            if hedge_after and hedge_after > 0:
+                result = hedged_call(func, remaining, hedge_after)
+            else:
+                result = func(remaining)
+        except Exception as e:
+            if cancel_event is not None and cancel_event.is_set():
+                raise
+            retryable = is_retryable(e)
+            # 시험 요청(half-open)은 어떤 오류로 끝나도 실패로 기록해 차단기를 다시 염
+            if breaker is not None and (retryable or breaker.half_open):
+                breaker.record_failure()
+            if not retryable or attempt >= max_retries:
+                raise
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            attempt += 1
+            remaining = deadline - (time.monotonic() - started)
+            if delay >= remaining:
+                raise DeadlineExceededError(
+                    f"{deadline:.1f}초 안에 응답이 없습니다. (마지막 오류: {e})"
+                ) from e
+            logger.warning(f"재시도 {attempt}/{max_retries} ({delay:.1f}초 후): {e}")
+            if cancel_event is None:
+                time.sleep(delay)
+            elif cancel_event.wait(delay):
+                logger.info("재시도 대기 중 취소됨")
+                return None
+            continue
+        if cancel_event is not None and cancel_event.is_set():
+            return result
+        if breaker is not None:
+            breaker.record_success()
+        return result
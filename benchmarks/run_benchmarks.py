@@ -0,0 +1,349 @@
+"""
+칼로리노트 성능 벤치마크. 임시 디렉토리에 합성 DB 를 만들고 주요 경로의 실행 시간을 측정해 JSON 으로 출력함.
+Qt 는 offscreen 으로 실행하고, 분석은 로컬 OpenAI 스텁 서버를 상대로 끝까지(전처리, API, 파싱, DB 저장) 수행함.
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --calories 10000 --gpt-requests 1000 --baseline bench.json
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+
+def summarize(name, samples, **extra):
+    """
+    측정값(초) 목록을 ms 단위 통계 dict 로 변환.
+    """
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p95_index = min(len(samples_ms) - 1, round(0.95 * (len(samples_ms) - 1)))
+    return {
+        "name": name,
+        "repeat": len(samples_ms),
+        "min_ms": round(samples_ms[0], 3),
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "p95_ms": round(samples_ms[p95_index], 3),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+        **extra,
+    }
+
+
+def measure(name, func, repeat, warmup=1, **extra):
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(name, samples, **extra)
+
+
+def bench_db(repeat):
+    from utils.db_handler import select_calorie_sum_by_date, select_calories
+    from utils.food_index import FoodIndex
+
+    index = FoodIndex()
+    results = [
+        measure("select_calories", select_calories, repeat),
+        measure("select_calorie_sum_by_date", select_calorie_sum_by_date, repeat),
+        measure("FoodIndex.load", lambda: FoodIndex().load(), repeat),
+    ]
+    index.load()
+    results.append(measure("FoodIndex.search", lambda: [index.search(query) for query in ("김", "찌개", "볶음밥")], repeat))
+    return results
+
+
+def bench_similar_images(count, repeat):
+    """
+    지각 해시 count 개(사진 한 장당 비슷한 변형 4개)를 색인에 넣고 해밍 거리 검색 시간을 측정.
+    """
+    import random
+
+    from benchmarks.synthetic_data import make_image
+    from utils.image_index import SimilarImageIndex
+    from utils.image_processor import compute_dhash
+
+    rng = random.Random(0)
+    index = SimilarImageIndex()
+    started = time.perf_counter()
+    dhashes = []
+    while len(dhashes) < count:
+        base = rng.getrandbits(64)
+        for _ in range(5):
+            dhash = base
+            for _ in range(rng.randint(0, 6)):
+                dhash ^= 1 << rng.randrange(64)
+            dhashes.append(dhash)
+    for i, dhash in enumerate(dhashes[:count]):
+        index.add(f"image-{i}", dhash)
+    results = [summarize("SimilarImageIndex.build", [time.perf_counter() - started], hashes=count)]
+    queries = iter([dhashes[rng.randrange(count)] ^ (1 << rng.randrange(64)) for _ in range(repeat + 1)])
+    results.append(measure("SimilarImageIndex.search", lambda: index.search(next(queries)), repeat, hashes=count))
+    image = make_image(0)
+    results.append(measure("compute_dhash", lambda: compute_dhash(image), repeat, image_bytes=len(image)))
+    return results
+
+
+def bench_ingest(repeat, size=(4000, 3000)):
+    """
+    큰 사진 한 장의 업로드 분석 경로(파일 읽기, SHA-256, 지각 해시, 캐시 키, 전처리, base64)를 측정.
+    tracemalloc 으로 파이썬 객체(바이트/문자열) 최대 사용량도 기록 (Pillow 내부 픽셀 버퍼는 포함되지 않음).
+    """
+    import base64
+    import tracemalloc
+
+    from api.analysis_cache import make_cache_key
+    from benchmarks.synthetic_data import make_image
+    from utils.image_processor import prepare_image
+    from utils.image_store import read_image_file
+
+    path = os.path.join(tempfile.mkdtemp(prefix="calorienote-ingest-"), "large.jpg")
+    with open(path, "wb") as f:
+        f.write(make_image(30_000_000, size=size, quality=92))
+
+    def ingest():
+        image = read_image_file(path)
+        _ = image.sha256, image.dhash
+        make_cache_key(image.data, "prompt", "model")
+        prepared = prepare_image(image.data)
+        base64.b64encode(prepared.data).decode("ascii")
+
+    result = measure("ingest.large_image", ingest, repeat, image_bytes=os.path.getsize(path), pixels=f"{size[0]}x{size[1]}")
+    tracemalloc.start()
+    ingest()
+    result["python_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return [result]
+
+
+def bench_transfer(repeat):
+    """
+    calories 전체 내보내기(JSONL/CSV)와, 내보낸 파일을 같은 DB 에 다시 가져오기(전부 중복이라 건너뜀)를 측정.
+    """
+    from utils.data_transfer import export_table, import_table
+
+    work_dir = tempfile.mkdtemp(prefix="calorienote-transfer-")
+    repeat = min(repeat, 3)
+    results = []
+    for fmt in ("jsonl", "csv"):
+        path = os.path.join(work_dir, f"calories.{fmt}")
+
+        def export():
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                return export_table("calories", f, fmt)
+
+        def reimport():
+            with open(path, encoding="utf-8", newline="") as f:
+                import_table("calories", f, fmt)
+
+        rows = export()
+        results.append(measure(f"transfer.export.{fmt}", export, repeat, warmup=0, rows=rows, file_bytes=os.path.getsize(path)))
+        results.append(measure(f"transfer.import_duplicates.{fmt}", reimport, repeat, warmup=0, rows=rows))
+    return results
+
+
+def bench_gui(repeat):
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    from gui.tab_analysis import AnalysisTab
+    from gui.tab_history import HistoryTab
+    from gui.tab_upload import UploadTab
+
+    results = []
+    started = time.perf_counter()
+    upload_tab = UploadTab()
+    history_tab = HistoryTab()
+    analysis_tab = AnalysisTab()
+    analysis_tab.resize(1000, 600)
+    results.append(summarize("gui.construct_tabs", [time.perf_counter() - started]))
+    results.append(measure("UploadTab.load_calories", upload_tab.load_calories, repeat))
+    results.append(measure("HistoryTab.load_gpt_requests", history_tab.load_gpt_requests, repeat))
+    history_tab.search_edit.setText("김치")
+    history_tab.search_timer.stop()
+    results.append(measure("HistoryTab.load_gpt_requests[search]", history_tab.load_gpt_requests, repeat))
+
+    def plot():
+        # draw_idle 은 이벤트 루프로 미뤄지므로 렌더링까지 포함해 측정
+        analysis_tab.plot_calorie_graph()
+        analysis_tab.canvas.draw()
+
+    for index, label in ((1, "month"), (3, "all")):
+        analysis_tab.range_combo.setCurrentIndex(index)
+        results.append(measure(f"AnalysisTab.plot_calorie_graph[{label}]", plot, repeat))
+    app.processEvents()
+    return results
+
+
+def bench_analysis(image_count, workers, latency):
+    """
+    스텁 서버를 상대로 image_count 장을 일괄 분석/저장. 두 번째 실행은 같은 이미지라 분석 캐시 경로를 측정함.
+    OpenAI 클라이언트 생성(openai import) 비용은 측정에서 빼고 따로 기록함.
+    업로드 탭의 스트리밍 분석은 첫 음식 항목까지의 시간과 전체 응답 시간을 따로 측정함.
+    """
+    from api.batch_analyzer import analyze_batch, save_batch_results
+    from api.food_analysis import FOOD_ANALYSIS_PROMPT, FoodStreamParser
+    from api.openai_api import get_client, stream_describe_image
+    from benchmarks.synthetic_data import make_image
+
+    started = time.perf_counter()
+    get_client()
+    results = [summarize("analysis.client_init", [time.perf_counter() - started])]
+
+    image_dir = tempfile.mkdtemp(prefix="calorienote-images-")
+    image_paths = []
+    for i in range(image_count):
+        path = os.path.join(image_dir, f"food_{i}.jpg")
+        with open(path, "wb") as f:
+            f.write(make_image(10_000_000 + i))
+        image_paths.append(path)
+    for label in ("cold", "cached"):
+        summary = analyze_batch(
+            image_paths, FOOD_ANALYSIS_PROMPT, max_workers=workers, rate_per_minute=60_000, max_retries=0
+        )
+        started = time.perf_counter()
+        saved = save_batch_results(summary, FOOD_ANALYSIS_PROMPT, datetime.date.today().isoformat())
+        save_elapsed = time.perf_counter() - started
+        results.append(
+            summarize(
+                f"analysis.end_to_end[{label}]",
+                [result.elapsed for result in summary.results],
+                images=image_count,
+                succeeded=summary.succeeded,
+                failed=summary.failed,
+                batch_ms=round(summary.elapsed * 1000, 3),
+                images_per_minute=round(summary.images_per_minute, 1),
+                save_ms=round(save_elapsed * 1000, 3),
+                saved_foods=saved,
+                stub_latency_ms=round(latency * 1000, 3),
+            )
+        )
+
+    first_item, total = [], []
+    for i in range(min(image_count, 10)):
+        parser = FoodStreamParser()
+        started = time.perf_counter()
+        first = []
+
+        def on_delta(text):
+            if parser.feed(text) and not first:
+                first.append(time.perf_counter() - started)
+
+        stream_describe_image(make_image(20_000_000 + i), FOOD_ANALYSIS_PROMPT, on_delta)
+        total.append(time.perf_counter() - started)
+        first_item.extend(first)
+    if first_item:
+        results.append(summarize("analysis.stream.first_item", first_item))
+    results.append(summarize("analysis.stream.complete", total))
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """
+    baseline JSON 과 median_ms 를 비교해 tolerance(비율) 이상 느려진 항목 목록 반환.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {item["name"]: item for item in json.load(f)["results"]}
+    regressions = []
+    for item in results:
+        before = baseline.get(item["name"])
+        if before is None or before["median_ms"] <= 0:
+            continue
+        ratio = item["median_ms"] / before["median_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                {"name": item["name"], "baseline_ms": before["median_ms"], "current_ms": item["median_ms"], "ratio": round(ratio, 2)}
+            )
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="run_benchmarks", description="칼로리노트 성능 벤치마크")
+    parser.add_argument("--calories", type=int, default=100_000, help="합성 calories 행 수")
+    parser.add_argument("--gpt-requests", type=int, default=10_000, help="합성 gpt_requests 행 수")
+    parser.add_argument("--distinct-images", type=int, default=200, help="gpt_requests 에 돌려 쓸 이미지 수")
+    parser.add_argument("--hashes", type=int, default=100_000, help="비슷한 사진 검색에 사용할 지각 해시 수")
+    parser.add_argument("--repeat", type=int, default=10, help="항목별 반복 측정 횟수")
+    parser.add_argument("--images", type=int, default=20, help="end-to-end 분석 이미지 수")
+    parser.add_argument("--workers", type=int, default=4, help="end-to-end 분석 동시 실행 수")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="스텁 서버 응답 지연(초)")
+    parser.add_argument("--skip-gui", action="store_true", help="Qt 탭 측정 생략")
+    parser.add_argument("--skip-analysis", action="store_true", help="end-to-end 분석 측정 생략")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (미지정 시 stdout)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON. 느려진 항목이 있으면 종료 코드 1")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 지연 비율 (0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="앱 로그 출력")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    work_dir = tempfile.mkdtemp(prefix="calorienote-bench-")
+    from benchmarks.stub_openai_server import StubOpenAIServer
+
+    server = StubOpenAIServer(latency=args.stub_latency).start()
+    # utils.config 는 import 시점에 환경변수를 읽으므로 앱 모듈 import 전에 지정
+    os.environ["DB_PATH"] = os.path.join(work_dir, "bench.db")
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("LOG_FILE", "")
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    from benchmarks.synthetic_data import populate_db
+
+    started = time.perf_counter()
+    dataset = populate_db(args.calories, args.gpt_requests, args.distinct_images)
+    dataset["generate_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    dataset["db_bytes"] = os.path.getsize(os.environ["DB_PATH"])
+
+    results = bench_db(args.repeat)
+    results.extend(bench_similar_images(args.hashes, args.repeat))
+    results.extend(bench_ingest(args.repeat))
+    results.extend(bench_transfer(args.repeat))
+    if not args.skip_gui:
+        results.extend(bench_gui(args.repeat))
+    if not args.skip_analysis:
+        results.extend(bench_analysis(args.images, args.workers, args.stub_latency))
+        dataset["stub_requests"] = server.request_count
+    server.stop()
+    from utils.tracing import tracer
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "dataset": dataset,
+        "results": results,
+        "spans": tracer.stats(),
+        "token_usage": tracer.token_usage(),
+    }
+    exit_code = 0
+    if args.baseline:
+        report["regressions"] = compare(results, args.baseline, args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for item in report.get("regressions", []):
+        print(f"성능 저하: {item['name']} {item['baseline_ms']}ms -> {item['current_ms']}ms (x{item['ratio']})", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+벤치마크/테스트용 로컬 OpenAI 스텁 서버. /v1/chat/completions 요청에 고정된 음식 분석 결과를 돌려줌.
+요청에 "stream": true 가 있으면 응답을 작은 조각으로 나눠 SSE(text/event-stream)로 보냄.
+OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 로 지정하면 실제 API 대신 이 서버를 호출함.
+
+    python -m benchmarks.stub_openai_server --port 8765 --latency 0.2
+    python -m benchmarks.stub_openai_server --error-rate 0.3 --slow-rate 0.1 --slow-latency 5
+    python -m benchmarks.stub_openai_server --chunk-size 8 --chunk-delay 0.05
+"""
+
+import argparse
+import collections
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_FOODS = [
+    {"food_name": "김치찌개", "calories": "450"},
+    {"food_name": "공기밥", "calories": "300"},
+]
+
+
+def build_completion(content, model="gpt-4o-mini", prompt_tokens=850, completion_tokens=40):
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def build_chunk(content=None, model="gpt-4o-mini", finish_reason=None, usage=None):
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [] if usage else [
+            {
+                "index": 0,
+                "delta": {"content": content} if content is not None else {},
+                "finish_reason": finish_reason,
+            }
+        ],
+        "usage": usage,
+    }
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """
+    chat.completions 요청 본문을 끝까지 읽고 server.next_outcome() 이 정한 지연/상태 코드로 응답.
+    """
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        status, latency = self.server.next_outcome()
+        time.sleep(latency)
+        if status != 200:
+            self.send_json(status, {"error": {"message": f"stub error {status}", "type": "server_error"}})
+            return
+        content = "```json\n" + json.dumps({"output": STUB_FOODS}, ensure_ascii=False) + "\n```"
+        model = body.get("model", "gpt-4o-mini")
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            self.send_stream(content, model, include_usage)
+            return
+        self.send_json(200, build_completion(content, model))
+
+    def send_stream(self, content, model, include_usage):
+        """
+        content 를 server.chunk_size 글자씩 나눠 chunk_delay 초 간격으로 보내고 [DONE] 으로 끝냄.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        size = self.server.chunk_size
+        chunks = [build_chunk(content[i:i + size], model) for i in range(0, len(content), size)]
+        chunks.append(build_chunk(model=model, finish_reason="stop"))
+        if include_usage:
+            completion = build_completion(content, model)
+            chunks.append(build_chunk(model=model, usage=completion["usage"]))
+        try:
+            for chunk in chunks:
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(self.server.chunk_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 취소/제한 시간 초과로 스트림을 먼저 닫은 경우
+            pass
+        self.close_connection = True
+
+    def send_json(self, status, data):
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 제한 시간 초과로 먼저 연결을 끊은 경우
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.05,
+        error_rate=0.0,
+        error_status=503,
+        slow_rate=0.0,
+        slow_latency=5.0,
+        chunk_size=8,
+        chunk_delay=0.02,
+        handler=StubOpenAIHandler,
+    ):
+        super().__init__((host, port), handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        # 테스트에서 응답 순서를 정할 때 사용. (상태 코드, 지연) 을 앞에서부터 하나씩 꺼내 씀
+        self.scripted = collections.deque()
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def next_outcome(self):
+        """
+        이번 요청의 (상태 코드, 지연 초) 결정. scripted 가 비어 있으면 error_rate/slow_rate 확률을 따름.
+        """
+        with self.lock:
+            self.request_count += 1
+            if self.scripted:
+                return self.scripted.popleft()
+        status = self.error_status if random.random() < self.error_rate else 200
+        latency = self.slow_latency if random.random() < self.slow_rate else self.latency
+        return status, latency
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        """
+        백그라운드 스레드에서 서버를 시작하고 자신을 반환.
+        """
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 OpenAI 스텁 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503, help="오류 응답 상태 코드")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="느린 응답 비율 (0~1)")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="느린 응답 지연(초)")
+    parser.add_argument("--chunk-size", type=int, default=8, help="스트리밍 응답 조각 크기(글자)")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="스트리밍 응답 조각 간격(초)")
+    args = parser.parse_args(argv)
+    server = StubOpenAIServer(
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        chunk_size=args.chunk_size,
+        chunk_delay=args.chunk_delay,
+    )
+    print(f"OPENAI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+벤치마크용 합성 데이터 생성. 실제와 비슷한 크기의 JPEG 이미지와 calories/gpt_requests 레코드를 대량으로 만듦.
+utils.config 가 import 시점에 DB_PATH 를 읽으므로, 이 모듈의 DB 함수는 DB_PATH 환경변수를 지정한 뒤 호출해야 함.
+"""
+
+import datetime
+import io
+import json
+import random
+
+from PIL import Image, ImageFilter
+
+FOOD_NAMES = [
+    "김치찌개", "된장찌개", "비빔밥", "불고기", "갈비찜", "족발", "피자", "햄버거",
+    "떡볶이", "라면", "초밥", "샐러드", "아이스크림", "치킨", "짜장면", "공기밥",
+]
+
+
+def make_image(seed, size=(1280, 960), quality=85):
+    """
+    사진과 비슷한 압축률을 갖도록 그라데이션에 흐린 노이즈를 섞은 JPEG 바이트 생성 (1280x960 기준 약 100~200KB).
+    """
+    rng = random.Random(seed)
+    base = Image.linear_gradient("L").resize(size).rotate(rng.randint(0, 359))
+    noise = Image.effect_noise(size, rng.randint(15, 35)).filter(ImageFilter.GaussianBlur(1))
+    red = Image.blend(base, noise, 0.5)
+    green = Image.blend(noise, base, rng.random())
+    blue = Image.effect_noise(size, rng.randint(10, 30)).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    Image.merge("RGB", (red, green, blue)).save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def make_calorie_rows(count, days=1095, seed=0, end_date=None):
+    """
+    최근 days 일에 고르게 흩어진 (food_name, calories, date) 행 count 개 생성.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or datetime.date.today()
+    return [
+        (
+            rng.choice(FOOD_NAMES),
+            rng.randint(50, 1200),
+            (end_date - datetime.timedelta(days=rng.randrange(days))).isoformat(),
+        )
+        for _ in range(count)
+    ]
+
+
+def make_response(rng):
+    foods = [
+        {"food_name": rng.choice(FOOD_NAMES), "calories": str(rng.randint(50, 1200))}
+        for _ in range(rng.randint(1, 4))
+    ]
+    return json.dumps({"output": foods}, ensure_ascii=False, indent=2)
+
+
+def populate_db(calories=100_000, gpt_requests=10_000, distinct_images=200, chunk_size=1000, seed=0):
+    """
+    현재 DB_PATH 의 DB 에 합성 데이터를 채움. 이미지는 distinct_images 장을 만들어 gpt_requests 에 돌려 씀
+    (images 테이블은 내용 해시로 중복 저장을 막으므로 실제 사용처럼 같은 사진이 여러 번 분석된 상황).
+    """
+    from api.food_analysis import FOOD_ANALYSIS_PROMPT
+    from utils.db_handler import init_db, insert_analysis_results, insert_calories
+
+    init_db()
+    rng = random.Random(seed)
+    images = [make_image(seed * 100_000 + i) for i in range(max(distinct_images, 1))]
+    rows = make_calorie_rows(calories, seed=seed)
+    for start in range(0, len(rows), chunk_size):
+        insert_calories(rows[start:start + chunk_size])
+    for start in range(0, gpt_requests, chunk_size):
+        gpt_rows = [
+            (images[i % len(images)], FOOD_ANALYSIS_PROMPT, make_response(rng))
+            for i in range(start, min(start + chunk_size, gpt_requests))
+        ]
+        insert_analysis_results(gpt_rows, [])
+    return {
+        "calories": calories,
+        "gpt_requests": gpt_requests,
+        "distinct_images": len(images),
+        "image_bytes_avg": sum(len(image) for image in images) // len(images),
+    }
@@ -0,0 +1,201 @@
+"""
+칼로리노트 헤드리스 CLI. Qt/matplotlib 없이 분석, 기록, 집계, 내보내기/가져오기를 수행하고
+결과를 JSONL 로 stdout 에 출력함 (로그는 stderr).
+
+    python cli.py analyze sample_data --save --date 2025-07-24
+    python cli.py log 김치찌개 450 --date 2025-07-24
+    python cli.py report --from 2025-07-01 --to 2025-07-31
+    python cli.py rebuild-totals
+    python cli.py export calories > calories.jsonl
+    python cli.py export gpt_requests --output history.csv
+    python cli.py import calories calories.jsonl
+    python cli.py --trace trace.json analyze sample_data
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+
+def write_jsonl(record):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def collect_image_paths(paths):
+    """
+    인자로 받은 파일/디렉토리 목록을 이미지 파일 경로 목록으로 펼침.
+    """
+    from api.batch_analyzer import find_images
+
+    image_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            image_paths.extend(find_images(path))
+        else:
+            image_paths.append(path)
+    return image_paths
+
+
+def cmd_analyze(args):
+    from api.analysis_cache import get_cache_stats
+    from api.batch_analyzer import analyze_batch, save_batch_results
+    from api.food_analysis import FOOD_ANALYSIS_PROMPT
+
+    image_paths = collect_image_paths(args.paths)
+
+    def on_progress(done, total, result):
+        write_jsonl(
+            {
+                "image": result.image_path,
+                "ok": result.ok,
+                "foods": result.foods,
+                "error": result.error,
+                "elapsed": round(result.elapsed, 3),
+            }
+        )
+
+    summary = analyze_batch(
+        image_paths,
+        FOOD_ANALYSIS_PROMPT,
+        max_workers=args.workers,
+        rate_per_minute=args.rate,
+        on_progress=on_progress,
+    )
+    saved = save_batch_results(summary, FOOD_ANALYSIS_PROMPT, args.date) if args.save else 0
+    print(
+        json.dumps(
+            {
+                "succeeded": summary.succeeded,
+                "failed": summary.failed,
+                "saved_foods": saved,
+                "elapsed": round(summary.elapsed, 3),
+                "images_per_minute": round(summary.images_per_minute, 1),
+                "cache": {
+                    key: round(value, 3) if isinstance(value, float) else value
+                    for key, value in get_cache_stats().items()
+                },
+            },
+            ensure_ascii=False,
+        ),
+        file=sys.stderr,
+    )
+    return 0 if summary.failed == 0 else 1
+
+
+def cmd_log(args):
+    from utils.db_handler import insert_calorie
+
+    insert_calorie(args.food_name, args.calories, args.date)
+    write_jsonl({"food_name": args.food_name, "calories": args.calories, "date": args.date})
+    return 0
+
+
+def cmd_report(args):
+    from utils.db_handler import select_daily_totals
+
+    dates, calories = select_daily_totals(args.date_from, args.date_to)
+    for date, total in zip(dates, calories):
+        write_jsonl({"date": date, "calories": total})
+    return 0
+
+
+def cmd_rebuild_totals(args):
+    from utils.db_handler import rebuild_daily_totals
+
+    write_jsonl({"days": rebuild_daily_totals()})
+    return 0
+
+
+def report_progress(stage, count):
+    print(json.dumps({"stage": stage, "rows": count}), file=sys.stderr, flush=True)
+
+
+def cmd_export(args):
+    from utils.data_transfer import export_table, guess_format
+
+    fmt = args.format or guess_format(args.output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            rows = export_table(args.table, f, fmt, args.chunk_size, report_progress)
+    else:
+        rows = export_table(args.table, sys.stdout, fmt, args.chunk_size)
+        sys.stdout.flush()
+    print(json.dumps({"table": args.table, "format": fmt, "rows": rows}), file=sys.stderr)
+    return 0
+
+
+def cmd_import(args):
+    from utils.data_transfer import guess_format, import_table
+
+    fmt = args.format or guess_format(args.path)
+    with open(args.path, encoding="utf-8", newline="") as f:
+        read, inserted = import_table(args.table, f, fmt, args.chunk_size, report_progress)
+    write_jsonl({"table": args.table, "read": read, "inserted": inserted, "skipped": read - inserted})
+    return 0
+
+
+def build_parser():
+    from utils.config import BATCH_MAX_WORKERS, BATCH_RATE_PER_MINUTE, TRANSFER_CHUNK_SIZE
+
+    today = datetime.date.today().isoformat()
+    parser = argparse.ArgumentParser(prog="cli.py", description="칼로리노트 헤드리스 CLI")
+    parser.add_argument("--trace", metavar="PATH", help="실행 구간을 Chrome trace JSON 으로 저장")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    analyze = subparsers.add_parser("analyze", help="이미지(파일/폴더) GPT 분석")
+    analyze.add_argument("paths", nargs="+", help="이미지 파일 또는 폴더")
+    analyze.add_argument("--save", action="store_true", help="분석 결과를 DB 에 저장")
+    analyze.add_argument("--date", default=today, help="저장할 날짜 (YYYY-MM-DD)")
+    analyze.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="동시 실행 수")
+    analyze.add_argument("--rate", type=float, default=BATCH_RATE_PER_MINUTE, help="분당 최대 요청 수")
+    analyze.set_defaults(func=cmd_analyze)
+
+    log = subparsers.add_parser("log", help="음식 칼로리 직접 기록")
+    log.add_argument("food_name")
+    log.add_argument("calories", type=int)
+    log.add_argument("--date", default=today, help="날짜 (YYYY-MM-DD)")
+    log.set_defaults(func=cmd_log)
+
+    report = subparsers.add_parser("report", help="일자별 칼로리 합계")
+    report.add_argument("--from", dest="date_from", help="시작 날짜 (YYYY-MM-DD)")
+    report.add_argument("--to", dest="date_to", help="종료 날짜 (YYYY-MM-DD)")
+    report.set_defaults(func=cmd_report)
+
+    rebuild = subparsers.add_parser("rebuild-totals", help="일자별 합계(daily_totals) 재계산")
+    rebuild.set_defaults(func=cmd_rebuild_totals)
+
+    export = subparsers.add_parser("export", help="테이블을 JSONL/CSV 로 내보내기")
+    export.add_argument("table", choices=["calories", "gpt_requests"])
+    export.add_argument("--output", metavar="PATH", help="저장할 파일 (생략하면 stdout)")
+    export.add_argument("--format", choices=["jsonl", "csv"], help="형식 (생략하면 확장자로 추정, 기본 jsonl)")
+    export.add_argument("--chunk-size", type=int, default=TRANSFER_CHUNK_SIZE, help="한 번에 읽는 행 수")
+    export.set_defaults(func=cmd_export)
+
+    import_ = subparsers.add_parser("import", help="export 로 내보낸 JSONL/CSV 가져오기 (중복 행은 건너뜀)")
+    import_.add_argument("table", choices=["calories", "gpt_requests"])
+    import_.add_argument("path", help="가져올 파일")
+    import_.add_argument("--format", choices=["jsonl", "csv"], help="형식 (생략하면 확장자로 추정, 기본 jsonl)")
+    import_.add_argument("--chunk-size", type=int, default=TRANSFER_CHUNK_SIZE, help="한 트랜잭션에 넣는 행 수")
+    import_.set_defaults(func=cmd_import)
+    return parser
+
+
+def main(argv=None):
+    from utils.db_handler import init_db
+
+    args = build_parser().parse_args(argv)
+    init_db()
+    try:
+        return args.func(args)
+    finally:
+        if args.trace:
+            from utils.tracing import tracer
+
+            tracer.export_chrome_trace(args.trace)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from api.food_analysis import FoodStreamParser, clean_response, parse_foods
+from api.openai_api import stream_describe_image
+from utils.db_handler import insert_gpt_request, select_latest_response_for_image
+from utils.image_store import read_image_file
+from utils.log_config import get_logger
+
+
+class AnalysisWorkerSignals(QObject):
+    """
+    AnalysisWorker 결과를 UI 스레드로 전달하는 시그널 모음. 모든 시그널의 첫 인자는 job_id.
+    item 은 스트리밍 중 음식 하나가 완성될 때마다, finished 는 응답 저장 후 마지막에 한 번 보냄.
+    """
+
+    item = pyqtSignal(int, dict)
+    finished = pyqtSignal(int, list)
+    no_result = pyqtSignal(int)
+    failed = pyqtSignal(int, str)
+    cancelled = pyqtSignal(int)
+
+
+class AnalysisWorker(QRunnable):
+    """
+    GPT 이미지 분석, 응답 파싱, gpt_requests 저장을 QThreadPool 에서 수행하는 작업 단위.
+    응답을 스트리밍으로 받아 음식 항목이 완성되는 대로 item 시그널로 보내고,
+    취소되면 다음 응답 조각을 받을 때 스트림을 닫고 cancelled 시그널을 보냄.
+    """
+
+    def __init__(self, job_id, image, prompt):
+        """
+        image 는 UploadTab 이 한 번 읽어 둔 IngestedImage. 분석 캐시 키, 전처리, DB 저장에 같은 바이트를 사용.
+        """
+        super().__init__()
+        self.job_id = job_id
+        self.image = image
+        self.prompt = prompt
+        self.signals = AnalysisWorkerSignals()
+        self.logger = get_logger(__name__)
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        self.logger.info(f"[분석작업 {self.job_id}] 시작: {self.image.path}, {self.image.size:,} bytes")
+        started = time.perf_counter()
+        parser = FoodStreamParser()
+        streamed = []
+
+        def on_delta(text):
+            for food in parser.feed(text):
+                if not streamed:
+                    self.logger.info(f"[분석작업 {self.job_id}] 첫 음식 항목 수신: {time.perf_counter() - started:.2f}초")
+                streamed.append(food)
+                if not self.is_cancelled():
+                    self.signals.item.emit(self.job_id, food)
+
+        try:
+            if self.is_cancelled():
+                self.signals.cancelled.emit(self.job_id)
+                return
+            result = clean_response(stream_describe_image(self.image.data, self.prompt, on_delta, self._cancel_event))
+            if self.is_cancelled():
+                self.logger.info(f"[분석작업 {self.job_id}] 취소됨, 결과 폐기")
+                self.signals.cancelled.emit(self.job_id)
+                return
+            self.logger.info(f"[분석작업 {self.job_id}] GPT API 응답: {result}")
+            if result is None:
+                # 응답이 비어 있으면 이력을 남기지 않음
+                self.signals.no_result.emit(self.job_id)
+                return
+            insert_gpt_request(self.image, self.prompt, result)
+            foods = parse_foods(result)
+            # 스트리밍 파서가 놓친 항목(예상과 다른 형식)은 전체 응답 기준으로 마저 보냄
+            for food in foods[len(streamed):]:
+                self.signals.item.emit(self.job_id, food)
+            self.logger.info(
+                f"[분석작업 {self.job_id}] 분석된 음식 개수: {len(foods)}, 전체 소요: {time.perf_counter() - started:.2f}초"
+            )
+            self.signals.finished.emit(self.job_id, foods)
+        except json.JSONDecodeError as e:
+            self.logger.error(f"[분석작업 {self.job_id}] JSON 파싱 오류 발생: {e}")
+            self.signals.failed.emit(self.job_id, f"JSON 파싱 오류 발생: {e}")
+        except Exception as e:
+            self.logger.error(f"[분석작업 {self.job_id}] 응답 오류 발생: {e}")
+            self.signals.failed.emit(self.job_id, f"응답 오류 발생: {e}")
+
+
+class ImagePrepareSignals(QObject):
+    """
+    ImagePrepareWorker 결과 시그널. 첫 인자는 job_id.
+    ready 는 (job_id, IngestedImage, 비슷한 사진 결과 또는 None). 비슷한 사진 결과는 (해밍 거리, 분석 시각, 음식 목록).
+    """
+
+    ready = pyqtSignal(int, object, object)
+    failed = pyqtSignal(int, str)
+
+
+class ImagePrepareWorker(QRunnable):
+    """
+    분석 전 준비(파일 읽기, 지각 해시 계산, 비슷한 사진의 이전 결과 조회)를 QThreadPool 에서 수행하는 작업 단위.
+    큰 사진을 디코딩하는 지각 해시 계산이 UI 스레드를 막지 않도록 분리함.
+    """
+
+    def __init__(self, job_id, path, image_index):
+        super().__init__()
+        self.job_id = job_id
+        self.path = path
+        self.image_index = image_index
+        self.signals = ImagePrepareSignals()
+        self.logger = get_logger(__name__)
+
+    def find_similar_result(self, image):
+        """
+        image 와 지각 해시가 가까운, 이전에 분석한 사진의 결과를 찾음.
+        반환: (해밍 거리, 분석 시각, 음식 목록) 또는 None. 찾는 중 오류가 나면 None (그냥 새로 분석).
+        """
+        try:
+            if image.dhash is None:
+                return None
+            match = self.image_index.nearest(image.dhash)
+            if match is None:
+                return None
+            distance, image_hash = match
+            row = select_latest_response_for_image(image_hash)
+            if row is None:
+                return None
+            _, response, timestamp = row
+            foods = parse_foods(response)
+            return (distance, timestamp, foods) if foods else None
+        except Exception as e:
+            self.logger.warning(f"[분석준비 {self.job_id}] 비슷한 사진 검색 실패: {e}")
+            return None
+
+    def run(self):
+        try:
+            # 파일은 여기서 한 번만 읽고, 비슷한 사진 검색과 분석/저장에 같은 바이트를 사용
+            image = read_image_file(self.path)
+        except OSError as e:
+            self.logger.error(f"[분석준비 {self.job_id}] 이미지 읽기 실패: {e}")
+            self.signals.failed.emit(self.job_id, f"이미지 읽기 실패: {e}")
+            return
+        self.signals.ready.emit(self.job_id, image, self.find_similar_result(image))
+
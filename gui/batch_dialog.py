@@ -0,0 +1,154 @@
+import os
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import (
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+)
+
+from api.batch_analyzer import analyze_batch, save_batch_results
+from api.food_analysis import FOOD_ANALYSIS_PROMPT
+from utils.log_config import get_logger
+
+
+class BatchWorkerSignals(QObject):
+    """
+    BatchWorker 진행 상황을 UI 스레드로 전달하는 시그널 모음.
+    """
+
+    progress = pyqtSignal(int, int, object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class BatchWorker(QRunnable):
+    """
+    api.batch_analyzer.analyze_batch 를 QThreadPool 에서 실행하는 작업 단위.
+    """
+
+    def __init__(self, image_paths, prompt):
+        super().__init__()
+        self.image_paths = image_paths
+        self.prompt = prompt
+        self.signals = BatchWorkerSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            summary = analyze_batch(
+                self.image_paths,
+                self.prompt,
+                on_progress=lambda done, total, result: self.signals.progress.emit(done, total, result),
+                should_cancel=self._cancel_event.is_set,
+            )
+            self.signals.finished.emit(summary)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+class BatchAnalysisDialog(QDialog):
+    """
+    여러 이미지를 일괄 분석하는 대화상자. 이미지별 진행 상태를 보여주고,
+    완료 후 성공한 결과를 한 번에 DB 에 저장함.
+    """
+
+    def __init__(self, image_paths, date_str, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger(__name__)
+        self.image_paths = image_paths
+        self.date_str = date_str
+        self.summary = None
+        self.saved_count = 0
+        self.running = True
+        self.setWindowTitle("일괄 분석")
+        self.resize(500, 400)
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        self.status_label = QLabel(f"{len(image_paths)}장 분석 대기 중 (날짜: {date_str})")
+        layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, len(image_paths))
+        layout.addWidget(self.progress_bar)
+        self.item_list = QListWidget()
+        self.items = {}
+        for path in image_paths:
+            item = QListWidgetItem(f"⏳ {os.path.basename(path)}")
+            self.item_list.addItem(item)
+            self.items[path] = item
+        layout.addWidget(self.item_list)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.cancel_btn = QPushButton("취소")
+        self.cancel_btn.clicked.connect(self.cancel)
+        button_layout.addWidget(self.cancel_btn)
+        self.close_btn = QPushButton("닫기")
+        self.close_btn.setEnabled(False)
+        self.close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.close_btn)
+        layout.addLayout(button_layout)
+
+        self.worker = BatchWorker(image_paths, FOOD_ANALYSIS_PROMPT)
+        self.worker.signals.progress.connect(self.on_progress)
+        self.worker.signals.finished.connect(self.on_finished)
+        self.worker.signals.failed.connect(self.on_failed)
+        QThreadPool.globalInstance().start(self.worker)
+        self.logger.info(f"[일괄분석] {len(image_paths)}장 분석 시작")
+
+    def on_progress(self, done, total, result):
+        item = self.items[result.image_path]
+        name = os.path.basename(result.image_path)
+        if result.ok:
+            foods = ", ".join(f"{f['food_name']}({f['calories']})" for f in result.foods)
+            item.setText(f"✅ {name} - {foods or '음식 없음'} [{result.elapsed:.1f}초]")
+        else:
+            item.setText(f"❌ {name} - {result.error}")
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"{done}/{total} 완료")
+
+    def on_finished(self, summary):
+        self.summary = summary
+        self.running = False
+        self.cancel_btn.setEnabled(False)
+        self.close_btn.setEnabled(True)
+        try:
+            self.saved_count = save_batch_results(summary, FOOD_ANALYSIS_PROMPT, self.date_str)
+        except Exception as e:
+            self.logger.error(f"[일괄분석] 결과 저장 실패: {e}")
+            QMessageBox.warning(self, "DB 오류", f"일괄 분석 결과 저장 실패: {e}")
+            return
+        state = "취소됨" if summary.cancelled else "완료"
+        self.status_label.setText(
+            f"{state}: 성공 {summary.succeeded}장, 실패 {summary.failed}장, 음식 {self.saved_count}건 저장 | "
+            f"{summary.elapsed:.1f}초, {summary.images_per_minute:.1f} 이미지/분"
+        )
+
+    def on_failed(self, message):
+        self.logger.error(f"[일괄분석] 실패: {message}")
+        self.running = False
+        self.cancel_btn.setEnabled(False)
+        self.close_btn.setEnabled(True)
+        self.status_label.setText(f"일괄 분석 실패: {message}")
+
+    def cancel(self):
+        self.logger.info("[일괄분석] 취소 요청")
+        self.cancel_btn.setEnabled(False)
+        self.status_label.setText("취소 중... (진행 중인 분석이 끝나면 완료된 결과만 저장)")
+        self.worker.cancel()
+
+    def reject(self):
+        # 분석이 진행 중이면 창을 닫기 전에 취소부터 요청
+        if self.running:
+            self.cancel()
+            return
+        super().reject()
@@ -0,0 +1,126 @@
+from PyQt5.QtCore import QAbstractTableModel, QEvent, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+from utils.db_handler import select_calories_by_ids, select_calories_page
+from utils.log_config import get_logger
+from utils.tracing import traced
+
+
+class CaloriesTableModel(QAbstractTableModel):
+    """
+    calories 테이블을 id 내림차순으로 보여주는 모델.
+    처음에는 한 페이지만 불러오고, 스크롤이 끝에 닿으면 fetchMore 로 다음 페이지를 keyset 조회함.
+    """
+
+    HEADERS = ["ID", "FOOD NAME", "CALORIES", "DATE", ""]
+    DELETE_COLUMN = 4
+
+    def __init__(self, page_size=200, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger(__name__)
+        self.page_size = page_size
+        self.rows = []
+        self.has_more = True
+
+    def reload(self):
+        """
+        불러온 행을 모두 버리고 첫 페이지부터 다시 조회.
+        """
+        self.beginResetModel()
+        self.rows = []
+        self.has_more = True
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        if index.column() == self.DELETE_COLUMN:
+            return "삭제"
+        return str(self.rows[index.row()][index.column()])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more
+
+    @traced("ui.CaloriesTableModel.fetchMore", "ui")
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.has_more:
+            return
+        before_id = self.rows[-1][0] if self.rows else None
+        page = select_calories_page(before_id, self.page_size)
+        self.has_more = len(page) == self.page_size
+        if not page:
+            return
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
+
+    def calorie_id(self, row):
+        return self.rows[row][0]
+
+    def insert_ids(self, ids):
+        """
+        새로 저장된 레코드를 DB 에서 읽어 정렬 위치(id 내림차순)에 끼워 넣음.
+        아직 불러오지 않은 범위의 id 는 건너뜀 (스크롤 시 fetchMore 로 불러옴).
+        """
+        loaded = {values[0] for values in self.rows}
+        new_rows = [row for row in select_calories_by_ids(ids) if row[0] not in loaded]
+        top = [row for row in new_rows if not self.rows or row[0] > self.rows[0][0]]
+        if top:
+            self.beginInsertRows(QModelIndex(), 0, len(top) - 1)
+            self.rows[0:0] = top
+            self.endInsertRows()
+        for row_values in new_rows[len(top):]:
+            if self.has_more and row_values[0] < self.rows[-1][0]:
+                continue
+            position = next(
+                (i for i, values in enumerate(self.rows) if values[0] < row_values[0]),
+                len(self.rows),
+            )
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.rows.insert(position, row_values)
+            self.endInsertRows()
+
+    def remove_ids(self, ids):
+        """
+        이미 불러온 행 중 ids 에 해당하는 행을 모델에서 제거.
+        """
+        targets = set(ids)
+        for row in range(len(self.rows) - 1, -1, -1):
+            if self.rows[row][0] in targets:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.rows[row]
+                self.endRemoveRows()
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """
+    셀에 삭제 버튼을 그려주는 델리게이트. 행마다 위젯을 만들지 않고, 클릭 시 clicked(row) 시그널을 보냄.
+    """
+
+    clicked = pyqtSignal(int)
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data()
+        button.state = QStyle.State_Enabled
+        QApplication.style().drawControl(QStyle.CE_PushButton, button, painter)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and option.rect.contains(event.pos()):
+            self.clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,29 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from utils.db_events import subscribe
+
+
+class DbEventBridge(QObject):
+    """
+    utils.db_events 의 변경 이벤트를 Qt 시그널로 전달. 백그라운드 스레드에서 발행된 이벤트도
+    queued connection 으로 UI 스레드에서 처리됨.
+    """
+
+    changed = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        subscribe(self.changed.emit)
+
+
+_bridge = None
+
+
+def get_event_bridge():
+    """
+    UI 스레드에서 처음 호출될 때 만들어지는 DbEventBridge 싱글턴 반환.
+    """
+    global _bridge
+    if _bridge is None:
+        _bridge = DbEventBridge()
+    return _bridge
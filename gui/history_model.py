@@ -0,0 +1,136 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from gui.thumbnail_cache import ThumbnailLoader, get_thumbnail_cache, get_thumbnail_pool
+from utils.config import THUMBNAIL_SIZE
+from utils.db_handler import (
+    search_gpt_requests,
+    select_gpt_requests_by_ids,
+    select_gpt_requests_page,
+)
+from utils.log_config import get_logger
+from utils.tracing import traced
+
+
+class GptHistoryModel(QAbstractTableModel):
+    """
+    GPT 요청 이력 모델. 검색어가 없으면 최신순(keyset), 있으면 FTS5 관련도순(offset)으로
+    한 페이지씩 불러옴. 셀에는 앞부분/일치 부분만 담고 전체 내용은 필요할 때 따로 조회함.
+    ID 칸에는 분석한 사진의 썸네일을 표시. 화면에 그려질 때 처음 요청되어 작업 스레드에서 준비됨.
+    """
+
+    HEADERS = ["ID", "Prompt", "Response", "Timestamp"]
+    # 행 튜플에서 화면에 표시하지 않는 images.hash 위치
+    IMAGE_HASH = 4
+
+    def __init__(self, page_size=100, thumbnail_size=THUMBNAIL_SIZE, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger(__name__)
+        self.page_size = page_size
+        self.thumbnail_size = thumbnail_size
+        self.query = ""
+        self.rows = []
+        self.has_more = True
+        # 준비 중인 썸네일 (이미지 해시 → 작업), 불러오지 못한 이미지 해시
+        self.thumbnail_jobs = {}
+        self.thumbnail_failed = set()
+
+    def set_query(self, query):
+        """
+        검색어를 바꾸고 첫 페이지부터 다시 조회. 빈 문자열이면 전체 이력.
+        """
+        self.query = query.strip()
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self.rows = []
+        self.has_more = True
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DecorationRole and index.column() == 0:
+            return self.thumbnail(self.rows[index.row()][self.IMAGE_HASH])
+        if role != Qt.DisplayRole:
+            return None
+        value = self.rows[index.row()][index.column()]
+        return "" if value is None else str(value)
+
+    def thumbnail(self, image_hash):
+        """
+        메모리 캐시에 있는 썸네일을 반환. 없으면 백그라운드로 요청하고 None 반환 (준비되면 해당 행을 다시 그림).
+        """
+        if not image_hash or image_hash in self.thumbnail_failed:
+            return None
+        size = self.thumbnail_size
+        image = get_thumbnail_cache().peek(image_hash, size, size)
+        if image is None and image_hash not in self.thumbnail_jobs:
+            loader = ThumbnailLoader(image_hash, size, size, image_hash=image_hash)
+            loader.signals.loaded.connect(self.on_thumbnail_loaded)
+            loader.signals.failed.connect(self.on_thumbnail_failed)
+            self.thumbnail_jobs[image_hash] = loader
+            get_thumbnail_pool().start(loader)
+        return image
+
+    def on_thumbnail_loaded(self, image_hash, image):
+        self.thumbnail_jobs.pop(image_hash, None)
+        for row, values in enumerate(self.rows):
+            if values[self.IMAGE_HASH] == image_hash:
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def on_thumbnail_failed(self, image_hash, message):
+        self.thumbnail_jobs.pop(image_hash, None)
+        self.thumbnail_failed.add(image_hash)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more
+
+    @traced("ui.GptHistoryModel.fetchMore", "ui")
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.has_more:
+            return
+        if self.query:
+            page = search_gpt_requests(self.query, self.page_size, len(self.rows))
+        else:
+            before_id = self.rows[-1][0] if self.rows else None
+            page = select_gpt_requests_page(before_id, self.page_size)
+        self.has_more = len(page) == self.page_size
+        if not page:
+            return
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
+
+    def request_id(self, row):
+        return self.rows[row][0]
+
+    def insert_ids(self, ids):
+        """
+        새 이력을 맨 위에 추가. 검색 중이면 관련도 순서를 알 수 없으므로 추가하지 않음.
+        """
+        if self.query:
+            return
+        new_rows = [
+            row for row in select_gpt_requests_by_ids(ids)
+            if not self.rows or row[0] > self.rows[0][0]
+        ]
+        if not new_rows:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(new_rows) - 1)
+        self.rows[0:0] = new_rows
+        self.endInsertRows()
@@ -0,0 +1,46 @@
+import importlib
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QVBoxLayout, QWidget
+
+from utils.log_config import get_logger
+from utils.tracing import traced
+
+
+class LazyTab(QWidget):
+    """
+    탭이 처음 보일 때 실제 탭 위젯을 만드는 자리표시자.
+    탭 모듈(matplotlib 등 무거운 import 포함)도 이때 import 하므로, 창이 먼저 뜬 뒤에 탭을 구성함.
+    """
+
+    def __init__(self, module_name, class_name, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger(__name__)
+        self.module_name = module_name
+        self.class_name = class_name
+        self.widget = None
+        self.build_scheduled = False
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    def paintEvent(self, event):
+        """
+        처음 그려질 때(빈 화면이 먼저 표시된 뒤) 이벤트 루프 다음 차례에 실제 탭을 생성.
+        """
+        super().paintEvent(event)
+        if self.widget is None and not self.build_scheduled:
+            self.build_scheduled = True
+            QTimer.singleShot(0, self.build)
+
+    @traced("ui.LazyTab.build", "ui")
+    def build(self):
+        """
+        실제 탭 위젯을 생성해 자리표시자 안에 넣음. 이미 만들어졌으면 그대로 반환.
+        """
+        if self.widget is None:
+            module = importlib.import_module(self.module_name)
+            self.widget = getattr(module, self.class_name)()
+            self.layout().addWidget(self.widget)
+            self.logger.info(f"탭 생성 완료: {self.class_name}")
+        return self.widget
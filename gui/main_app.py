@@ -1,3 +1,5 @@
+import time
+
 from PyQt5.QtWidgets import (
     QMainWindow,
     QTabWidget,
@@ -5,10 +7,10 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
-from gui.tab_analysis import AnalysisTab
-from gui.tab_history import HistoryTab
-from gui.tab_upload import UploadTab
+from gui.lazy_tab import LazyTab
+from utils.db_connection import close_all_connections
 from utils.db_handler import init_db
+from utils.db_watcher import ExternalChangeWatcher
 from utils.log_config import get_logger
 
 
@@ -17,31 +19,71 @@ class MainWindow(QMainWindow):
     메인 윈도우 클래스. 탭 위젯을 포함하며, 프로그램의 진입점 역할을 함.
     """
 
-    def __init__(self):
+    def __init__(self, started_at=None):
         """
         MainWindow 생성자. UI 초기화 및 DB 초기화 수행.
+        started_at 은 프로세스 시작 시각(time.perf_counter)으로, 첫 화면 표시까지 걸린 시간 로그에 사용.
         """
         super().__init__()
+        self.started_at = started_at
+        self.first_paint_logged = False
         self.logger = get_logger(__name__)
         self.logger.info("칼로리 분석 프로그램 시작")
         self.setWindowTitle("OpenAI 이미지 설명 프로그램")
         self.setGeometry(100, 100, 1000, 700)
-        self.init_ui()
+        # 각 탭이 생성 시 DB 를 조회하므로 스키마를 먼저 준비
         init_db()
+        self.init_ui()
+        # CLI 등 다른 프로세스가 쓴 변경도 탭과 색인에 반영
+        self.change_watcher = ExternalChangeWatcher()
+        self.change_watcher.start()
 
     def init_ui(self):
         """
         메인 UI를 초기화하고, 탭 위젯을 생성하여 각 탭(업로드, 분석, 히스토리)을 추가함.
+        각 탭은 처음 선택될 때 생성되므로 창은 탭 구성(DB 조회, 그래프)을 기다리지 않고 먼저 표시됨.
         """
         main_widget = QWidget()
         main_layout = QVBoxLayout()
         main_widget.setLayout(main_layout)
         self.setCentralWidget(main_widget)
         self.tabs = QTabWidget()
-        self.upload_tab = UploadTab()
-        self.analysis_tab = AnalysisTab()
-        self.history_tab = HistoryTab()
+        self.upload_tab = LazyTab("gui.tab_upload", "UploadTab")
+        self.analysis_tab = LazyTab("gui.tab_analysis", "AnalysisTab")
+        self.history_tab = LazyTab("gui.tab_history", "HistoryTab")
         self.tabs.addTab(self.upload_tab, "Upload")
         self.tabs.addTab(self.analysis_tab, "Analysis")
         self.tabs.addTab(self.history_tab, "GPT History")
         main_layout.addWidget(self.tabs)
+        self.trace_panel = None
+        tools_menu = self.menuBar().addMenu("도구")
+        tools_menu.addAction("성능 통계", self.show_trace_panel)
+
+    def show_trace_panel(self):
+        """
+        성능 통계 창을 열거나, 이미 열려 있으면 앞으로 가져옴.
+        """
+        if self.trace_panel is None:
+            from gui.trace_panel import TracePanel
+
+            self.trace_panel = TracePanel(self)
+        self.trace_panel.show()
+        self.trace_panel.raise_()
+
+    def paintEvent(self, event):
+        """
+        첫 페인트 시점에 시작부터 걸린 시간(time-to-first-paint)을 로그로 남김.
+        """
+        super().paintEvent(event)
+        if not self.first_paint_logged and self.started_at is not None:
+            self.first_paint_logged = True
+            elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+            self.logger.info(f"첫 화면 표시까지 {elapsed_ms:.0f}ms")
+
+    def closeEvent(self, event):
+        """
+        창을 닫을 때 DB 변경 감시를 멈추고 재사용 중인 DB 연결을 모두 닫음.
+        """
+        self.change_watcher.stop()
+        close_all_connections()
+        super().closeEvent(event)
@@ -1,74 +1,242 @@
-import datetime
-
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QVBoxLayout, QWidget
+from PyQt5.QtCore import QDate
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QDateEdit,
+    QHBoxLayout,
+    QLabel,
+    QVBoxLayout,
+    QWidget,
+)
 
-from utils.db_handler import select_calorie_sum_by_date
+from gui.db_event_bridge import get_event_bridge
+from utils.analytics import (
+    daily_series,
+    downsample_minmax,
+    resolve_range,
+    rolling_mean,
+    rollup,
+    target_summary,
+)
+from utils.config import DAILY_CALORIE_TARGET, ROLLING_AVERAGE_DAYS
+from utils.db_events import RELOADED
+from utils.db_handler import select_calorie_sum_for_dates, select_daily_totals
 from utils.log_config import get_logger
+from utils.tracing import traced
+
+# (콤보박스 표시 이름, analytics 범위 이름). "custom" 은 날짜 선택기를 사용
+RANGE_OPTIONS = [
+    ("최근 1주", "week"),
+    ("최근 1개월", "month"),
+    ("최근 1년", "year"),
+    ("전체", "all"),
+    ("직접 지정", "custom"),
+]
+GROUPING_OPTIONS = [("일별", "day"), ("주별", "week"), ("월별", "month")]
+
 
 class AnalysisTab(QWidget):
     """
     칼로리 섭취량을 날짜별로 시각화하는 그래프 탭.
-    DB에서 날짜별 칼로리 합계를 조회하여 matplotlib 그래프로 표시.
+    선택한 기간의 일자별 합계만 DB에서 조회하고, 일/주/월 단위 집계와 이동 평균, 목표 대비 실적을 보여줌.
+    그래프의 선(artist)은 한 번만 만들고 이후에는 데이터만 바꿔 다시 그림.
     """
     def __init__(self, parent=None):
         """
-        AnalysisTab 생성자. 그래프 및 UI 초기화, 최초 그래프 표시.
+        AnalysisTab 생성자. 기간/집계 선택 UI 와 그래프 초기화, 최초 그래프 표시.
         """
         super().__init__(parent)
         self.logger = get_logger(__name__)
+        self.totals = {}
+        self.range_start, self.range_end = None, None
+        main_layout = QVBoxLayout()
+        # 상단: 기간, 집계 단위 선택
+        control_layout = QHBoxLayout()
+        self.range_combo = QComboBox()
+        for label, _ in RANGE_OPTIONS:
+            self.range_combo.addItem(label)
+        self.range_combo.setCurrentIndex(1)
+        self.start_date_edit = QDateEdit(QDate.currentDate().addDays(-29))
+        self.end_date_edit = QDateEdit(QDate.currentDate())
+        for date_edit in (self.start_date_edit, self.end_date_edit):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("yyyy-MM-dd")
+            date_edit.setEnabled(False)
+        self.grouping_combo = QComboBox()
+        for label, _ in GROUPING_OPTIONS:
+            self.grouping_combo.addItem(label)
+        control_layout.addWidget(QLabel("기간"))
+        control_layout.addWidget(self.range_combo)
+        control_layout.addWidget(self.start_date_edit)
+        control_layout.addWidget(QLabel("~"))
+        control_layout.addWidget(self.end_date_edit)
+        control_layout.addWidget(QLabel("집계"))
+        control_layout.addWidget(self.grouping_combo)
+        control_layout.addStretch()
+        main_layout.addLayout(control_layout)
+        # 그래프
         self.figure = plt.Figure(figsize=(4, 3))
         self.canvas = FigureCanvas(self.figure)
         self.ax = self.figure.add_subplot(111)
-        main_layout = QVBoxLayout()
-        top_layout = QHBoxLayout()
-        refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self.plot_calorie_graph)
-        self.logger.info("[분석탭] Refresh 버튼 및 UI 초기화 완료")
-        top_layout.addStretch()
-        top_layout.addWidget(refresh_btn)
-        main_layout.addLayout(top_layout)
+        self.init_artists()
         main_layout.addWidget(self.canvas)
+        # 하단: 목표 대비 요약
+        self.summary_label = QLabel()
+        main_layout.addWidget(self.summary_label)
         self.setLayout(main_layout)
+        self.range_combo.currentIndexChanged.connect(self.on_range_changed)
+        self.start_date_edit.dateChanged.connect(lambda _: self.plot_calorie_graph())
+        self.end_date_edit.dateChanged.connect(lambda _: self.plot_calorie_graph())
+        self.grouping_combo.currentIndexChanged.connect(lambda _: self.draw_graph())
+        self.logger.info("[분석탭] UI 초기화 완료")
         self.plot_calorie_graph()
+        get_event_bridge().changed.connect(self.on_db_changed)
+
+    def init_artists(self):
+        """
+        실적, 이동 평균, 목표선, 안내 문구 artist 를 한 번만 생성. 이후 draw_graph 에서는 데이터만 갱신.
+        """
+        self.ax.set_title("Calorie Intake", fontsize=16, weight="bold")
+        self.ax.set_ylabel("Calorie Total")
+        self.ax.set_xlabel("Date")
+        self.ax.xaxis_date()
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+        (self.actual_line,) = self.ax.plot([], [], color="blue", linestyle="solid", marker="o", markersize=3, label="Actual")
+        (self.average_line,) = self.ax.plot([], [], color="orange", linestyle="solid", label=f"{ROLLING_AVERAGE_DAYS}-day avg")
+        self.target_line = self.ax.axhline(DAILY_CALORIE_TARGET, color="red", linestyle="dashed", linewidth=1, label="Target")
+        self.empty_text = self.ax.text(0.5, 0.5, "No data", ha="center", va="center", fontsize=12, transform=self.ax.transAxes)
+        self.ax.legend(loc="upper left", fontsize=8)
+        self.figure.autofmt_xdate()
 
-    def get_calorie_data(self):
+    def current_range(self):
         """
-        DB에서 날짜별 칼로리 합계 데이터를 조회하여 (날짜 리스트, 칼로리 리스트)로 반환.
+        선택된 기간을 (시작일, 종료일) 문자열로 반환. 전체 기간은 (None, None).
+        """
+        range_name = RANGE_OPTIONS[self.range_combo.currentIndex()][1]
+        if range_name == "custom":
+            return (
+                self.start_date_edit.date().toString("yyyy-MM-dd"),
+                self.end_date_edit.date().toString("yyyy-MM-dd"),
+            )
+        return resolve_range(range_name)
+
+    def current_grouping(self):
+        return GROUPING_OPTIONS[self.grouping_combo.currentIndex()][1]
+
+    def on_range_changed(self):
+        custom = RANGE_OPTIONS[self.range_combo.currentIndex()][1] == "custom"
+        self.start_date_edit.setEnabled(custom)
+        self.end_date_edit.setEnabled(custom)
+        self.plot_calorie_graph()
+
+    def get_calorie_data(self, start_date=None, end_date=None):
+        """
+        DB에서 기간 내 날짜별 칼로리 합계 데이터를 조회하여 (날짜 리스트, 칼로리 리스트)로 반환.
         예외 발생 시 빈 리스트 반환.
         """
-        self.logger.info("[분석탭] 날짜별 칼로리 데이터 조회 시도")
+        self.logger.info(f"[분석탭] 날짜별 칼로리 데이터 조회 시도: {start_date} ~ {end_date}")
         try:
-            dates_str, calories = select_calorie_sum_by_date()
+            dates_str, calories = select_daily_totals(start_date, end_date)
             self.logger.info(f"[분석탭] DB 조회 성공: {len(dates_str)}건")
-            dates = [datetime.datetime.strptime(d, "%Y-%m-%d") for d in dates_str]
-            return dates, calories
+            return dates_str, calories
         except Exception as e:
             self.logger.error(f"[분석탭] DB read error: {e}")
             return [], []
 
+    def in_range(self, date):
+        return (self.range_start is None or date >= self.range_start) and (
+            self.range_end is None or date <= self.range_end
+        )
+
+    def on_db_changed(self, event):
+        """
+        calories 변경 이벤트 중 선택 기간에 속한 날짜들만 합계를 다시 조회해 그래프에 반영.
+        대량 변경(RELOADED)이면 선택 기간 전체를 다시 조회.
+        """
+        if event.table == "calories" and event.action == RELOADED:
+            self.plot_calorie_graph()
+            return
+        if event.table != "calories" or not event.dates:
+            return
+        dates = [date for date in event.dates if self.in_range(date)]
+        if not dates:
+            return
+        try:
+            updated = select_calorie_sum_for_dates(dates)
+        except Exception as e:
+            self.logger.error(f"[분석탭] DB read error: {e}")
+            return
+        for date in dates:
+            if date in updated:
+                self.totals[date] = updated[date]
+            else:
+                self.totals.pop(date, None)
+        self.logger.info(f"[분석탭] 변경된 날짜 반영: {dates}")
+        self.draw_graph()
+
+    @traced("ui.AnalysisTab.plot_calorie_graph", "ui")
     def plot_calorie_graph(self):
         """
-        칼로리 데이터를 그래프로 시각화. 데이터가 없으면 안내 메시지 표시.
+        선택된 기간의 날짜별 합계를 DB에서 다시 불러와 그래프를 그림.
         """
         self.logger.info("[분석탭] 그래프 새로고침 시도")
-        self.ax.clear()
-        dates, calories = self.get_calorie_data()
-        if not dates:
+        self.range_start, self.range_end = self.current_range()
+        dates, calories = self.get_calorie_data(self.range_start, self.range_end)
+        self.totals = dict(zip(dates, calories))
+        self.draw_graph()
+
+    @traced("ui.AnalysisTab.draw_graph", "ui")
+    def draw_graph(self):
+        """
+        메모리에 있는 날짜별 합계를 선택된 단위로 집계해 기존 artist 의 데이터만 교체.
+        일별은 이동 평균을 함께 표시하고, 주/월별은 기록된 날 기준 일평균을 표시함.
+        점이 화면 폭(px)보다 많으면 최소/최대값 기준으로 줄여서 그림.
+        """
+        days, values = daily_series(self.totals, self.range_start, self.range_end)
+        has_data = bool(self.totals)
+        self.empty_text.set_visible(not has_data)
+        if not has_data:
             self.logger.warning("[분석탭] 시각화할 데이터가 없습니다.")
-            self.ax.set_title("Calorie Intake", fontsize=16, weight="bold")
-            self.ax.set_ylabel("Calorie Total")
-            self.ax.set_xlabel("Date")
-            self.ax.text(0.5, 0.5, "No data", ha="center", va="center", fontsize=12)
+            self.actual_line.set_data([], [])
+            self.average_line.set_data([], [])
+            self.summary_label.setText("")
         else:
             self.logger.info("[분석탭] 그래프 데이터 시각화 진행")
-            self.ax.plot_date(dates, calories, color="blue", linestyle="solid")
-            self.ax.set_title("Calorie Intake", fontsize=16, weight="bold")
-            self.ax.set_ylabel("Calorie Total")
-            self.ax.set_xlabel("Date")
-            self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
-            self.figure.autofmt_xdate()
-        self.canvas.draw()
+            max_points = max(self.canvas.width(), 100)
+            grouping = self.current_grouping()
+            if grouping == "day":
+                recorded = ~np.isnan(values)
+                x, y = mdates.date2num(days[recorded]), values[recorded]
+                average = rolling_mean(values, ROLLING_AVERAGE_DAYS)
+                self.average_line.set_data(*downsample_minmax(mdates.date2num(days), average, max_points))
+                self.average_line.set_visible(True)
+                self.ax.set_ylabel("Calorie Total")
+            else:
+                buckets, _, averages = rollup(days, values, grouping)
+                recorded = ~np.isnan(averages)
+                x, y = mdates.date2num(buckets[recorded]), averages[recorded]
+                self.average_line.set_visible(False)
+                self.ax.set_ylabel("Calorie / Day (avg)")
+            self.actual_line.set_data(*downsample_minmax(x, y, max_points))
+            summary = target_summary(values, DAILY_CALORIE_TARGET)
+            self.summary_label.setText(
+                f"목표 {DAILY_CALORIE_TARGET} kcal | 기록 {summary['days']}일 | "
+                f"일평균 {summary['mean']:.0f} kcal ({summary['mean_delta']:+.0f}) | "
+                f"목표 초과 {summary['days_over']}일"
+            )
+            first, last = mdates.date2num(days[0]), mdates.date2num(days[-1])
+            self.ax.set_xlim(first - 0.5, last + 0.5)
+            self.ax.set_ylim(0, max(np.nanmax(values), DAILY_CALORIE_TARGET) * 1.1)
+        self.canvas.draw_idle()
         self.logger.info("[분석탭] 그래프 갱신 완료")
+
+    def resizeEvent(self, event):
+        """
+        화면 폭이 바뀌면 줄여서 그릴 점 개수도 달라지므로 다시 그림.
+        """
+        super().resizeEvent(event)
+        if self.totals:
+            self.draw_graph()
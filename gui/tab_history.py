@@ -1,25 +1,28 @@
+from PyQt5.QtCore import QSize, QTimer
 from PyQt5.QtGui import QCursor, QGuiApplication
 from PyQt5.QtWidgets import (
-    QHBoxLayout,
     QHeaderView,
+    QLineEdit,
     QMessageBox,
-    QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QTextEdit,
     QToolTip,
     QVBoxLayout,
     QWidget,
 )
 
-from utils.db_handler import select_gpt_requests
-from utils.log_config import get_logger
+from gui.db_event_bridge import get_event_bridge
+from gui.history_model import GptHistoryModel
+from utils.db_events import INSERTED, RELOADED
+from utils.db_handler import select_gpt_request_detail
+from utils.log_config import get_logger, rate_limited
+from utils.tracing import traced
 
 
 class HistoryTab(QWidget):
     """
     GPT 요청/응답 이력을 테이블로 보여주는 탭.
-    각 요청의 상세 내용은 셀 클릭 또는 마우스 오버로 확인 가능.
+    검색창으로 prompt/response 전문 검색이 가능하며, 각 요청의 상세 내용은 셀 클릭 또는 마우스 오버로 확인 가능.
     """
 
     def __init__(self, parent=None):
@@ -30,38 +33,38 @@ class HistoryTab(QWidget):
         self.logger = get_logger(__name__)
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
-        # 상단에 Refresh 버튼을 오른쪽 정렬로 배치
-        top_layout = QHBoxLayout()
-        top_layout.addStretch()  # 왼쪽 공간 확보
-        self.refresh_btn = QPushButton("Refresh")
-        top_layout.addWidget(self.refresh_btn)
-        main_layout.addLayout(top_layout)
-        self.refresh_btn.clicked.connect(self.load_gpt_requests)
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(4)
-        self.history_table.setHorizontalHeaderLabels(
-            ["ID", "Prompt", "Response", "Timestamp"]
-        )
-        # 컬럼별 width 정책 지정
-        self.history_table.horizontalHeader().setSectionResizeMode(
-            0, QHeaderView.ResizeToContents
-        )  # ID
+        # 상단: 검색창 (새 이력은 변경 이벤트로 자동 추가되므로 Refresh 버튼 없음)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("프롬프트/응답 검색 (예: 피자)")
+        self.search_edit.setClearButtonEnabled(True)
+        main_layout.addWidget(self.search_edit)
+        # 입력이 멈춘 뒤에만 검색하도록 디바운스
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.load_gpt_requests)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.history_model = GptHistoryModel(parent=self)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        # 컬럼별 width 정책 지정 (ResizeToContents 는 전체 행을 훑으므로 사용하지 않음)
         self.history_table.horizontalHeader().setSectionResizeMode(
             1, QHeaderView.Stretch
         )  # Prompt
         self.history_table.horizontalHeader().setSectionResizeMode(
             2, QHeaderView.Stretch
         )  # Response
-        self.history_table.horizontalHeader().setSectionResizeMode(
-            3, QHeaderView.ResizeToContents
-        )  # Timestamp
         self.history_table.verticalHeader().setVisible(False)
-        self.history_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # 썸네일이 들어가도록 행 높이와 아이콘 크기 지정
+        self.history_table.verticalHeader().setDefaultSectionSize(self.history_model.thumbnail_size + 4)
+        self.history_table.setIconSize(QSize(self.history_model.thumbnail_size, self.history_model.thumbnail_size))
+        self.history_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.history_table.setMouseTracking(True)
         main_layout.addWidget(self.history_table)
-        self.history_table.cellClicked.connect(
+        self.history_table.clicked.connect(
             self.show_cell_content
         )  # 셀 클릭 시 하단에 전체 내용 표시
-        self.history_table.cellEntered.connect(
+        self.history_table.entered.connect(
             self.show_tooltip
         )  # 마우스 오버 시 툴팁 표시
         # 하단에 전체 내용 표시용 QTextEdit 추가 (B안)
@@ -70,46 +73,78 @@ class HistoryTab(QWidget):
         main_layout.addWidget(self.detail_text)
         self.logger.info("[이력탭] UI 초기화 및 이력 데이터 로드 시작")
         self.load_gpt_requests()
+        get_event_bridge().changed.connect(self.on_db_changed)
+
+    def on_db_changed(self, event):
+        """
+        gpt_requests 추가 이벤트를 받아 새 이력만 맨 위에 추가. 대량 변경(RELOADED)이면 처음부터 다시 조회.
+        """
+        if event.table != "gpt_requests" or event.action not in (INSERTED, RELOADED):
+            return
+        try:
+            if event.action == RELOADED:
+                self.history_model.reload()
+            else:
+                self.history_model.insert_ids(event.ids)
+        except Exception as e:
+            self.logger.error(f"[이력탭] 이력 테이블 갱신 실패: {e}")
+
+    def get_full_text(self, index):
+        """
+        셀의 전체 내용을 반환. Prompt/Response 는 목록에 앞부분만 있으므로 DB 에서 상세 조회.
+        """
+        if index.column() in (1, 2):
+            detail = select_gpt_request_detail(self.history_model.request_id(index.row()))
+            if detail is not None:
+                value = detail[index.column() - 1]
+                return "" if value is None else value
+        return index.data()
 
-    def show_cell_content(self, row, col):
+    def show_cell_content(self, index):
         """
         테이블 셀 클릭 시 해당 셀의 전체 내용을 하단 텍스트박스에 표시하고, 클립보드에 복사.
         """
-        item = self.history_table.item(row, col)
-        if item:
-            self.detail_text.setPlainText(item.text())
+        row, col = index.row(), index.column()
+        try:
+            text = self.get_full_text(index)
+        except Exception as e:
+            QMessageBox.warning(self, "DB 오류", f"상세 내용 불러오기 실패: {e}")
+            return
+        if text:
+            self.detail_text.setPlainText(text)
             # 클립보드에 복사
-            QGuiApplication.clipboard().setText(item.text())
+            QGuiApplication.clipboard().setText(text)
             # 복사 완료 툴팁 표시
             QToolTip.showText(QCursor.pos(), "복사됨", self.history_table)
             self.logger.info(f"[이력탭] 셀 클릭: row={row}, col={col}, 내용 복사 완료")
         else:
             self.logger.warning(f"[이력탭] 셀 클릭: row={row}, col={col}, 내용 없음")
 
-    def show_tooltip(self, row, col):
+    def show_tooltip(self, index):
         """
-        테이블 셀에 마우스 오버 시 툴팁으로 전체 내용 표시.
+        테이블 셀에 마우스 오버 시 툴팁으로 내용(앞부분) 표시.
         """
-        item = self.history_table.item(row, col)
-        if item:
-            QToolTip.showText(QCursor.pos(), item.text(), self.history_table)
-            self.logger.info(f"[이력탭] 셀 마우스오버: row={row}, col={col}")
+        text = index.data()
+        if text:
+            QToolTip.showText(QCursor.pos(), text, self.history_table)
+            self.logger.debug(
+                "[이력탭] 셀 마우스오버: row=%d, col=%d", index.row(), index.column(), extra=rate_limited(1.0)
+            )
         else:
-            self.logger.warning(f"[이력탭] 셀 마우스오버: row={row}, col={col}, 내용 없음")
+            self.logger.debug(
+                "[이력탭] 셀 마우스오버: row=%d, col=%d, 내용 없음", index.row(), index.column(), extra=rate_limited(1.0)
+            )
 
+    @traced("ui.HistoryTab.load_gpt_requests", "ui")
     def load_gpt_requests(self):
         """
-        DB에서 GPT 요청/응답 이력 데이터를 불러와 테이블에 표시.
+        검색어에 맞는 GPT 요청/응답 이력 첫 페이지를 불러와 테이블에 표시. 나머지는 스크롤 시 불러옴.
         """
-        self.logger.info("[이력탭] 이력 데이터 로드 시도")
+        query = self.search_edit.text()
+        self.logger.info(f"[이력탭] 이력 데이터 로드 시도: query={query!r}")
         try:
-            rows = select_gpt_requests()
-            self.logger.info(f"[이력탭] DB 조회 성공: {len(rows)}건")
-            self.history_table.setRowCount(len(rows))
-            for row_idx, row in enumerate(rows):
-                for col_idx, value in enumerate(row):
-                    item = QTableWidgetItem(str(value))
-                    self.history_table.setItem(row_idx, col_idx, item)
+            self.history_model.set_query(query)
+            self.logger.info(f"[이력탭] DB 조회 성공: {self.history_model.rowCount()}건")
         except Exception as e:
             self.logger.error(f"DB 데이터 불러오기 실패: {e}")
             QMessageBox.warning(self, "DB 오류", f"DB 데이터 불러오기 실패: {e}")
@@ -1,9 +1,9 @@
 import datetime
-import json
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import QStringListModel, Qt, QThreadPool
+from PyQt5.QtGui import QMovie, QPixmap
 from PyQt5.QtWidgets import (
+    QCompleter,
     QDateEdit,
     QGroupBox,
     QHBoxLayout,
@@ -13,17 +13,26 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QPushButton,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
-from api.openai_api import get_image_description
+from api.food_analysis import FOOD_ANALYSIS_PROMPT
+from api.batch_analyzer import find_images
+from gui.analysis_worker import AnalysisWorker, ImagePrepareWorker
+from gui.batch_dialog import BatchAnalysisDialog
+from gui.calories_model import CaloriesTableModel, DeleteButtonDelegate
 from gui.clickable_label import ClickableLabel
-from utils.db_handler import insert_calorie, insert_gpt_request, select_calories
-from utils.file_handler import get_image_file
+from gui.db_event_bridge import get_event_bridge
+from gui.thumbnail_cache import ThumbnailLoader, get_thumbnail_pool
+from utils.db_events import DELETED, INSERTED, RELOADED
+from utils.db_handler import delete_calorie_by_id, insert_calories
+from utils.file_handler import get_image_directory, get_image_file, get_image_files
+from utils.food_index import get_food_index
+from utils.image_index import get_image_index
 from utils.log_config import get_logger
+from utils.tracing import traced
 
 
 class UploadTab(QWidget):
@@ -38,10 +47,22 @@ class UploadTab(QWidget):
         super().__init__(parent)
         self.logger = get_logger(__name__)
         self.image_path = None
+        self.pending_image_path = None
+        self.image_loader = None
         self.calorie_entries = []
+        self.thread_pool = QThreadPool.globalInstance()
+        self.active_workers = {}
+        # 파일 읽기/비슷한 사진 검색 중인 작업. 끝나면 active_workers 의 분석 작업으로 이어짐
+        self.preparing_workers = {}
+        self.next_job_id = 0
+        # 이전 기록으로 만든 음식 색인. 음식 이름 자동완성과 칼로리 자동 입력에 사용
+        self.food_index = get_food_index()
+        # 이전에 분석한 사진의 지각 해시 색인. 비슷한 사진이면 API 호출 전에 이전 결과를 제안
+        self.image_index = get_image_index()
         self.init_ui()
         self.logger.info("[업로드탭] UI 초기화 완료")
         self.load_calories()
+        get_event_bridge().changed.connect(self.on_db_changed)
 
     def init_ui(self):
         """
@@ -67,6 +88,30 @@ class UploadTab(QWidget):
         self.analysis_btn = QPushButton("GPT 분석")
         self.analysis_btn.clicked.connect(self.generate_description)
         left_panel.addWidget(self.analysis_btn)
+        batch_layout = QHBoxLayout()
+        self.batch_files_btn = QPushButton("여러 장 일괄 분석")
+        self.batch_files_btn.clicked.connect(self.batch_analyze_files)
+        batch_layout.addWidget(self.batch_files_btn)
+        self.batch_dir_btn = QPushButton("폴더 일괄 분석")
+        self.batch_dir_btn.clicked.connect(self.batch_analyze_directory)
+        batch_layout.addWidget(self.batch_dir_btn)
+        left_panel.addLayout(batch_layout)
+        # 분석 진행 표시: 스피너 + 진행 건수 + 취소 버튼 (작업이 있을 때만 표시)
+        self.progress_widget = QWidget()
+        progress_layout = QHBoxLayout()
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_widget.setLayout(progress_layout)
+        self.spinner_label = QLabel()
+        self.spinner_movie = QMovie("gui/spinner.gif")
+        self.spinner_label.setMovie(self.spinner_movie)
+        progress_layout.addWidget(self.spinner_label)
+        self.progress_label = QLabel()
+        progress_layout.addWidget(self.progress_label, 1)
+        self.cancel_btn = QPushButton("취소")
+        self.cancel_btn.clicked.connect(self.cancel_analysis)
+        progress_layout.addWidget(self.cancel_btn)
+        self.progress_widget.setVisible(False)
+        left_panel.addWidget(self.progress_widget)
         result_groupbox = QGroupBox("결과")
         result_layout = QVBoxLayout()
         result_groupbox.setLayout(result_layout)
@@ -93,153 +138,265 @@ class UploadTab(QWidget):
         # 우측 패널
         right_panel = QVBoxLayout()
         layout.addLayout(right_panel, 2)
-        # Refresh 버튼을 우측 상단에 추가
-        refresh_layout = QHBoxLayout()
-        refresh_layout.addStretch()  # 우측 정렬
-        refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self.load_calories)
-        refresh_layout.addWidget(refresh_btn)
-        right_panel.addLayout(refresh_layout)
-        self.calories_table = QTableWidget()
-        self.calories_table.setColumnCount(5)
-        self.calories_table.setHorizontalHeaderLabels(
-            ["ID", "FOOD NAME", "CALORIES", "DATE", ""]
+        # 필요한 페이지만 불러오는 모델/뷰. 삭제 버튼은 행별 위젯 대신 델리게이트로 그림
+        self.calories_model = CaloriesTableModel(parent=self)
+        self.calories_table = QTableView()
+        self.calories_table.setModel(self.calories_model)
+        self.delete_delegate = DeleteButtonDelegate(self.calories_table)
+        self.delete_delegate.clicked.connect(
+            lambda row: self.delete_calorie(self.calories_model.calorie_id(row))
+        )
+        self.calories_table.setItemDelegateForColumn(
+            CaloriesTableModel.DELETE_COLUMN, self.delete_delegate
         )
         self.calories_table.horizontalHeader().setSectionResizeMode(
             1, QHeaderView.Stretch
         )
         self.calories_table.verticalHeader().setVisible(False)
-        self.calories_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.calories_table.setEditTriggers(QTableView.NoEditTriggers)
         right_panel.addWidget(self.calories_table)
 
     def load_image(self):
         """
-        이미지 파일을 선택하여 라벨에 표시. 실패 시 경고 메시지 출력.
+        이미지 파일을 선택하고, 라벨 크기로 줄인 미리보기를 작업 스레드에서 디코딩해 표시.
+        같은 사진은 썸네일 캐시(메모리/디스크)에서 바로 가져옴. 실패 시 경고 메시지 출력.
         """
         self.logger.info("[업로드탭] 이미지 불러오기 시도")
-        try:
-            path = get_image_file()
-            if path:
-                pixmap = QPixmap(path).scaled(
-                    self.image_label.width(),
-                    self.image_label.height(),
-                    Qt.KeepAspectRatio,
-                )
-                if pixmap.isNull():
-                    raise ValueError("이미지를 불러올 수 없습니다.")
-                self.image_label.setPixmap(pixmap)
-                self.image_path = path
-                self.logger.info(f"[업로드탭] 이미지 불러오기 성공: {path}")
-            else:
-                self.logger.warning("[업로드탭] 이미지 경로 없음")
-        except Exception as e:
-            self.logger.error(f"[업로드탭] 이미지 불러오기 실패: {e}")
-            QMessageBox.warning(self, "오류", f"이미지 불러오기 실패: {e}")
+        path = get_image_file()
+        if not path:
+            self.logger.warning("[업로드탭] 이미지 경로 없음")
+            return
+        self.pending_image_path = path
+        self.image_loader = ThumbnailLoader(
+            path, max(self.image_label.width(), 1), max(self.image_label.height(), 1), path=path
+        )
+        self.image_loader.signals.loaded.connect(self.on_image_loaded)
+        self.image_loader.signals.failed.connect(self.on_image_failed)
+        get_thumbnail_pool().start(self.image_loader)
+
+    def on_image_loaded(self, path, image):
+        # 디코딩 중에 다른 이미지를 고른 경우 이전 결과는 버림
+        if path != self.pending_image_path:
+            return
+        self.image_label.setPixmap(QPixmap.fromImage(image))
+        self.image_path = path
+        self.logger.info(f"[업로드탭] 이미지 불러오기 성공: {path}, {image.width()}x{image.height()}")
+
+    def on_image_failed(self, path, message):
+        if path != self.pending_image_path:
+            return
+        self.logger.error(f"[업로드탭] 이미지 불러오기 실패: {message}")
+        QMessageBox.warning(self, "오류", f"이미지 불러오기 실패: {message}")
 
     def generate_description(self):
         """
-        선택한 이미지를 GPT API로 분석하여 음식명/칼로리 정보를 추출, 결과를 입력 폼에 자동 추가.
+        선택한 이미지의 분석을 시작. 파일 읽기와 비슷한 사진 검색은 작업 스레드에서 하고(on_image_prepared),
+        이전 결과를 쓰지 않으면 GPT 분석을 백그라운드 작업으로 시작. 결과는 시그널로 받아 입력 폼에 추가.
         """
         if not self.image_path:
             self.logger.error("이미지를 먼저 불러와 주세요.")
             QMessageBox.warning(self, "오류", "이미지를 먼저 불러와 주세요.")
             return
-        prompt = (
-            "너는 음식 분석 전문가입니다.\n"
-            "이미지를 보고 음식의 이름과 칼로리를 분석해줘.\n"
-            "- 결과는 JSON 형식의 문자열로만 반환해줘.\n"
-            "- 여러 음식이 한 사진에 있을 경우, 각 음식의 이름과 칼로리를 분석해줘.\n"
-            "- [주의사항] 예시:\n"
-            "{\n"
-            '\t"output": [\n'
-            "\t\t{\n"
-            '\t\t\t"food_name": "치킨",\n'
-            '\t\t\t"calories": "100"\n'
-            "\t\t},\n"
-            "\t\t{\n"
-            '\t\t\t"food_name": "피자",\n'
-            '\t\t\t"calories": "200"\n'
-            "\t\t}\n"
-            "\t]\n"
-            "}\n"
-            "- 만약, 음식 사진이 아닌경우, 결과는 빈 배열로 반환해줘.\n"
-            "- [주의사항] 예시:\n"
-            "{\n"
-            '\t"output": []\n'
-            "}"
+        job_id = self.next_job_id
+        self.next_job_id += 1
+        worker = ImagePrepareWorker(job_id, self.image_path, self.image_index)
+        worker.signals.ready.connect(self.on_image_prepared)
+        worker.signals.failed.connect(self.on_image_prepare_failed)
+        self.preparing_workers[job_id] = worker
+        self.thread_pool.start(worker)
+        self.update_progress()
+
+    def on_image_prepared(self, job_id, image, similar):
+        """
+        준비가 끝난 이미지로 비슷한 사진의 이전 결과를 제안하거나 GPT 분석을 시작. 취소된 작업은 무시.
+        """
+        if self.preparing_workers.pop(job_id, None) is None:
+            return
+        self.update_progress()
+        if self.use_similar_result(similar):
+            return
+        if not self.active_workers:
+            # 새 분석 묶음을 시작할 때만 입력 폼을 비우고, 동시에 진행 중인 분석 결과는 이어서 추가
+            self.clear_calorie_entries()
+        worker = AnalysisWorker(job_id, image, FOOD_ANALYSIS_PROMPT)
+        worker.signals.item.connect(self.on_analysis_item)
+        worker.signals.finished.connect(self.on_analysis_finished)
+        worker.signals.no_result.connect(self.on_analysis_no_result)
+        worker.signals.failed.connect(self.on_analysis_failed)
+        worker.signals.cancelled.connect(self.on_analysis_cancelled)
+        self.active_workers[job_id] = worker
+        self.logger.info(f"[업로드탭] GPT 분석 요청 시작: job={job_id}, {image.path}")
+        self.thread_pool.start(worker)
+        self.update_progress()
+
+    def on_image_prepare_failed(self, job_id, message):
+        if self.preparing_workers.pop(job_id, None) is None:
+            return
+        self.update_progress()
+        self.logger.error(f"[업로드탭] {message}")
+        QMessageBox.warning(self, "오류", message)
+
+    def use_similar_result(self, similar):
+        """
+        비슷한 사진의 이전 분석 결과(ImagePrepareWorker 가 찾은 (거리, 분석 시각, 음식 목록))가 있으면
+        사용할지 묻고, 사용하면 API 호출 없이 입력 폼에 채움. 결과를 사용했으면 True 반환.
+        """
+        if similar is None:
+            return False
+        distance, timestamp, foods = similar
+        self.logger.info(f"[업로드탭] 비슷한 사진 발견: 거리 {distance}, {timestamp}, 음식 {len(foods)}개")
+        summary = ", ".join(f"{food['food_name']} {food['calories']}kcal" for food in foods)
+        answer = QMessageBox.question(
+            self,
+            "비슷한 사진",
+            f"{timestamp} 에 분석한 비슷한 사진이 있습니다. (차이 {distance}/64)\n{summary}\n\n"
+            "이전 결과를 사용할까요? '아니오'를 누르면 GPT 로 새로 분석합니다.",
         )
+        if answer != QMessageBox.Yes:
+            return False
+        if not self.active_workers:
+            self.clear_calorie_entries()
+        for food in foods:
+            self.add_calorie_entry(food["food_name"], str(food["calories"]))
+        self.logger.info("[업로드탭] 비슷한 사진의 이전 결과 사용, GPT 호출 생략")
+        return True
+
+    def cancel_analysis(self):
+        """
+        진행 중인 모든 분석 작업을 취소.
+        """
+        self.logger.info(f"[업로드탭] GPT 분석 취소 요청: {len(self.active_workers) + len(self.preparing_workers)}건")
+        for worker in self.active_workers.values():
+            worker.cancel()
+        self.active_workers.clear()
+        # 준비 중인 작업은 멈출 수 없으므로 결과만 무시
+        self.preparing_workers.clear()
+        self.update_progress()
+
+    def update_progress(self):
+        """
+        진행 중인 분석 건수에 따라 스피너 표시/숨김.
+        """
+        count = len(self.active_workers) + len(self.preparing_workers)
+        if count:
+            self.progress_label.setText(f"GPT 분석 중... ({count}건)")
+            self.progress_widget.setVisible(True)
+            self.spinner_movie.start()
+        else:
+            self.spinner_movie.stop()
+            self.progress_widget.setVisible(False)
+
+    def finish_job(self, job_id):
+        """
+        완료된 작업을 목록에서 제거. 이미 취소된 작업이면 False 반환.
+        """
+        worker = self.active_workers.pop(job_id, None)
+        self.update_progress()
+        return worker is not None
+
+    def on_analysis_item(self, job_id, food):
+        """
+        스트리밍 중 완성된 음식 항목을 바로 입력 폼에 추가. 취소된 작업의 항목은 무시.
+        """
+        if job_id not in self.active_workers:
+            return
+        self.logger.info(f"[업로드탭] 음식명: {food['food_name']}, 칼로리: {food['calories']}")
+        self.add_calorie_entry(food["food_name"], str(food["calories"]))
+
+    def on_analysis_finished(self, job_id, foods):
+        if not self.finish_job(job_id):
+            return
+        self.logger.info(f"[업로드탭] 분석된 음식 개수: {len(foods)}")
+
+    def on_analysis_no_result(self, job_id):
+        if not self.finish_job(job_id):
+            return
+        self.logger.warning("[업로드탭] 음식 분석 결과 없음")
+        QMessageBox.warning(self, "경고", "음식 분석 결과가 없습니다.")
+
+    def on_analysis_failed(self, job_id, message):
+        if not self.finish_job(job_id):
+            return
+        self.logger.error(f"[업로드탭] {message}")
+        QMessageBox.warning(self, "오류", message)
+
+    def on_analysis_cancelled(self, job_id):
+        self.finish_job(job_id)
+        self.logger.info(f"[업로드탭] GPT 분석 취소됨: job={job_id}")
+
+    def batch_analyze_files(self):
+        """
+        여러 이미지를 선택해 일괄 분석.
+        """
+        self.start_batch_analysis(get_image_files())
+
+    def batch_analyze_directory(self):
+        """
+        폴더 안의 모든 이미지를 일괄 분석.
+        """
+        directory = get_image_directory()
+        if not directory:
+            return
         try:
-            self.logger.info(f"[업로드탭] GPT 분석 요청 시작: {self.image_path}")
-            result = get_image_description(self.image_path, prompt)
-            if result is not None:
-                result = result.replace("```json", "").replace("```", "").strip()
-            self.logger.info(f"[업로드탭] GPT API 응답: {result}")
-            with open(self.image_path, "rb") as f:
-                image_blob = f.read()
-            insert_gpt_request(image_blob, prompt, result)
-            if result is None:
-                self.logger.warning("[업로드탭] 음식 분석 결과 없음")
-                QMessageBox.warning(self, "경고", "음식 분석 결과가 없습니다.")
-                return
-            json_result = json.loads(result)
-            if hasattr(self, "calorie_entries_layout"):
-                while self.calorie_entries_layout.count():
-                    item = self.calorie_entries_layout.takeAt(0)
-                    widget = item.widget()
-                    if widget is not None:
-                        widget.deleteLater()
-            foods = json_result["output"]
-            self.logger.info(f"[업로드탭] 분석된 음식 개수: {len(foods)}")
-            for food in foods:
-                self.logger.info(f"[업로드탭] 음식명: {food['food_name']}, 칼로리: {food['calories']}")
-                self.add_calorie_entry(food["food_name"], food["calories"])
-        except json.JSONDecodeError as e:
-            self.logger.error(f"[업로드탭] JSON 파싱 오류 발생: {e}")
-            QMessageBox.warning(self, "오류", f"JSON 파싱 오류 발생: {e}")
+            image_paths = find_images(directory)
         except Exception as e:
-            self.logger.error(f"[업로드탭] 응답 오류 발생: {e}")
-            QMessageBox.warning(self, "오류", f"응답 오류 발생: {e}")
+            self.logger.error(f"[업로드탭] 폴더 읽기 실패: {e}")
+            QMessageBox.warning(self, "오류", f"폴더 읽기 실패: {e}")
+            return
+        if not image_paths:
+            QMessageBox.warning(self, "경고", "폴더에 이미지가 없습니다.")
+            return
+        self.start_batch_analysis(image_paths)
 
+    def start_batch_analysis(self, image_paths):
+        """
+        일괄 분석 대화상자를 띄움. 날짜는 입력 폼의 날짜를 사용.
+        """
+        if not image_paths:
+            self.logger.warning("[업로드탭] 일괄 분석할 이미지 없음")
+            return
+        date_str = self.date_edit.date().toString("yyyy-MM-dd")
+        self.logger.info(f"[업로드탭] 일괄 분석 시작: {len(image_paths)}장, date={date_str}")
+        dialog = BatchAnalysisDialog(image_paths, date_str, self)
+        dialog.exec_()
+
+    @traced("ui.UploadTab.load_calories", "ui")
     def load_calories(self):
         """
-        DB에서 칼로리 정보를 불러와 테이블에 표시.
+        DB에서 칼로리 정보 첫 페이지를 불러와 테이블에 표시. 나머지는 스크롤 시 불러옴.
         """
         self.logger.info("[업로드탭] 칼로리 테이블 로드 시도")
         try:
-            rows = select_calories()
-            rows = [list(row[:-1]) for row in rows]
-            self.logger.info(f"[업로드탭] 칼로리 DB 조회 성공: {len(rows)}건")
-            self.calories_table.setColumnCount(5)
-            self.calories_table.setHorizontalHeaderLabels(
-                ["ID", "FOOD NAME", "CALORIES", "DATE", ""]
-            )
-            self.calories_table.setRowCount(len(rows))
-            for row_idx, row in enumerate(rows):
-                for col_idx, value in enumerate(row):
-                    item = QTableWidgetItem(str(value))
-                    self.calories_table.setItem(row_idx, col_idx, item)
-                # 삭제 버튼 추가 (late binding 문제 해결)
-                delete_btn = QPushButton("삭제")
-                calorie_id = row[0]  # ID는 첫 번째 컬럼
-                delete_btn.clicked.connect(
-                    lambda checked, cid=calorie_id: self.delete_calorie(cid)
-                )
-                self.calories_table.setCellWidget(row_idx, len(row), delete_btn)
+            self.calories_model.reload()
+            self.logger.info(f"[업로드탭] 칼로리 DB 조회 성공: {self.calories_model.rowCount()}건")
         except Exception as e:
             self.logger.error(f"[업로드탭] DB 데이터 불러오기 실패: {e}")
             QMessageBox.warning(self, "DB 오류", f"DB 데이터 불러오기 실패: {e}")
 
-    def delete_calorie(self, calorie_id):
+    def on_db_changed(self, event):
         """
-        주어진 ID의 칼로리 레코드를 DB에서 삭제하고 테이블을 갱신.
+        calories 변경 이벤트를 받아 테이블에 추가/삭제된 행만 반영. 대량 변경(RELOADED)이면 첫 페이지부터 다시 조회.
         """
-        from utils.db_handler import delete_calorie_by_id
+        if event.table != "calories":
+            return
+        try:
+            if event.action == INSERTED:
+                self.calories_model.insert_ids(event.ids)
+            elif event.action == DELETED:
+                self.calories_model.remove_ids(event.ids)
+            elif event.action == RELOADED:
+                self.calories_model.reload()
+        except Exception as e:
+            self.logger.error(f"[업로드탭] 칼로리 테이블 갱신 실패: {e}")
 
+    def delete_calorie(self, calorie_id):
+        """
+        주어진 ID의 칼로리 레코드를 DB에서 삭제. 테이블 행은 변경 이벤트로 제거됨.
+        """
         self.logger.info(f"[업로드탭] 칼로리 삭제 시도: id={calorie_id}")
         try:
             delete_calorie_by_id(calorie_id)
             self.logger.info(f"[업로드탭] 칼로리 삭제 성공: id={calorie_id}")
-            self.load_calories()
             QMessageBox.information(self, "삭제 완료", "칼로리 정보가 삭제되었습니다.")
         except Exception as e:
             self.logger.error(f"[업로드탭] 칼로리 삭제 실패: {e}")
@@ -260,6 +417,7 @@ class UploadTab(QWidget):
         kcal_edit.setPlaceholderText("칼로리(kcal)")
         kcal_edit.setText(kcal_text)
         kcal_edit.setFixedWidth(60)
+        self.attach_food_completer(food_edit, kcal_edit)
         remove_btn = QPushButton("삭제")
 
         def remove():
@@ -273,6 +431,35 @@ class UploadTab(QWidget):
         self.calorie_entries_layout.addWidget(row_widget)
         self.calorie_entries.append((food_edit, kcal_edit, row_widget))
 
+    def attach_food_completer(self, food_edit, kcal_edit):
+        """
+        음식 이름 입력칸에 이전 기록 기반 자동완성을 붙임. 후보를 고르거나 기록된 이름을 입력하면
+        칼로리 칸에 그 음식의 칼로리 중앙값을 채워, GPT 분석 없이 바로 저장할 수 있게 함.
+        """
+        model = QStringListModel(food_edit)
+        completer = QCompleter(model, food_edit)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        food_edit.setCompleter(completer)
+
+        def update_suggestions(text):
+            suggestions = self.food_index.search(text)
+            model.setStringList([suggestion.name for suggestion in suggestions])
+            if suggestions:
+                completer.complete()
+
+        def fill_calories(food_name, overwrite):
+            if kcal_edit.text().strip() and not overwrite:
+                return
+            suggestion = self.food_index.lookup(food_name)
+            if suggestion is not None:
+                kcal_edit.setText(str(suggestion.calories))
+                self.logger.info(f"[업로드탭] 기록 기반 칼로리 입력: {suggestion}")
+
+        food_edit.textEdited.connect(update_suggestions)
+        completer.activated[str].connect(lambda name: fill_calories(name, True))
+        food_edit.editingFinished.connect(lambda: fill_calories(food_edit.text(), False))
+
     def remove_calorie_entry(self, row_widget):
         """
         음식 입력 행을 삭제.
@@ -285,13 +472,25 @@ class UploadTab(QWidget):
                 self.logger.info(f"[업로드탭] 음식 입력 행 삭제: index={i}")
                 break
 
+    def clear_calorie_entries(self):
+        """
+        음식 입력 행을 모두 삭제.
+        """
+        while self.calorie_entries_layout.count():
+            item = self.calorie_entries_layout.takeAt(0)
+            widget = item.widget()
+            if widget is not None:
+                widget.deleteLater()
+        self.calorie_entries.clear()
+
     def save_calorie_entries(self):
         """
-        입력된 음식명/칼로리 정보를 DB에 저장. 저장 후 테이블 갱신 및 알림.
+        입력된 음식명/칼로리 정보를 DB에 저장. 저장 후 알림 (테이블은 변경 이벤트로 갱신됨).
         """
         self.logger.info("[업로드탭] 칼로리 저장 시도")
         try:
             date_str = self.date_edit.date().toString("yyyy-MM-dd")
+            rows = []
             for food_edit, kcal_edit, _ in list(self.calorie_entries):  # 복사본 사용
                 # 위젯이 이미 삭제된 경우 건너뜀
                 if food_edit is None or kcal_edit is None:
@@ -303,16 +502,12 @@ class UploadTab(QWidget):
                 if not food_name or not calories:
                     self.logger.warning("[업로드탭] 음식명 또는 칼로리 미입력 행 건너뜀")
                     continue
-                insert_calorie(food_name, int(calories), date_str)
-                self.logger.info(f"[업로드탭] 칼로리 저장: {food_name}, {calories}, {date_str}")
+                rows.append((food_name, int(calories), date_str))
+            # 모든 행을 검증한 뒤 한 번의 트랜잭션으로 저장 (일부만 저장되는 일 없음)
+            insert_calories(rows)
+            self.logger.info(f"[업로드탭] 칼로리 저장: {len(rows)}건, {date_str}")
             # 저장 후 입력 폼 및 리스트 초기화
-            while self.calorie_entries_layout.count():
-                item = self.calorie_entries_layout.takeAt(0)
-                widget = item.widget()
-                if widget is not None:
-                    widget.deleteLater()
-            self.calorie_entries.clear()
-            self.load_calories()
+            self.clear_calorie_entries()
             QMessageBox.information(self, "저장 완료", "칼로리 정보가 저장되었습니다.")
         except Exception as e:
             self.logger.error(f"[업로드탭] 칼로리 저장 실패: {e}")
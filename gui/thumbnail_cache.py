@@ -0,0 +1,225 @@
+import collections
+import os
+import threading
+from typing import Optional, Tuple
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, QRunnable, QSize, Qt, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QImageIOHandler, QImageReader
+
+from utils.config import THUMBNAIL_CACHE_SIZE, THUMBNAIL_DIR, THUMBNAIL_DISK_MAX_BYTES
+from utils.db_handler import select_image
+from utils.image_store import compute_image_hash
+from utils.log_config import get_logger
+from utils.tracing import span
+
+logger = get_logger(__name__)
+
+
+def decode_scaled(image_data: bytes, width: int, height: int) -> QImage:
+    """
+    이미지를 width x height 안에 들어가는 크기로 디코딩. QImageReader.setScaledSize 로 디코딩 단계에서 줄이므로
+    (JPEG 는 DCT 축소) 원본 해상도 전체를 메모리에 펼치지 않음. EXIF 회전은 반영. 실패 시 ValueError.
+    QImage 만 다루므로 작업 스레드에서 호출해도 안전함.
+    """
+    buffer = QBuffer()
+    buffer.setData(QByteArray(image_data))
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid():
+        box = QSize(width, height)
+        if reader.transformation() & QImageIOHandler.TransformationRotate90:
+            # 회전 전 크기 기준으로 줄인 뒤 회전되므로 상자도 돌려서 계산
+            box.transpose()
+        if size.width() > box.width() or size.height() > box.height():
+            reader.setScaledSize(size.scaled(box, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"이미지를 불러올 수 없습니다: {reader.errorString()}")
+    return image
+
+
+class ThumbnailCache:
+    """
+    (파일 SHA-256, 크기) 를 키로 하는 썸네일 캐시. 메모리는 최근 max_items 개 LRU,
+    디스크는 disk_dir 아래 JPEG 로 두고 max_disk_bytes 를 넘으면 오래 쓰지 않은 파일부터 지움.
+    같은 사진은 파일 경로가 달라도, 이력(images.hash)에서 불러와도 같은 키를 씀. 스레드 안전.
+    """
+
+    def __init__(self, max_items: int = THUMBNAIL_CACHE_SIZE, disk_dir: str = THUMBNAIL_DIR, max_disk_bytes: int = THUMBNAIL_DISK_MAX_BYTES):
+        self.max_items = max_items
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.lock = threading.Lock()
+        self.memory = collections.OrderedDict()
+        # (경로, 수정 시각, 크기) → 파일 해시. 같은 파일을 다시 열 때 전체를 읽어 해시하지 않도록 기억
+        self.path_hashes = {}
+        self.disk_bytes = None
+
+    def file_hash(self, path: str) -> Tuple[str, Optional[bytes]]:
+        """
+        파일의 캐시 키(SHA-256) 반환. 처음 보는 파일이면 전체를 읽어 해시하고, 읽은 바이트도 함께 반환 (아니면 None).
+        """
+        stat = os.stat(path)
+        signature = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            image_hash = self.path_hashes.get(signature)
+        if image_hash is not None:
+            return image_hash, None
+        with open(path, "rb") as f:
+            image_data = f.read()
+        image_hash = compute_image_hash(image_data)
+        with self.lock:
+            self.path_hashes[signature] = image_hash
+        return image_hash, image_data
+
+    def disk_path(self, key: str, width: int, height: int) -> str:
+        return os.path.join(self.disk_dir, f"{key}_{width}x{height}.jpg")
+
+    def peek(self, key: str, width: int, height: int) -> Optional[QImage]:
+        """
+        메모리 캐시에서만 찾음. UI 스레드에서 매 페인트마다 불러도 될 만큼 가벼움.
+        """
+        with self.lock:
+            image = self.memory.get((key, width, height))
+            if image is not None:
+                self.memory.move_to_end((key, width, height))
+            return image
+
+    def get(self, key: str, width: int, height: int) -> Optional[QImage]:
+        """
+        메모리, 디스크 순으로 찾음. 디스크에서 찾으면 메모리에도 올림.
+        """
+        image = self.peek(key, width, height)
+        if image is not None:
+            return image
+        if self.disk_dir:
+            path = self.disk_path(key, width, height)
+            image = QImage(path) if os.path.exists(path) else QImage()
+            if not image.isNull():
+                os.utime(path)
+                self._remember(key, width, height, image)
+                return image
+        return None
+
+    def put(self, key: str, width: int, height: int, image: QImage) -> None:
+        self._remember(key, width, height, image)
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self.disk_path(key, width, height)
+            if image.save(path, "JPG", 85):
+                self._add_disk_bytes(os.path.getsize(path))
+        except OSError as e:
+            logger.warning(f"썸네일 디스크 저장 실패: {e}")
+
+    def _remember(self, key, width, height, image):
+        with self.lock:
+            self.memory[(key, width, height)] = image
+            self.memory.move_to_end((key, width, height))
+            while len(self.memory) > self.max_items:
+                self.memory.popitem(last=False)
+
+    def _add_disk_bytes(self, size: int) -> None:
+        with self.lock:
+            if self.disk_bytes is None:
+                self.disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.disk_dir) if entry.is_file())
+            else:
+                self.disk_bytes += size
+            if self.disk_bytes <= self.max_disk_bytes:
+                return
+            # 최근에 쓰지 않은(수정 시각이 오래된) 파일부터 지워 한도의 90% 까지 줄임
+            entries = sorted(
+                (entry for entry in os.scandir(self.disk_dir) if entry.is_file()),
+                key=lambda entry: entry.stat().st_mtime,
+            )
+            removed = 0
+            for entry in entries:
+                if self.disk_bytes <= self.max_disk_bytes * 0.9:
+                    break
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                self.disk_bytes -= size
+                removed += 1
+        logger.info(f"썸네일 디스크 캐시 정리: {removed}개 삭제")
+
+
+class ThumbnailSignals(QObject):
+    """
+    ThumbnailLoader 결과 시그널. 첫 인자는 요청 시 지정한 request_key.
+    """
+
+    loaded = pyqtSignal(str, QImage)
+    failed = pyqtSignal(str, str)
+
+
+class ThumbnailLoader(QRunnable):
+    """
+    썸네일을 작업 스레드에서 준비하는 작업 단위. path(파일) 또는 image_hash(images 테이블) 중 하나를 받음.
+    캐시에 없으면 축소 디코딩한 뒤 캐시에 저장하고, 결과 QImage 를 loaded 시그널로 보냄.
+    """
+
+    def __init__(self, request_key: str, width: int, height: int, path: str = None, image_hash: str = None):
+        super().__init__()
+        self.request_key = request_key
+        self.width = width
+        self.height = height
+        self.path = path
+        self.image_hash = image_hash
+        self.signals = ThumbnailSignals()
+
+    def run(self):
+        cache = get_thumbnail_cache()
+        try:
+            with span("ui.thumbnail.load", "ui", width=self.width, height=self.height) as args:
+                if self.path is not None:
+                    key, image_data = cache.file_hash(self.path)
+                else:
+                    key, image_data = self.image_hash, None
+                image = cache.get(key, self.width, self.height)
+                args["cached"] = image is not None
+                if image is None:
+                    if self.path is not None:
+                        if image_data is None:
+                            with open(self.path, "rb") as f:
+                                image_data = f.read()
+                    else:
+                        image_data = select_image(key)
+                        if image_data is None:
+                            raise ValueError("저장된 이미지가 없습니다.")
+                    image = decode_scaled(image_data, self.width, self.height)
+                    cache.put(key, self.width, self.height, image)
+            self.signals.loaded.emit(self.request_key, image)
+        except Exception as e:
+            logger.warning(f"썸네일 불러오기 실패: {self.path or self.image_hash}, 에러: {e}")
+            self.signals.failed.emit(self.request_key, str(e))
+
+
+_cache = None
+_pool = None
+_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = ThumbnailCache()
+    return _cache
+
+
+def get_thumbnail_pool() -> QThreadPool:
+    """
+    썸네일 전용 스레드 풀. GPT 분석 작업이 쓰는 전역 풀을 막지 않도록 따로 둠.
+    """
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = QThreadPool()
+            _pool.setMaxThreadCount(2)
+    return _pool
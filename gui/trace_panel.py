@@ -0,0 +1,108 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from api.analysis_cache import get_cache_stats
+from utils.file_handler import get_save_file
+from utils.log_config import get_logger
+from utils.tracing import tracer
+
+
+class TracePanel(QDialog):
+    """
+    구간(span)별 호출 수와 p50/p95/최대 지연, 누적 토큰 사용량, 분석 캐시 적중률을 보여주는 성능 통계 창.
+    열려 있는 동안 1초마다 갱신하며, 기록된 구간을 Chrome trace 파일로 내보낼 수 있음.
+    """
+
+    HEADERS = ["구간", "호출 수", "p50 (ms)", "p95 (ms)", "최대 (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger(__name__)
+        self.setWindowTitle("성능 통계")
+        self.resize(640, 480)
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        self.usage_label = QLabel()
+        layout.addWidget(self.usage_label)
+        self.cache_label = QLabel()
+        layout.addWidget(self.cache_label)
+        button_layout = QHBoxLayout()
+        self.export_button = QPushButton("Chrome trace 내보내기")
+        self.export_button.clicked.connect(self.export_trace)
+        self.clear_button = QPushButton("초기화")
+        self.clear_button.clicked.connect(self.clear_stats)
+        button_layout.addStretch()
+        button_layout.addWidget(self.export_button)
+        button_layout.addWidget(self.clear_button)
+        layout.addLayout(button_layout)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """
+        tracer 의 최신 통계로 표를 다시 채움. p95 가 큰 구간이 위로 오도록 정렬.
+        """
+        stats = sorted(tracer.stats().items(), key=lambda item: item[1]["p95_ms"], reverse=True)
+        self.table.setRowCount(len(stats))
+        for row, (name, values) in enumerate(stats):
+            cells = [
+                name,
+                str(values["count"]),
+                f"{values['p50_ms']:.2f}",
+                f"{values['p95_ms']:.2f}",
+                f"{values['max_ms']:.2f}",
+            ]
+            for column, text in enumerate(cells):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        usage = tracer.token_usage()
+        self.usage_label.setText(
+            f"API 요청 {usage.get('requests', 0)}건 | 토큰: 입력 {usage.get('prompt_tokens', 0)}, "
+            f"출력 {usage.get('completion_tokens', 0)}, 합계 {usage.get('total_tokens', 0)}"
+        )
+        cache = get_cache_stats()
+        self.cache_label.setText(
+            f"분석 캐시: 적중 {cache['hits']}건 (메모리 {cache['memory_hits']}, DB {cache['db_hits']}, "
+            f"동시 요청 {cache['shared_hits']}), 미스 {cache['misses']}건, 적중률 {cache['hit_rate']:.0%} | "
+            f"절약: API 요청 {cache['saved_api_calls']}건, 약 {cache['saved_seconds']:.1f}초"
+        )
+
+    def export_trace(self):
+        path = get_save_file("Chrome trace 저장", "calorienote_trace.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            count = tracer.export_chrome_trace(path)
+            QMessageBox.information(self, "내보내기 완료", f"{count}개 구간을 저장했습니다.\n{path}")
+        except Exception as e:
+            self.logger.error(f"Chrome trace 저장 실패: {e}")
+            QMessageBox.warning(self, "저장 실패", f"Chrome trace 저장 실패: {e}")
+
+    def clear_stats(self):
+        tracer.clear()
+        self.refresh()
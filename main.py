@@ -1,3 +1,7 @@
+import time
+
+STARTED_AT = time.perf_counter()
+
 import sys
 
 from PyQt5.QtWidgets import QApplication
@@ -6,6 +10,6 @@ from gui.main_app import MainWindow
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    window = MainWindow()
+    window = MainWindow(started_at=STARTED_AT)
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+
+from api.resilience import CircuitBreaker, CircuitOpenError, call_with_resilience
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def fail_with(status_code):
+    def func(timeout):
+        raise StatusError(status_code)
+
+    return func
+
+
+class CircuitBreakerHalfOpenTest(unittest.TestCase):
+    def open_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        with self.assertRaises(StatusError):
+            call_with_resilience(fail_with(503), max_retries=0, hedge_after=0, breaker=breaker)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        return breaker
+
+    def wait_reset(self, breaker):
+        breaker.opened_at -= breaker.reset_timeout
+
+    def test_non_retryable_error_during_trial_reopens(self):
+        breaker = self.open_breaker()
+        self.wait_reset(breaker)
+        with self.assertRaises(StatusError):
+            call_with_resilience(fail_with(400), max_retries=0, hedge_after=0, breaker=breaker)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            call_with_resilience(lambda timeout: "ok", max_retries=0, hedge_after=0, breaker=breaker)
+        # 다시 reset_timeout 이 지나면 시험 요청이 통과하고 성공하면 닫힘
+        self.wait_reset(breaker)
+        self.assertEqual(call_with_resilience(lambda timeout: "ok", max_retries=0, hedge_after=0, breaker=breaker), "ok")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_trial_without_outcome_allows_new_trial_after_timeout(self):
+        breaker = self.open_breaker()
+        self.wait_reset(breaker)
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        # 시험 요청이 결과를 남기지 않은 채 끝난 경우 (예: 호출자가 취소)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        self.wait_reset(breaker)
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_cancelled_trial_does_not_close_breaker(self):
+        breaker = self.open_breaker()
+        self.wait_reset(breaker)
+        cancel_event = threading.Event()
+
+        def cancelled_stream(timeout):
+            cancel_event.set()
+            return None
+
+        result = call_with_resilience(cancelled_stream, max_retries=0, hedge_after=0, breaker=breaker, cancel_event=cancel_event)
+        self.assertIsNone(result)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+
+class CancelledRetryTest(unittest.TestCase):
+    def test_cancel_interrupts_backoff(self):
+        cancel_event = threading.Event()
+        threading.Timer(0.1, cancel_event.set).start()
+        started = time.monotonic()
+        result = call_with_resilience(
+            fail_with(503), max_retries=100, hedge_after=0, base_delay=5.0, max_delay=5.0, cancel_event=cancel_event
+        )
+        self.assertIsNone(result)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
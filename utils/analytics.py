@@ -0,0 +1,124 @@
+import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 범위 선택지별 조회 일수 (오늘 포함). None 은 전체 기간
+RANGE_DAYS = {"week": 7, "month": 30, "year": 365, "all": None}
+
+
+def resolve_range(
+    range_name: str, today: Optional[datetime.date] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    범위 이름(week/month/year/all)을 (시작일, 종료일) 문자열로 변환. 전체 기간은 (None, None).
+    """
+    days = RANGE_DAYS[range_name]
+    if days is None:
+        return None, None
+    today = today or datetime.date.today()
+    start = today - datetime.timedelta(days=days - 1)
+    return start.isoformat(), today.isoformat()
+
+
+def daily_series(
+    totals: Dict[str, int], start: Optional[str] = None, end: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    {날짜: 합계} 를 start~end 의 하루 단위 연속 배열로 변환.
+    반환: (datetime64[D] 날짜 배열, float 합계 배열). 기록이 없는 날은 NaN.
+    start/end 가 None 이면 기록된 첫/마지막 날짜를 사용.
+    """
+    if not totals and (start is None or end is None):
+        return np.array([], dtype="datetime64[D]"), np.array([], dtype=float)
+    recorded = np.array(list(totals), dtype="datetime64[D]")
+    values = np.fromiter(totals.values(), dtype=float, count=len(totals))
+    first = np.datetime64(start, "D") if start else recorded.min()
+    last = np.datetime64(end, "D") if end else recorded.max()
+    days = np.arange(first, last + 1, dtype="datetime64[D]")
+    series = np.full(len(days), np.nan)
+    offsets = (recorded - first).astype(np.int64)
+    inside = (offsets >= 0) & (offsets < len(days))
+    series[offsets[inside]] = values[inside]
+    return days, series
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    최근 window 일(당일 포함)의 이동 평균. 기록이 없는 날(NaN)은 평균에서 제외하고,
+    구간에 기록이 하나도 없으면 NaN.
+    """
+    recorded = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(recorded, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(recorded)))
+    upper = np.arange(1, len(values) + 1)
+    lower = np.maximum(upper - window, 0)
+    window_sums = sums[upper] - sums[lower]
+    window_counts = counts[upper] - counts[lower]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+
+def period_starts(days: np.ndarray, period: str) -> np.ndarray:
+    """
+    각 날짜가 속한 주(월요일 시작) 또는 월의 첫날을 datetime64[D] 로 반환.
+    """
+    if period == "week":
+        # 1970-01-01 은 목요일이므로 +3 하면 월요일이 0 이 됨
+        weekday = (days.astype(np.int64) + 3) % 7
+        return days - weekday.astype("timedelta64[D]")
+    if period == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"지원하지 않는 집계 단위: {period}")
+
+
+def rollup(
+    days: np.ndarray, values: np.ndarray, period: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    하루 단위 배열을 주/월 단위로 묶음.
+    반환: (구간 시작일, 구간 합계, 기록된 날 기준 일평균). 기록이 없는 구간의 일평균은 NaN.
+    첫 구간의 시작일은 days[0] 보다 앞서지 않도록 잘라 그래프 범위 안에 놓이게 함.
+    """
+    starts = period_starts(days, period)
+    buckets, inverse = np.unique(starts, return_inverse=True)
+    recorded = ~np.isnan(values)
+    totals = np.bincount(inverse, weights=np.where(recorded, values, 0.0), minlength=len(buckets))
+    counts = np.bincount(inverse, weights=recorded, minlength=len(buckets))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = np.where(counts > 0, totals / counts, np.nan)
+    return np.maximum(buckets, days[0]), totals, averages
+
+
+def target_summary(values: np.ndarray, target: float) -> dict:
+    """
+    목표 칼로리 대비 실적 요약. 기록된 날만 대상으로 평균, 평균 차이, 목표 초과 일수를 계산.
+    """
+    recorded = values[~np.isnan(values)]
+    if recorded.size == 0:
+        return {"days": 0, "mean": None, "mean_delta": None, "days_over": 0}
+    mean = float(recorded.mean())
+    return {
+        "days": int(recorded.size),
+        "mean": mean,
+        "mean_delta": mean - target,
+        "days_over": int(np.count_nonzero(recorded > target)),
+    }
+
+
+def downsample_minmax(
+    x: np.ndarray, y: np.ndarray, max_points: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    화면 해상도에 맞게 점 개수를 줄임. max_points/2 개 구간으로 나눠 각 구간의 최소/최대값만 남기므로
+    선 그래프의 봉우리와 골은 그대로 보임. 점 개수가 max_points 이하이면 그대로 반환.
+    """
+    if len(x) <= max_points:
+        return x, y
+    buckets = max(max_points // 2, 1)
+    starts = np.unique(np.arange(buckets) * len(x) // buckets)
+    with np.errstate(invalid="ignore"):
+        lows = np.fmin.reduceat(y, starts)
+        highs = np.fmax.reduceat(y, starts)
+    return np.repeat(x[starts], 2), np.column_stack((lows, highs)).ravel()
+
@@ -6,7 +6,43 @@ load_dotenv()
 
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# 로컬 스텁 서버/프록시 사용 시 지정 (미지정 시 OpenAI 기본 주소)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+# 요청 1건의 전체 제한 시간(초, 재시도 포함), 429/5xx 재시도 횟수, hedge 요청 대기 시간(초, 0 이면 사용 안 함)
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_HEDGE_AFTER = float(os.getenv("OPENAI_HEDGE_AFTER", "0"))
+# 연속 실패 시 요청 차단(circuit breaker) 기준 횟수와 차단 시간(초)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
 DB_PATH = os.getenv("DB_PATH", "app.db")
-
-if not OPENAI_API_KEY:
-    raise ValueError("API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "128"))
+IMAGE_MAX_EDGE = int(os.getenv("IMAGE_MAX_EDGE", "1024"))
+IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "JPEG").upper()
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "85"))
+# 썸네일 한 변(px), 메모리 LRU 개수, 디스크 캐시 폴더(빈 값이면 디스크 캐시 안 함)와 최대 크기
+THUMBNAIL_SIZE = int(os.getenv("THUMBNAIL_SIZE", "64"))
+THUMBNAIL_CACHE_SIZE = int(os.getenv("THUMBNAIL_CACHE_SIZE", "256"))
+THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", "thumbnails")
+THUMBNAIL_DISK_MAX_BYTES = int(os.getenv("THUMBNAIL_DISK_MAX_BYTES", str(50 * 1024 * 1024)))
+# 이전에 분석한 사진과 지각 해시(64비트) 차이가 이 값 이하면 비슷한 사진으로 보고 이전 결과를 제안 (음수면 사용 안 함)
+SIMILAR_IMAGE_MAX_DISTANCE = int(os.getenv("SIMILAR_IMAGE_MAX_DISTANCE", "8"))
+# 내보내기/가져오기 시 한 번에 읽고 쓰는 행 수 (가져오기는 이 단위로 트랜잭션을 나눔)
+TRANSFER_CHUNK_SIZE = int(os.getenv("TRANSFER_CHUNK_SIZE", "10000"))
+# 다른 프로세스(CLI)의 DB 변경을 확인하는 간격(초). 0 이하면 GUI 가 감지하지 않음
+DB_WATCH_INTERVAL = float(os.getenv("DB_WATCH_INTERVAL", "2"))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+BATCH_RATE_PER_MINUTE = float(os.getenv("BATCH_RATE_PER_MINUTE", "60"))
+BATCH_MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", "3"))
+DAILY_CALORIE_TARGET = int(os.getenv("DAILY_CALORIE_TARGET", "2000"))
+ROLLING_AVERAGE_DAYS = int(os.getenv("ROLLING_AVERAGE_DAYS", "7"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# 빈 값이면 파일 로그를 남기지 않음
+LOG_FILE = os.getenv("LOG_FILE", "logs/calorienote.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "3"))
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "1") not in ("0", "false", "False")
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "20000"))
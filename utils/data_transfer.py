@@ -0,0 +1,125 @@
+import csv
+import json
+import os
+from typing import Any, Callable, IO, Iterator, Optional, Tuple
+
+from utils.config import TRANSFER_CHUNK_SIZE
+from utils.db_handler import TRANSFER_COLUMNS, import_table_rows, iter_table_rows
+from utils.log_config import get_logger
+from utils.tracing import span
+
+logger = get_logger(__name__)
+
+FORMATS = ("jsonl", "csv")
+
+# 정수로 읽어야 하는 열. CSV 는 모든 값이 문자열이므로 가져올 때 변환
+INTEGER_COLUMNS = {"calories"}
+
+
+def guess_format(path: Optional[str], default: str = "jsonl") -> str:
+    """
+    파일 확장자(.csv/.jsonl)로 형식을 추정. 알 수 없으면 default.
+    """
+    if path:
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        if extension in FORMATS:
+            return extension
+    return default
+
+
+def export_table(
+    table: str,
+    fp: IO[str],
+    fmt: str = "jsonl",
+    chunk_size: int = TRANSFER_CHUNK_SIZE,
+    on_progress: Optional[Callable[[str, int], None]] = None,
+) -> int:
+    """
+    테이블 전체를 fp 에 CSV(머리글 포함) 또는 JSONL 로 씀. 쓴 행 수 반환.
+    DB 에서 chunk_size 건씩 읽어 바로 쓰므로 행 수와 관계없이 메모리 사용량이 일정함.
+    CSV 로 열 fp 는 newline="" 으로 열어야 함.
+    """
+    columns = TRANSFER_COLUMNS[table]
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    written = 0
+    with span("transfer.export", "app", table=table, format=fmt) as args:
+        if fmt == "csv":
+            writer = csv.writer(fp)
+            writer.writerow(columns)
+        for rows in iter_table_rows(table, chunk_size, as_json=fmt == "jsonl"):
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                fp.write("".join(row[0] for row in rows))
+            written += len(rows)
+            if on_progress is not None:
+                on_progress("export", written)
+        args["rows"] = written
+    logger.info(f"{table} 내보내기 완료 | {fmt}, {written}건")
+    return written
+
+
+def _to_value(column: str, value: Any, line_number: int) -> Any:
+    if value is None or value == "":
+        return None
+    if column in INTEGER_COLUMNS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{line_number}번째 줄: {column} 값이 정수가 아닙니다: {value!r}")
+    return value
+
+
+def _read_jsonl(fp: IO[str], columns: Tuple[str, ...]) -> Iterator[Tuple[Any, ...]]:
+    loads = json.loads
+    integer_indexes = [i for i, column in enumerate(columns) if column in INTEGER_COLUMNS]
+    for line_number, line in enumerate(fp, 1):
+        try:
+            record = loads(line)
+        except json.JSONDecodeError as e:
+            if not line.strip():
+                continue
+            raise ValueError(f"{line_number}번째 줄: JSON 형식이 아닙니다: {e}")
+        if not isinstance(record, dict):
+            raise ValueError(f"{line_number}번째 줄: JSON 객체가 아닙니다.")
+        row = tuple(map(record.get, columns))
+        # 행마다 열 전체를 변환하면 느리므로 정수 열만, 이미 정수가 아닐 때만 변환
+        if any(type(row[i]) is not int and row[i] is not None for i in integer_indexes):
+            row = tuple(_to_value(column, value, line_number) for column, value in zip(columns, row))
+        yield row
+
+
+def _read_csv(fp: IO[str], columns: Tuple[str, ...]) -> Iterator[Tuple[Any, ...]]:
+    reader = csv.DictReader(fp)
+    missing = [column for column in columns if column not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"CSV 머리글에 열이 없습니다: {', '.join(missing)}")
+    for record in reader:
+        # 머리글이 1번째 줄이므로 reader.line_num 이 실제 줄 번호 (여러 줄 값이면 마지막 줄)
+        yield tuple(_to_value(column, record[column], reader.line_num) for column in columns)
+
+
+def import_table(
+    table: str,
+    fp: IO[str],
+    fmt: str = "jsonl",
+    chunk_size: int = TRANSFER_CHUNK_SIZE,
+    on_progress: Optional[Callable[[str, int], None]] = None,
+) -> Tuple[int, int]:
+    """
+    export_table 로 내보낸 CSV/JSONL 을 읽어 테이블에 추가. (읽은 행 수, 추가한 행 수) 반환.
+    id 열은 무시하고 새로 부여하며, DB 에 이미 있는 행은 건너뜀 (db_handler.import_table_rows 참고).
+    """
+    columns = TRANSFER_COLUMNS[table][1:]
+    if fmt == "csv":
+        rows = _read_csv(fp, columns)
+    elif fmt == "jsonl":
+        rows = _read_jsonl(fp, columns)
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    with span("transfer.import", "app", table=table, format=fmt) as args:
+        read, inserted = import_table_rows(table, rows, chunk_size, on_progress)
+        args["rows"] = read
+        args["inserted"] = inserted
+    return read, inserted
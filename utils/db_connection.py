@@ -0,0 +1,229 @@
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+from utils.config import SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE
+from utils.db_events import current_version
+from utils.log_config import get_logger, rate_limited
+
+logger = get_logger(__name__)
+
+# sqlite3 모듈이 연결마다 보관하는 prepared statement 캐시 크기
+CACHED_STATEMENTS = 256
+
+
+class _ThreadOwner:
+    """
+    스레드별 연결의 수명을 나타내는 빈 객체. 스레드가 끝나 threading.local 에서 사라지면 weakref.finalize 로 연결을 닫음.
+    """
+
+
+class ConnectionManager:
+    """
+    스레드별로 SQLite 연결을 하나씩 만들어 재사용하는 연결 관리자.
+    연결 생성 시 WAL, synchronous=NORMAL, cache_size, mmap_size 프라그마를 적용함.
+    스레드가 끝나면 그 스레드의 연결도 닫으므로, 스레드 풀이 스레드를 새로 만들어도 연결이 쌓이지 않음.
+    연결은 autocommit 모드이며, 쓰기는 transaction() 컨텍스트로 묶어서 수행.
+    snapshot() 은 쓰기를 막지 않는 읽기 트랜잭션과 그 스냅샷에 반영된 변경 버전(utils.db_events)을 함께 넘김.
+    watch_external_changes() 를 호출하면 다른 프로세스의 커밋을 poll_external_change() 로 확인할 수 있음.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        # 쓰기 트랜잭션의 COMMIT 과 snapshot() 의 스냅샷 시작을 서로 배타적으로 만드는 잠금.
+        # committed_version 은 이 프로세스에서 커밋이 끝난 마지막 변경 버전
+        self._commit_lock = threading.Lock()
+        self.committed_version = 0
+        # 다른 프로세스의 커밋 감지용 전용 연결과 마지막으로 확인한 PRAGMA data_version
+        self._watch_conn = None
+        self._watch_version = None
+        self._external_change = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 연결을 반환. 없으면 새로 만듦.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception as e:
+                logger.error(f"DB 연결 실패: {self.db_path}, 에러: {e}")
+                raise
+            owner = _ThreadOwner()
+            weakref.finalize(owner, self._release, conn)
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.owner = owner
+            with self._lock:
+                self._connections.append(conn)
+            logger.info(
+                "DB 연결 성공: %s (%s)", self.db_path, threading.current_thread().name, extra=rate_limited(5.0)
+            )
+        return conn
+
+    @contextmanager
+    def transaction(self, immediate: bool = True):
+        """
+        with 블록을 하나의 트랜잭션으로 실행. 예외 발생 시 롤백.
+        중첩 호출 시 가장 바깥 블록에서만 COMMIT/ROLLBACK 함.
+        """
+        conn = self.get_connection()
+        if self._local.depth == 0:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute("ROLLBACK")
+            raise
+        else:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                try:
+                    if immediate:
+                        self._commit_write(conn)
+                    else:
+                        conn.execute("COMMIT")
+                except Exception:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+
+    @contextmanager
+    def snapshot(self):
+        """
+        읽기 전용 트랜잭션(BEGIN DEFERRED)을 열고 (연결, 변경 버전) 을 넘김. WAL 이라 긴 조회 중에도 쓰기를 막지 않음.
+        스냅샷은 커밋 잠금 안에서 시작하므로, 이 프로세스의 변경 중 버전이 그 값 이하인 것은 모두 스냅샷에 들어 있고
+        그보다 큰 것은 들어 있지 않음. 다른 트랜잭션 안에서는 스냅샷이 이미 정해져 있으므로 사용할 수 없음.
+        """
+        conn = self.get_connection()
+        if self._local.depth:
+            raise RuntimeError("다른 트랜잭션 안에서는 스냅샷을 열 수 없습니다.")
+        with self.transaction(immediate=False):
+            with self._commit_lock:
+                # BEGIN DEFERRED 는 첫 읽기에서 WAL 스냅샷을 잡음
+                conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                version = self.committed_version
+            yield conn, version
+
+    def _data_version(self) -> int:
+        return self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _commit_write(self, conn: sqlite3.Connection) -> None:
+        """
+        쓰기 트랜잭션을 커밋하고 committed_version 과 감시 연결의 data_version 기준값을 옮김.
+        쓰기 잠금을 잡은 동안에는 다른 쓰기가 버전을 발급할 수 없으므로, 커밋 직전의 마지막 버전이 이 트랜잭션까지의 버전.
+        data_version 은 감시 연결이 아닌 모든 연결(이 프로세스의 다른 스레드 포함)의 커밋으로 바뀌므로,
+        커밋 직전에 값이 달라져 있으면 다른 프로세스의 커밋이고, 커밋 직후 값은 이 프로세스의 변경으로 봄.
+        """
+        with self._commit_lock:
+            version = current_version()
+            if self._watch_conn is not None and self._data_version() != self._watch_version:
+                self._external_change = True
+            conn.execute("COMMIT")
+            self.committed_version = version
+            if self._watch_conn is not None:
+                self._watch_version = self._data_version()
+
+    def watch_external_changes(self) -> None:
+        """
+        다른 프로세스(CLI 등)의 커밋 감지를 시작. 이후 이 프로세스의 쓰기는 transaction() 으로만 해야
+        다른 프로세스의 변경으로 잘못 감지되지 않음.
+        """
+        with self._commit_lock:
+            if self._watch_conn is None:
+                self._watch_conn = self._connect()
+                self._watch_version = self._data_version()
+                self._external_change = False
+
+    def poll_external_change(self) -> bool:
+        """
+        마지막 확인 이후 다른 프로세스가 DB 를 변경했으면 True. watch_external_changes() 전에는 항상 False.
+        """
+        with self._commit_lock:
+            if self._watch_conn is None:
+                return False
+            version = self._data_version()
+            changed = self._external_change or version != self._watch_version
+            self._watch_version = version
+            self._external_change = False
+            return changed
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """
+        끝난 스레드의 연결을 닫음. close_all 로 이미 닫힌 연결은 무시.
+        """
+        with self._lock:
+            if conn not in self._connections:
+                return
+            self._connections.remove(conn)
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"DB 연결 종료 실패: {e}")
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return len(self._connections)
+
+    def close_all(self) -> None:
+        """
+        이 관리자가 만든 모든 연결을 닫음. 프로그램 종료 시 호출.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        with self._commit_lock:
+            if self._watch_conn is not None:
+                connections.append(self._watch_conn)
+                self._watch_conn = None
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.warning(f"DB 연결 종료 실패: {e}")
+        self._local = threading.local()
+        logger.info(f"DB 연결 {len(connections)}개 종료: {self.db_path}")
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path: str) -> ConnectionManager:
+    """
+    DB 경로별 ConnectionManager 싱글턴 반환.
+    """
+    with _managers_lock:
+        manager = _managers.get(db_path)
+        if manager is None:
+            manager = ConnectionManager(db_path)
+            _managers[db_path] = manager
+        return manager
+
+
+def close_all_connections() -> None:
+    with _managers_lock:
+        managers = list(_managers.values())
+    for manager in managers:
+        manager.close_all()
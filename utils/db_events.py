@@ -0,0 +1,92 @@
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+INSERTED = "inserted"
+DELETED = "deleted"
+# 대량 가져오기처럼 id 를 하나씩 전달하기엔 너무 많은 행이 바뀐 경우. 구독자는 해당 테이블을 다시 읽어야 함
+RELOADED = "reloaded"
+
+
+class ChangeEvent:
+    """
+    DB 쓰기 후 발행되는 변경 이벤트.
+    table: 테이블 이름, action: INSERTED/DELETED/RELOADED, ids: 영향받은 행 id, dates: 영향받은 날짜(calories 만 해당).
+    foods: 영향받은 행의 (food_name, calories) 목록 (calories 만 해당). 삭제 후에는 DB 에서 다시 읽을 수 없으므로 함께 전달.
+    version: 쓰기 트랜잭션 안에서 next_version() 으로 받은 변경 버전. 이벤트는 커밋 후에 발행되므로,
+    DB 를 한 번 읽어 만든 색인은 읽은 스냅샷의 버전(ConnectionManager.snapshot) 이하인 이벤트를 이미 반영된 것으로 보고 건너뜀.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        action: str,
+        ids: Iterable[int],
+        dates: Iterable[str] = (),
+        foods: Iterable[Tuple[str, int]] = (),
+        version: Optional[int] = None,
+    ):
+        self.table = table
+        self.action = action
+        self.ids = list(ids)
+        self.dates = sorted(set(dates))
+        self.foods = list(foods)
+        self.version = version
+
+    def __repr__(self):
+        return f"ChangeEvent({self.table}, {self.action}, ids={len(self.ids)}건, dates={self.dates})"
+
+
+_subscribers: List[Callable[[ChangeEvent], None]] = []
+_lock = threading.Lock()
+_version = 0
+_version_lock = threading.Lock()
+
+
+def next_version() -> int:
+    """
+    쓰기 트랜잭션 안(DB 쓰기 잠금을 잡은 상태)에서 호출해 변경 버전을 발급.
+    같은 프로세스의 쓰기는 잠금 순서, 즉 커밋 순서대로 번호가 매겨짐.
+    """
+    global _version
+    with _version_lock:
+        _version += 1
+        return _version
+
+
+def current_version() -> int:
+    """
+    지금까지 발급된 마지막 변경 버전. 쓰기 잠금을 잡은 상태(커밋 직전)에서 읽으면 그 트랜잭션까지의 DB 내용과 정확히 대응함.
+    """
+    with _version_lock:
+        return _version
+
+
+def subscribe(callback: Callable[[ChangeEvent], None]) -> None:
+    with _lock:
+        _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[ChangeEvent], None]) -> None:
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def publish(event: ChangeEvent) -> None:
+    """
+    모든 구독자에게 이벤트 전달. 쓰기를 수행한 스레드에서 호출되므로,
+    UI 갱신이 필요한 구독자는 스스로 UI 스레드로 넘겨야 함 (gui.db_event_bridge 참고).
+    """
+    if not event.ids and event.action != RELOADED:
+        return
+    with _lock:
+        subscribers = list(_subscribers)
+    for callback in subscribers:
+        try:
+            callback(event)
+        except Exception as e:
+            logger.error(f"변경 이벤트 처리 실패: {event}, 에러: {e}")
@@ -1,155 +1,615 @@
 import sqlite3
-from typing import Any, List, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from utils.config import DB_PATH
+from utils.config import DB_PATH, TRANSFER_CHUNK_SIZE
+from utils.db_connection import get_manager
+from utils.db_events import DELETED, INSERTED, RELOADED, ChangeEvent, next_version, publish
+from utils.db_migrations import REBUILD_DAILY_TOTALS_SQL, migrate
+from utils.image_store import IngestedImage, store_image
 from utils.log_config import get_logger
+from utils.tracing import traced
+
 logger = get_logger(__name__)
 
 
 def get_connection(db_path: str = DB_PATH) -> sqlite3.Connection:
-    """DB 연결 객체 반환"""
-    try:
-        conn = sqlite3.connect(db_path)
-        logger.info(f"DB 연결 성공: {db_path}")
-        return conn
-    except Exception as e:
-        logger.error(f"DB 연결 실패: {db_path}, 에러: {e}")
-        raise
+    """현재 스레드의 재사용 DB 연결 객체 반환"""
+    return get_manager(db_path).get_connection()
+
+
+def transaction(db_path: str = DB_PATH, immediate: bool = True):
+    """with 블록을 하나의 트랜잭션으로 묶는 컨텍스트 매니저 반환"""
+    return get_manager(db_path).transaction(immediate)
+
+
+def snapshot(db_path: str = DB_PATH):
+    """쓰기를 막지 않는 읽기 트랜잭션을 열고 (연결, 반영된 변경 버전) 을 넘기는 컨텍스트 매니저 반환"""
+    return get_manager(db_path).snapshot()
+
+
+def _inserted_ids(conn: sqlite3.Connection, count: int) -> List[int]:
+    """
+    방금 실행한 INSERT(executemany 포함)로 생성된 id 목록.
+    쓰기 트랜잭션 안에서는 AUTOINCREMENT id 가 연속으로 부여되므로 마지막 id 에서 역산함.
+    """
+    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - count + 1, last_id + 1)) if count else []
 
 
 # 1. DB 초기화 함수
+@traced("db.init_db", "db")
 def init_db():
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS gpt_requests (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                image BLOB,
-                prompt TEXT,
-                response TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS calories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                food_name TEXT,
-                calories INTEGER,
-                date DATE,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.commit()
-        logger.info("DB 초기화 완료 (gpt_requests, calories 테이블 생성)")
+        version = migrate()
+        logger.info(f"DB 초기화 완료 (스키마 버전 v{version})")
     except Exception as e:
         logger.error(f"DB 초기화 실패: {e}")
         raise
-    finally:
-        conn.close()
 
 
 # 2. gpt_requests 관련 함수
-def insert_gpt_request(image_blob: bytes, prompt: str, response: str) -> None:
+@traced("db.insert_gpt_request", "db")
+def insert_gpt_request(image_blob: Union[bytes, IngestedImage, None], prompt: str, response: str) -> None:
+    """이미지(바이트 또는 IngestedImage)와 요청/응답 저장. IngestedImage 는 계산해 둔 해시를 그대로 사용"""
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO gpt_requests (image, prompt, response) VALUES (?, ?, ?)",
-            (image_blob, prompt, response),
+        with transaction() as conn:
+            image_hash = store_image(conn, image_blob)
+            cursor = conn.execute(
+                "INSERT INTO gpt_requests (image_hash, prompt, response) VALUES (?, ?, ?)",
+                (image_hash, prompt, response),
+            )
+            version = next_version()
+        logger.info(
+            "gpt_requests 삽입 성공 | id: %s, prompt: %d자, response: %d자",
+            cursor.lastrowid,
+            len(prompt),
+            len(response or ""),
         )
-        conn.commit()
-        logger.info(f"gpt_requests 삽입 성공 | prompt: {prompt[:30]}... | response: {response[:30]}...")
+        publish(ChangeEvent("gpt_requests", INSERTED, [cursor.lastrowid], version=version))
     except Exception as e:
         logger.error(f"gpt_requests 삽입 실패: {e}")
         raise
-    finally:
-        conn.close()
 
 
+@traced("db.insert_analysis_results", "db")
+def insert_analysis_results(
+    gpt_rows: List[Tuple[Union[bytes, IngestedImage, None], str, str]], calorie_rows: List[Tuple[str, int, str]]
+) -> None:
+    """일괄 분석 결과(gpt_requests, calories)를 하나의 트랜잭션으로 저장"""
+    try:
+        with transaction() as conn:
+            conn.executemany(
+                "INSERT INTO gpt_requests (image_hash, prompt, response) VALUES (?, ?, ?)",
+                [(store_image(conn, image_blob), prompt, response) for image_blob, prompt, response in gpt_rows],
+            )
+            gpt_ids = _inserted_ids(conn, len(gpt_rows))
+            calorie_ids = _insert_calorie_rows(conn, calorie_rows)
+            version = next_version()
+        logger.info(
+            f"일괄 분석 결과 저장 성공 | gpt_requests: {len(gpt_rows)}건, calories: {len(calorie_rows)}건"
+        )
+        publish(ChangeEvent("gpt_requests", INSERTED, gpt_ids, version=version))
+        publish(
+            ChangeEvent(
+                "calories",
+                INSERTED,
+                calorie_ids,
+                [row[2] for row in calorie_rows],
+                [(row[0], row[1]) for row in calorie_rows],
+                version,
+            )
+        )
+    except Exception as e:
+        logger.error(f"일괄 분석 결과 저장 실패: {e}")
+        raise
+
+
+@traced("db.select_gpt_requests", "db")
 def select_gpt_requests() -> List[Tuple[Any, ...]]:
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+        rows = get_connection().execute(
             "SELECT id, prompt, response, timestamp FROM gpt_requests ORDER BY id DESC"
-        )
-        rows = cursor.fetchall()
+        ).fetchall()
         logger.info(f"gpt_requests 조회 성공 | {len(rows)}건")
         return rows
     except Exception as e:
         logger.error(f"gpt_requests 조회 실패: {e}")
         raise
-    finally:
-        conn.close()
+
+
+@traced("db.select_gpt_requests_page", "db")
+def select_gpt_requests_page(
+    before_id: Optional[int] = None, limit: int = 100, preview_chars: int = 200
+) -> List[Tuple[Any, ...]]:
+    """id 내림차순 이력 페이지 조회 (keyset). 긴 prompt/response 는 앞부분만 반환.
+    행: (id, prompt, response, timestamp, image_hash)"""
+    try:
+        if before_id is None:
+            rows = get_connection().execute(
+                "SELECT id, substr(prompt, 1, ?), substr(response, 1, ?), timestamp, image_hash "
+                "FROM gpt_requests ORDER BY id DESC LIMIT ?",
+                (preview_chars, preview_chars, limit),
+            ).fetchall()
+        else:
+            rows = get_connection().execute(
+                "SELECT id, substr(prompt, 1, ?), substr(response, 1, ?), timestamp, image_hash "
+                "FROM gpt_requests WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (preview_chars, preview_chars, before_id, limit),
+            ).fetchall()
+        logger.info(f"gpt_requests 페이지 조회 성공 | before_id: {before_id}, {len(rows)}건")
+        return rows
+    except Exception as e:
+        logger.error(f"gpt_requests 페이지 조회 실패: {e}")
+        raise
+
+
+@traced("db.select_gpt_requests_by_ids", "db")
+def select_gpt_requests_by_ids(ids: List[int], preview_chars: int = 200) -> List[Tuple[Any, ...]]:
+    """지정한 id 의 이력을 목록 형식(앞부분 미리보기)으로 id 내림차순 조회"""
+    try:
+        placeholders = ",".join("?" * len(ids))
+        return get_connection().execute(
+            f"SELECT id, substr(prompt, 1, ?), substr(response, 1, ?), timestamp, image_hash "
+            f"FROM gpt_requests WHERE id IN ({placeholders}) ORDER BY id DESC",
+            (preview_chars, preview_chars, *ids),
+        ).fetchall()
+    except Exception as e:
+        logger.error(f"gpt_requests id 조회 실패: {e}")
+        raise
+
+
+def build_fts_query(text: str) -> str:
+    """사용자 입력을 FTS5 질의로 변환. 각 단어를 따옴표로 감싸 접두어 검색(AND)으로 만듦"""
+    terms = [term.replace('"', '""') for term in text.split()]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+@traced("db.search_gpt_requests", "db")
+def search_gpt_requests(query: str, limit: int = 100, offset: int = 0) -> List[Tuple[Any, ...]]:
+    """FTS5 로 prompt/response 를 검색해 관련도(bm25) 순으로 한 페이지 반환. 일치 부분은 [ ] 로 표시"""
+    try:
+        rows = get_connection().execute(
+            "SELECT f.rowid, snippet(gpt_requests_fts, 0, '[', ']', '…', 16), "
+            "snippet(gpt_requests_fts, 1, '[', ']', '…', 16), g.timestamp, g.image_hash "
+            "FROM gpt_requests_fts f JOIN gpt_requests g ON g.id = f.rowid "
+            "WHERE gpt_requests_fts MATCH ? ORDER BY f.rank LIMIT ? OFFSET ?",
+            (build_fts_query(query), limit, offset),
+        ).fetchall()
+        logger.info(f"gpt_requests 검색 성공 | query: {query}, offset: {offset}, {len(rows)}건")
+        return rows
+    except Exception as e:
+        logger.error(f"gpt_requests 검색 실패: {e}")
+        raise
+
+
+@traced("db.select_gpt_request_detail", "db")
+def select_gpt_request_detail(request_id: int) -> Optional[Tuple[str, str]]:
+    """이력 한 건의 전체 prompt, response 조회"""
+    try:
+        return get_connection().execute(
+            "SELECT prompt, response FROM gpt_requests WHERE id=?", (request_id,)
+        ).fetchone()
+    except Exception as e:
+        logger.error(f"gpt_requests 상세 조회 실패 | id: {request_id}, 에러: {e}")
+        raise
+
+
+@traced("db.select_image", "db")
+def select_image(image_hash: str) -> Optional[bytes]:
+    try:
+        row = get_connection().execute(
+            "SELECT data FROM images WHERE hash=?", (image_hash,)
+        ).fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        logger.error(f"images 조회 실패: {e}")
+        raise
+
+
+@traced("db.select_image_dhashes", "db")
+def select_image_dhashes(request_ids: Optional[List[int]] = None) -> List[Tuple[str, int]]:
+    """
+    지각 해시가 있는 이미지의 (hash, dhash) 조회. request_ids 를 주면 해당 gpt_requests 의 이미지만 조회.
+    dhash 는 DB 에 저장된 부호 있는 값 그대로 반환 (image_store.from_db_dhash 로 변환).
+    """
+    try:
+        if request_ids is None:
+            return get_connection().execute(
+                "SELECT hash, dhash FROM images WHERE dhash IS NOT NULL"
+            ).fetchall()
+        placeholders = ",".join("?" * len(request_ids))
+        return get_connection().execute(
+            f"SELECT DISTINCT i.hash, i.dhash FROM gpt_requests g JOIN images i ON i.hash = g.image_hash "
+            f"WHERE g.id IN ({placeholders}) AND i.dhash IS NOT NULL",
+            request_ids,
+        ).fetchall()
+    except Exception as e:
+        logger.error(f"images 지각 해시 조회 실패: {e}")
+        raise
+
+
+@traced("db.select_latest_response_for_image", "db")
+def select_latest_response_for_image(image_hash: str) -> Optional[Tuple[int, str, str]]:
+    """해당 이미지로 요청한 가장 최근 이력의 (id, response, timestamp) 조회"""
+    try:
+        return get_connection().execute(
+            "SELECT id, response, timestamp FROM gpt_requests WHERE image_hash=? ORDER BY id DESC LIMIT 1",
+            (image_hash,),
+        ).fetchone()
+    except Exception as e:
+        logger.error(f"이미지별 최근 이력 조회 실패: {e}")
+        raise
+
+
+@traced("db.select_analysis_cache", "db")
+def select_analysis_cache(cache_key: str) -> Optional[str]:
+    try:
+        row = get_connection().execute(
+            "SELECT response FROM analysis_cache WHERE cache_key=?", (cache_key,)
+        ).fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        logger.error(f"analysis_cache 조회 실패: {e}")
+        raise
+
+
+@traced("db.insert_analysis_cache", "db")
+def insert_analysis_cache(cache_key: str, model: str, response: str) -> None:
+    try:
+        with transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (cache_key, model, response) VALUES (?, ?, ?)",
+                (cache_key, model, response),
+            )
+        logger.info(f"analysis_cache 저장 성공 | key: {cache_key[:12]}")
+    except Exception as e:
+        logger.error(f"analysis_cache 저장 실패: {e}")
+        raise
 
 
 # 3. calories 관련 함수
+@traced("db.insert_calorie", "db")
 def insert_calorie(food_name: str, calories: int, date: str) -> None:
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO calories (food_name, calories, date) VALUES (?, ?, ?)",
-            (food_name, calories, date),
-        )
-        conn.commit()
+        with transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO calories (food_name, calories, date) VALUES (?, ?, ?)",
+                (food_name, calories, date),
+            )
+            version = next_version()
         logger.info(f"calories 삽입 성공 | food_name: {food_name}, calories: {calories}, date: {date}")
+        publish(ChangeEvent("calories", INSERTED, [cursor.lastrowid], [date], [(food_name, calories)], version))
     except Exception as e:
         logger.error(f"calories 삽입 실패: {e}")
         raise
-    finally:
-        conn.close()
 
 
+def _insert_calorie_rows(conn: sqlite3.Connection, rows: List[Tuple[str, int, str]]) -> List[int]:
+    conn.executemany(
+        "INSERT INTO calories (food_name, calories, date) VALUES (?, ?, ?)",
+        rows,
+    )
+    return _inserted_ids(conn, len(rows))
+
+
+@traced("db.insert_calories", "db")
+def insert_calories(rows: List[Tuple[str, int, str]]) -> None:
+    """(food_name, calories, date) 목록을 하나의 트랜잭션으로 저장. 하나라도 실패하면 전부 롤백"""
+    try:
+        with transaction() as conn:
+            ids = _insert_calorie_rows(conn, rows)
+            version = next_version()
+        logger.info(f"calories 일괄 삽입 성공 | {len(rows)}건")
+        publish(
+            ChangeEvent("calories", INSERTED, ids, [row[2] for row in rows], [(row[0], row[1]) for row in rows], version)
+        )
+    except Exception as e:
+        logger.error(f"calories 일괄 삽입 실패: {e}")
+        raise
+
+
+@traced("db.select_calories", "db")
 def select_calories() -> List[Tuple[Any, ...]]:
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+        rows = get_connection().execute(
             "SELECT id, food_name, calories, date, timestamp FROM calories ORDER BY id DESC"
-        )
-        rows = cursor.fetchall()
+        ).fetchall()
         logger.info(f"calories 조회 성공 | {len(rows)}건")
         return rows
     except Exception as e:
         logger.error(f"calories 조회 실패: {e}")
         raise
-    finally:
-        conn.close()
 
 
+@traced("db.select_calories_page", "db")
+def select_calories_page(before_id: Optional[int] = None, limit: int = 200) -> List[Tuple[Any, ...]]:
+    """id 내림차순으로 before_id 보다 작은 칼로리 레코드를 최대 limit 건 조회 (keyset 페이지네이션)"""
+    try:
+        if before_id is None:
+            rows = get_connection().execute(
+                "SELECT id, food_name, calories, date FROM calories ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        else:
+            rows = get_connection().execute(
+                "SELECT id, food_name, calories, date FROM calories WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (before_id, limit),
+            ).fetchall()
+        logger.info(f"calories 페이지 조회 성공 | before_id: {before_id}, {len(rows)}건")
+        return rows
+    except Exception as e:
+        logger.error(f"calories 페이지 조회 실패: {e}")
+        raise
+
+
+@traced("db.select_calories_by_ids", "db")
+def select_calories_by_ids(ids: List[int]) -> List[Tuple[Any, ...]]:
+    """지정한 id 의 칼로리 레코드를 id 내림차순 조회"""
+    try:
+        placeholders = ",".join("?" * len(ids))
+        return get_connection().execute(
+            f"SELECT id, food_name, calories, date FROM calories WHERE id IN ({placeholders}) ORDER BY id DESC",
+            ids,
+        ).fetchall()
+    except Exception as e:
+        logger.error(f"calories id 조회 실패: {e}")
+        raise
+
+
+@traced("db.select_food_calorie_counts", "db")
+def select_food_calorie_counts() -> Tuple[List[Tuple[str, int, int]], int]:
+    """
+    음식 이름, 칼로리 조합별 기록 횟수 (food_name, calories, count) 목록과 그 시점의 변경 버전 조회. 음식 색인 초기 적재용.
+    읽기 스냅샷(snapshot)에서 읽으므로 버전 이하의 변경 이벤트는 모두 결과에 반영되어 있고, 이후 이벤트는 반영되어 있지 않음.
+    """
+    try:
+        with snapshot() as (conn, version):
+            rows = conn.execute(
+                "SELECT food_name, calories, COUNT(*) FROM calories GROUP BY food_name, calories"
+            ).fetchall()
+        logger.info(f"음식별 칼로리 집계 조회 성공 | {len(rows)}건, 버전 {version}")
+        return rows, version
+    except Exception as e:
+        logger.error(f"음식별 칼로리 집계 조회 실패: {e}")
+        raise
+
+
+@traced("db.delete_calorie_by_id", "db")
 def delete_calorie_by_id(calorie_id: int) -> None:
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "DELETE FROM calories WHERE id=?",
-            (calorie_id,)
-        )
-        conn.commit()
+        with transaction() as conn:
+            row = conn.execute(
+                "SELECT date, food_name, calories FROM calories WHERE id=?", (calorie_id,)
+            ).fetchone()
+            conn.execute(
+                "DELETE FROM calories WHERE id=?",
+                (calorie_id,)
+            )
+            version = next_version()
         logger.info(f"calories 삭제 성공 | id: {calorie_id}")
+        if row is not None:
+            publish(ChangeEvent("calories", DELETED, [calorie_id], [row[0]], [(row[1], row[2])], version))
     except Exception as e:
         logger.error(f"calories 삭제 실패 | id: {calorie_id}, 에러: {e}")
         raise
-    finally:
-        conn.close()
 
 
+@traced("db.select_calorie_sum_by_date", "db")
 def select_calorie_sum_by_date() -> Tuple[List[str], List[int]]:
+    return select_daily_totals()
+
+
+@traced("db.select_daily_totals", "db")
+def select_daily_totals(
+    start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> Tuple[List[str], List[int]]:
+    """daily_totals 에서 [start_date, end_date] 구간의 일자별 합계 조회. 비용은 조회하는 일수에 비례"""
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT date, SUM(calories) FROM calories GROUP BY date ORDER BY date;"
-        )
-        rows = cursor.fetchall()
+        rows = get_connection().execute(
+            "SELECT date, calories FROM daily_totals "
+            "WHERE date >= COALESCE(?, '') AND date <= COALESCE(?, '9999-12-31') ORDER BY date",
+            (start_date, end_date),
+        ).fetchall()
         dates = [row[0] for row in rows]
         calories = [row[1] for row in rows]
-        logger.info(f"calories 일자별 합계 조회 성공 | {len(dates)}일")
+        logger.info(f"calories 일자별 합계 조회 성공 | {start_date} ~ {end_date}, {len(dates)}일")
         return dates, calories
     except Exception as e:
         logger.error(f"calories 일자별 합계 조회 실패: {e}")
         raise
+
+
+@traced("db.select_calorie_sum_for_dates", "db")
+def select_calorie_sum_for_dates(dates: List[str]) -> dict:
+    """지정한 날짜들의 칼로리 합계를 {날짜: 합계} 로 조회. 기록이 없는 날짜는 포함되지 않음"""
+    try:
+        placeholders = ",".join("?" * len(dates))
+        rows = get_connection().execute(
+            f"SELECT date, calories FROM daily_totals WHERE date IN ({placeholders})",
+            dates,
+        ).fetchall()
+        return dict(rows)
+    except Exception as e:
+        logger.error(f"calories 날짜별 합계 조회 실패: {e}")
+        raise
+
+
+@traced("db.rebuild_daily_totals", "db")
+def rebuild_daily_totals() -> int:
+    """daily_totals 를 calories 전체로부터 다시 계산. 재계산된 일수 반환"""
+    try:
+        with transaction() as conn:
+            for sql in REBUILD_DAILY_TOTALS_SQL:
+                conn.execute(sql)
+            days = conn.execute("SELECT COUNT(*) FROM daily_totals").fetchone()[0]
+        logger.info(f"daily_totals 재계산 완료 | {days}일")
+        return days
+    except Exception as e:
+        logger.error(f"daily_totals 재계산 실패: {e}")
+        raise
+
+
+# 4. 내보내기/가져오기 함수
+# 테이블별 내보내는 열. 첫 열(id)은 가져올 때 쓰지 않고 새로 부여함. 이미지 원본은 내보내지 않음
+TRANSFER_COLUMNS = {
+    "calories": ("id", "food_name", "calories", "date", "timestamp"),
+    "gpt_requests": ("id", "image_hash", "prompt", "response", "timestamp"),
+}
+
+
+def _transfer_columns(table: str) -> Tuple[str, ...]:
+    if table not in TRANSFER_COLUMNS:
+        raise ValueError(f"지원하지 않는 테이블: {table}")
+    return TRANSFER_COLUMNS[table]
+
+
+@traced("db.iter_table_rows", "db")
+def iter_table_rows(
+    table: str, chunk_size: int = TRANSFER_CHUNK_SIZE, as_json: bool = False
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    테이블 전체를 id 오름차순으로 chunk_size 건씩 나눠 반환 (fetchmany).
+    행 수와 관계없이 메모리에는 한 묶음만 올라옴. 열 순서는 TRANSFER_COLUMNS 참고.
+    as_json 이면 각 행을 SQLite json_object 로 만든 JSON 문자열(줄바꿈 포함) 한 열로 반환
+    (파이썬에서 json.dumps 하는 것보다 몇 배 빠름).
+    """
+    columns = _transfer_columns(table)
+    if as_json:
+        select = "json_object(" + ", ".join(f"'{column}', {column}" for column in columns) + ") || char(10)"
+    else:
+        select = ", ".join(columns)
+    cursor = get_connection().cursor()
+    try:
+        cursor.execute(f"SELECT {select} FROM {table} ORDER BY id")
+        total = 0
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            total += len(rows)
+            yield rows
+        logger.info(f"{table} 순차 조회 완료 | {total}건")
+    except Exception as e:
+        logger.error(f"{table} 순차 조회 실패: {e}")
+        raise
+    finally:
+        cursor.close()
+
+
+def _chunked(rows: Iterable[Sequence[Any]], chunk_size: int) -> Iterator[List[Sequence[Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@traced("db.import_table_rows", "db")
+def import_table_rows(
+    table: str,
+    rows: Iterable[Sequence[Any]],
+    chunk_size: int = TRANSFER_CHUNK_SIZE,
+    on_progress: Optional[Callable[[str, int], None]] = None,
+) -> Tuple[int, int]:
+    """
+    TRANSFER_COLUMNS 에서 id 를 뺀 열 순서의 행들을 테이블에 추가. (읽은 행 수, 추가한 행 수) 반환.
+    - chunk_size 건 단위 트랜잭션으로 나눠 쓰므로 중간에 실패해도 앞선 묶음은 남고, 다른 연결의 쓰기를 오래 막지 않음
+    - 모든 열이 같은 행은 중복으로 보고, 가져오기 전부터 DB 에 있던 개수만큼 건너뜀
+      (한 번에 저장한 같은 음식 두 개처럼 원래 겹치는 행은 유지되고, 같은 파일을 다시 가져오면 아무것도 추가되지 않음)
+    - on_progress(단계, 처리한 행 수) 를 묶음마다 호출. 단계는 "read"(중복 확인용 적재), "insert"(반영)
+    - 행 id 대신 RELOADED 이벤트 하나만 발행함 (일자별 합계, 검색 색인은 트리거가 갱신)
+    """
+    columns = _transfer_columns(table)[1:]
+    column_list = ", ".join(columns)
+    conn = get_connection()
+    try:
+        if conn.execute(f"SELECT 1 FROM main.{table} LIMIT 1").fetchone() is None:
+            # 빈 테이블이면 건너뛸 행이 없으므로 바로 씀
+            placeholders = ", ".join(
+                "COALESCE(?, CURRENT_TIMESTAMP)" if column == "timestamp" else "?" for column in columns
+            )
+            read = inserted = 0
+            for chunk in _chunked(rows, chunk_size):
+                with transaction():
+                    conn.executemany(f"INSERT INTO main.{table} ({column_list}) VALUES ({placeholders})", chunk)
+                read += len(chunk)
+                inserted += len(chunk)
+                if on_progress is not None:
+                    on_progress("insert", read)
+        else:
+            read, inserted = _import_deduplicated(conn, table, columns, rows, chunk_size, on_progress)
+        logger.info(f"{table} 가져오기 성공 | 읽음: {read}건, 추가: {inserted}건, 중복: {read - inserted}건")
+    except Exception as e:
+        logger.error(f"{table} 가져오기 실패: {e}")
+        raise
+    if inserted:
+        publish(ChangeEvent(table, RELOADED, []))
+    return read, inserted
+
+
+def _import_deduplicated(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Tuple[str, ...],
+    rows: Iterable[Sequence[Any]],
+    chunk_size: int,
+    on_progress: Optional[Callable[[str, int], None]],
+) -> Tuple[int, int]:
+    """
+    행을 임시 DB 에 모두 적재한 뒤, 같은 행이 파일에서 몇 번째로 나오는지(n)와 DB 에 이미 몇 개 있는지(c)를 비교해
+    n > c 인 행만 chunk_size 건 단위 트랜잭션으로 옮김.
+    임시 DB 는 파일로 두는 별도 DB(ATTACH '')라서 행 수가 많아도 메모리에 모두 올라오지 않음.
+    """
+    column_list = ", ".join(columns)
+    same_row = " AND ".join(f"e.{column} IS s.{column}" for column in columns)
+    values = ", ".join(
+        "COALESCE(s.timestamp, CURRENT_TIMESTAMP)" if column == "timestamp" else f"s.{column}" for column in columns
+    )
+    conn.execute("ATTACH DATABASE '' AS import_db")
+    try:
+        conn.execute(f"CREATE TABLE import_db.stage (seq INTEGER PRIMARY KEY, {column_list})")
+        read = 0
+        for chunk in _chunked(rows, chunk_size):
+            # 임시 DB 만 쓰므로 본 DB 의 쓰기 잠금을 잡지 않음
+            with transaction(immediate=False):
+                conn.executemany(
+                    f"INSERT INTO import_db.stage ({column_list}) VALUES ({', '.join('?' * len(columns))})",
+                    chunk,
+                )
+            read += len(chunk)
+            if on_progress is not None:
+                on_progress("read", read)
+
+        with transaction(immediate=False):
+            conn.execute(
+                f"CREATE TABLE import_db.existing AS "
+                f"SELECT {column_list}, COUNT(*) AS c FROM main.{table} GROUP BY {column_list}"
+            )
+            conn.execute(f"CREATE INDEX import_db.idx_existing ON existing ({column_list})")
+            conn.execute("CREATE TABLE import_db.new (seq INTEGER PRIMARY KEY)")
+            conn.execute(
+                f"INSERT INTO import_db.new (seq) "
+                f"SELECT s.seq FROM ("
+                f"SELECT *, ROW_NUMBER() OVER (PARTITION BY {column_list} ORDER BY seq) AS n FROM import_db.stage"
+                f") s LEFT JOIN import_db.existing e ON {same_row} "
+                f"WHERE s.n > COALESCE(e.c, 0)"
+            )
+
+        inserted = 0
+        for start in range(1, read + 1, chunk_size):
+            with transaction():
+                cursor = conn.execute(
+                    f"INSERT INTO main.{table} ({column_list}) SELECT {values} "
+                    f"FROM import_db.new n JOIN import_db.stage s ON s.seq = n.seq "
+                    f"WHERE n.seq BETWEEN ? AND ? ORDER BY n.seq",
+                    (start, start + chunk_size - 1),
+                )
+            inserted += cursor.rowcount
+            if on_progress is not None:
+                on_progress("insert", min(start + chunk_size - 1, read))
+        return read, inserted
     finally:
-        conn.close()
+        conn.execute("DETACH DATABASE import_db")
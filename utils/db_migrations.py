@@ -0,0 +1,260 @@
+import os
+import sqlite3
+import time
+
+from utils.config import DB_PATH
+from utils.db_connection import get_manager
+from utils.image_store import compute_image_dhash, compute_image_hash
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+# 각 마이그레이션은 (버전, 설명, 함수). 함수는 트랜잭션 안에서 conn 을 받아 스키마를 변경함.
+# 적용된 마지막 버전은 PRAGMA user_version 에 기록되며, 이미 적용된 버전은 다시 실행하지 않음.
+# 새 스키마 변경은 기존 항목을 고치지 말고 항상 목록 끝에 새 버전으로 추가할 것.
+def _create_base_tables(conn: sqlite3.Connection) -> None:
+    # 마이그레이션 도입 이전 DB 도 그대로 받아들이도록 IF NOT EXISTS 유지
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS gpt_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            image BLOB,
+            prompt TEXT,
+            response TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS calories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            food_name TEXT,
+            calories INTEGER,
+            date DATE,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT,
+            response TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _add_date_and_timestamp_indexes(conn: sqlite3.Connection) -> None:
+    # (date, calories) 커버링 인덱스로 일자별 합계를 테이블 접근 없이 계산
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_calories_date ON calories (date, calories)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_gpt_requests_timestamp ON gpt_requests (timestamp)"
+    )
+
+
+def _move_images_to_store(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS images (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            size INTEGER,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("ALTER TABLE gpt_requests ADD COLUMN image_hash TEXT")
+    # 이미지 하나씩 옮겨서 큰 DB 에서도 메모리 사용량을 일정하게 유지
+    ids = [row[0] for row in conn.execute("SELECT id FROM gpt_requests WHERE image IS NOT NULL")]
+    for request_id in ids:
+        image_data = conn.execute(
+            "SELECT image FROM gpt_requests WHERE id=?", (request_id,)
+        ).fetchone()[0]
+        image_hash = compute_image_hash(image_data)
+        conn.execute(
+            "INSERT OR IGNORE INTO images (hash, data, size) VALUES (?, ?, ?)",
+            (image_hash, image_data, len(image_data)),
+        )
+        conn.execute(
+            "UPDATE gpt_requests SET image_hash=?, image=NULL WHERE id=?",
+            (image_hash, request_id),
+        )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_gpt_requests_image_hash ON gpt_requests (image_hash)"
+    )
+    logger.info(f"gpt_requests 이미지 {len(ids)}건을 images 테이블로 이동")
+
+
+def _add_history_fts(conn: sqlite3.Connection) -> None:
+    # gpt_requests 를 원본으로 하는 external content FTS5 인덱스. 트리거로 항상 동기화됨
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS gpt_requests_fts USING fts5(
+            prompt, response,
+            content='gpt_requests', content_rowid='id',
+            tokenize='unicode61', prefix='1 2'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS gpt_requests_fts_ai AFTER INSERT ON gpt_requests BEGIN
+            INSERT INTO gpt_requests_fts (rowid, prompt, response)
+            VALUES (new.id, new.prompt, new.response);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS gpt_requests_fts_ad AFTER DELETE ON gpt_requests BEGIN
+            INSERT INTO gpt_requests_fts (gpt_requests_fts, rowid, prompt, response)
+            VALUES ('delete', old.id, old.prompt, old.response);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS gpt_requests_fts_au AFTER UPDATE OF prompt, response ON gpt_requests BEGIN
+            INSERT INTO gpt_requests_fts (gpt_requests_fts, rowid, prompt, response)
+            VALUES ('delete', old.id, old.prompt, old.response);
+            INSERT INTO gpt_requests_fts (rowid, prompt, response)
+            VALUES (new.id, new.prompt, new.response);
+        END
+    """)
+    conn.execute("INSERT INTO gpt_requests_fts (gpt_requests_fts) VALUES ('rebuild')")
+
+
+REBUILD_DAILY_TOTALS_SQL = (
+    "DELETE FROM daily_totals",
+    "INSERT INTO daily_totals (date, calories, entries) "
+    "SELECT date, SUM(COALESCE(calories, 0)), COUNT(*) FROM calories "
+    "WHERE date IS NOT NULL GROUP BY date",
+)
+
+
+def _add_daily_totals(conn: sqlite3.Connection) -> None:
+    # 일자별 합계를 미리 계산해 두는 테이블. calories 트리거로 항상 정확하게 유지됨
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS daily_totals (
+            date TEXT PRIMARY KEY,
+            calories INTEGER NOT NULL,
+            entries INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS calories_daily_totals_ai
+        AFTER INSERT ON calories WHEN new.date IS NOT NULL BEGIN
+            INSERT INTO daily_totals (date, calories, entries)
+            VALUES (new.date, COALESCE(new.calories, 0), 1)
+            ON CONFLICT (date) DO UPDATE SET
+                calories = calories + excluded.calories,
+                entries = entries + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS calories_daily_totals_ad
+        AFTER DELETE ON calories WHEN old.date IS NOT NULL BEGIN
+            UPDATE daily_totals
+            SET calories = calories - COALESCE(old.calories, 0), entries = entries - 1
+            WHERE date = old.date;
+            DELETE FROM daily_totals WHERE date = old.date AND entries <= 0;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS calories_daily_totals_au
+        AFTER UPDATE OF date, calories ON calories BEGIN
+            UPDATE daily_totals
+            SET calories = calories - COALESCE(old.calories, 0), entries = entries - 1
+            WHERE old.date IS NOT NULL AND date = old.date;
+            DELETE FROM daily_totals WHERE old.date IS NOT NULL AND date = old.date AND entries <= 0;
+            INSERT INTO daily_totals (date, calories, entries)
+            SELECT new.date, COALESCE(new.calories, 0), 1 WHERE new.date IS NOT NULL
+            ON CONFLICT (date) DO UPDATE SET
+                calories = calories + excluded.calories,
+                entries = entries + 1;
+        END
+    """)
+    for sql in REBUILD_DAILY_TOTALS_SQL:
+        conn.execute(sql)
+
+
+def _add_image_dhash(conn: sqlite3.Connection) -> None:
+    # 비슷한 사진 검색용 지각 해시. 이미 저장된 이미지는 하나씩 읽어 채움
+    conn.execute("ALTER TABLE images ADD COLUMN dhash INTEGER")
+    hashes = [row[0] for row in conn.execute("SELECT hash FROM images")]
+    for image_hash in hashes:
+        image_data = conn.execute("SELECT data FROM images WHERE hash=?", (image_hash,)).fetchone()[0]
+        conn.execute(
+            "UPDATE images SET dhash=? WHERE hash=?", (compute_image_dhash(image_data), image_hash)
+        )
+    logger.info(f"images 지각 해시 {len(hashes)}건 계산")
+
+
+MIGRATIONS = [
+    (1, "기본 테이블 생성 (gpt_requests, calories, analysis_cache)", _create_base_tables),
+    (2, "calories(date), gpt_requests(timestamp) 인덱스 추가", _add_date_and_timestamp_indexes),
+    (3, "gpt_requests 이미지를 중복 제거된 images 테이블로 분리", _move_images_to_store),
+    (4, "gpt_requests 전문 검색(FTS5) 인덱스 및 동기화 트리거 추가", _add_history_fts),
+    (5, "일자별 칼로리 합계(daily_totals) 테이블 및 유지 트리거 추가", _add_daily_totals),
+    (6, "images 에 비슷한 사진 검색용 지각 해시(dhash) 추가", _add_image_dhash),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# 대량의 데이터를 옮기는 버전. 적용 후 VACUUM 으로 빈 페이지를 반환하고 전/후 크기와 조회 시간을 기록
+COMPACT_AFTER = {3}
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def measure_db(conn: sqlite3.Connection, db_path: str) -> dict:
+    """
+    DB 파일 크기(WAL 포함)와 이력 목록 조회 시간을 측정.
+    """
+    elapsed = 0.0
+    has_history = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='gpt_requests'"
+    ).fetchone()
+    if has_history:
+        started = time.perf_counter()
+        conn.execute(
+            "SELECT id, prompt, response, timestamp FROM gpt_requests ORDER BY id DESC"
+        ).fetchall()
+        elapsed = time.perf_counter() - started
+    size = sum(
+        os.path.getsize(path)
+        for path in (db_path, db_path + "-wal")
+        if os.path.exists(path)
+    )
+    return {"db_bytes": size, "history_query_ms": elapsed * 1000}
+
+
+def migrate(db_path: str = DB_PATH, target_version: int = LATEST_VERSION) -> int:
+    """
+    DB 스키마를 target_version 까지 순서대로 올림. 각 버전은 별도 트랜잭션으로 적용되어,
+    중간에 실패해도 마지막으로 성공한 버전에서 다시 시작할 수 있음. 최종 버전을 반환.
+    """
+    manager = get_manager(db_path)
+    conn = manager.get_connection()
+    current = get_schema_version(conn)
+    if current > LATEST_VERSION:
+        raise RuntimeError(
+            f"DB 스키마 버전({current})이 프로그램이 지원하는 버전({LATEST_VERSION})보다 높습니다."
+        )
+    pending = [m for m in MIGRATIONS if current < m[0] <= target_version]
+    compact = any(version in COMPACT_AFTER for version, _, _ in pending)
+    if compact:
+        before = measure_db(conn, db_path)
+    for version, description, apply in pending:
+        logger.info(f"DB 마이그레이션 적용: v{version} - {description}")
+        try:
+            with manager.transaction() as conn:
+                apply(conn)
+                conn.execute(f"PRAGMA user_version = {version}")
+        except Exception as e:
+            logger.error(f"DB 마이그레이션 실패: v{version}, 에러: {e}")
+            raise
+        current = version
+    if compact:
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        after = measure_db(conn, db_path)
+        logger.info(
+            f"DB 정리 완료 | 크기: {before['db_bytes']:,} → {after['db_bytes']:,} bytes | "
+            f"이력 조회: {before['history_query_ms']:.1f} → {after['history_query_ms']:.1f} ms"
+        )
+    return current
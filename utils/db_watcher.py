@@ -0,0 +1,58 @@
+import threading
+from typing import Optional
+
+from utils.config import DB_PATH, DB_WATCH_INTERVAL
+from utils.db_connection import get_manager
+from utils.db_events import RELOADED, ChangeEvent, publish
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+# 다른 프로세스가 바꿨을 때 다시 읽어야 하는 테이블
+WATCHED_TABLES = ("calories", "gpt_requests")
+
+
+class ExternalChangeWatcher:
+    """
+    다른 프로세스(cli.py log/analyze --save/import 등)의 DB 쓰기를 감지해 RELOADED 이벤트를 발행.
+    utils.db_events 는 쓰기를 한 프로세스 안에서만 전달되므로, interval 초마다 PRAGMA data_version 을 확인함.
+    구독자(FoodIndex 등)가 다시 적재하는 동안 UI 가 멈추지 않도록 백그라운드 스레드에서 발행함.
+    """
+
+    def __init__(self, db_path: str = DB_PATH, interval: float = DB_WATCH_INTERVAL):
+        self.manager = get_manager(db_path)
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self.manager.watch_external_changes()
+        self._thread = threading.Thread(target=self._run, name="db-change-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"다른 프로세스의 DB 변경 감시 시작: {self.interval}초 간격")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """
+        다른 프로세스의 변경이 있었으면 감시 대상 테이블마다 RELOADED 를 발행하고 True 반환.
+        """
+        if not self.manager.poll_external_change():
+            return False
+        logger.info("다른 프로세스의 DB 변경 감지, 화면과 색인을 다시 읽음")
+        for table in WATCHED_TABLES:
+            publish(ChangeEvent(table, RELOADED, []))
+        return True
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"DB 변경 확인 실패: {e}")
@@ -1,15 +1,36 @@
-import base64
-
-from PyQt5.QtWidgets import QFileDialog
-
-
+# PyQt5 는 대화상자가 필요한 시점에만 불러옴 (헤드리스 CLI 에서 Qt 를 로드하지 않도록)
 def get_image_file():
+    from PyQt5.QtWidgets import QFileDialog
+
     path, _ = QFileDialog.getOpenFileName(
         None, "이미지 선택", "", "Images (*.png *.jpg *.jpeg)"
     )
     return path
 
 
+def get_image_files():
+    from PyQt5.QtWidgets import QFileDialog
+
+    paths, _ = QFileDialog.getOpenFileNames(
+        None, "이미지 여러 장 선택", "", "Images (*.png *.jpg *.jpeg)"
+    )
+    return paths
+
+
+def get_image_directory():
+    from PyQt5.QtWidgets import QFileDialog
+
+    return QFileDialog.getExistingDirectory(None, "이미지 폴더 선택", "")
+
+
+def get_save_file(title, default_name, file_filter):
+    from PyQt5.QtWidgets import QFileDialog
+
+    path, _ = QFileDialog.getSaveFileName(None, title, default_name, file_filter)
+    return path
+
+
 def encode_image_to_base64(image_path):
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode("utf-8")
+    from utils.image_store import read_image_file
+
+    return read_image_file(image_path).to_base64()
@@ -0,0 +1,245 @@
+import collections
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+
+from utils.db_events import DELETED, INSERTED, RELOADED, ChangeEvent, subscribe
+from utils.db_handler import select_food_calorie_counts
+from utils.log_config import get_logger
+from utils.tracing import span
+
+logger = get_logger(__name__)
+
+# 부분 문자열 검색에 사용하는 글자 n-gram 길이
+NGRAM = 2
+# 적재 실패 시 다시 시도하는 횟수와 첫 대기 시간(초, 시도마다 두 배)
+LOAD_RETRIES = 3
+LOAD_RETRY_DELAY = 5.0
+
+
+def normalize_food_name(name: str) -> str:
+    """
+    색인 키로 쓸 음식 이름. 유니코드 정규화(NFKC), 대소문자 통일, 공백 제거.
+    "김치 찌개", "김치찌개 " 는 같은 키가 됨.
+    """
+    return "".join(unicodedata.normalize("NFKC", str(name)).casefold().split())
+
+
+def _ngrams(key: str) -> Set[str]:
+    return {key[i:i + NGRAM] for i in range(len(key) - NGRAM + 1)}
+
+
+def _to_calories(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class FoodSuggestion:
+    """
+    자동완성 후보 하나. name: 가장 많이 쓴 표기, calories: 기록된 칼로리의 중앙값, count: 기록 횟수.
+    """
+
+    __slots__ = ("name", "calories", "count")
+
+    def __init__(self, name: str, calories: int, count: int):
+        self.name = name
+        self.calories = calories
+        self.count = count
+
+    def __repr__(self):
+        return f"FoodSuggestion({self.name}, {self.calories} kcal, {self.count}회)"
+
+
+class _FoodEntry:
+    __slots__ = ("names", "calories", "count")
+
+    def __init__(self):
+        self.names = collections.Counter()
+        self.calories = collections.Counter()
+        self.count = 0
+
+    def median(self) -> int:
+        middle = (self.count - 1) // 2
+        seen = 0
+        for value in sorted(self.calories):
+            seen += self.calories[value]
+            if seen > middle:
+                return value
+        return 0
+
+
+class FoodIndex:
+    """
+    calories 기록으로 만든 메모리 음식 색인. 정규화한 이름별로 칼로리 분포를 보관하고
+    n-gram 역색인으로 부분 문자열 검색을 함. 처음 한 번 DB 에서 집계해 적재하고,
+    이후에는 calories 변경 이벤트로 추가/삭제된 행만 반영함. 모든 메서드는 스레드 안전.
+    적재한 시점의 변경 버전 이하인 이벤트는 이미 집계에 들어 있으므로 건너뜀 (utils.db_events.next_version 참고).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: Dict[str, _FoodEntry] = {}
+        self.postings: Dict[str, Set[str]] = collections.defaultdict(set)
+        self.loaded = False
+        self.version = 0
+        self.pending: List[ChangeEvent] = []
+        # 적재를 포기했으면 이벤트를 더 쌓아 두지 않음
+        self.load_failed = False
+
+    def load(self, retries: int = LOAD_RETRIES, delay: float = LOAD_RETRY_DELAY) -> None:
+        """
+        DB 의 (음식, 칼로리) 조합별 기록 횟수로 색인을 만듦. 적재 중 들어온 변경 이벤트는 적재 후 반영.
+        실패하면 쌓아 둔 이벤트를 버리고 delay 초 뒤 다시 시도하며, retries 번 모두 실패하면 빈 색인으로 둠.
+        """
+        try:
+            with span("food_index.load", "app") as args:
+                rows, version = select_food_calorie_counts()
+                with self.lock:
+                    for food_name, calories, count in rows:
+                        self._add(food_name, calories, count)
+                    for event in self.pending:
+                        if event.version is None or event.version > version:
+                            self._apply(event)
+                    self.pending.clear()
+                    self.version = version
+                    self.loaded = True
+                    self.load_failed = False
+                    args["foods"] = len(self.entries)
+            logger.info(f"음식 색인 적재 완료: {len(self.entries)}종, {len(rows)}개 조합")
+        except Exception as e:
+            with self.lock:
+                # 다시 적재하면 그 시점까지의 변경은 모두 집계에 들어가므로 쌓아 둔 이벤트는 필요 없음
+                self.pending.clear()
+                self.load_failed = retries <= 0
+            if retries <= 0:
+                logger.error(f"음식 색인 적재 실패, 자동완성 없이 계속: {e}")
+                return
+            logger.error(f"음식 색인 적재 실패, {delay:.0f}초 후 다시 시도: {e}")
+            timer = threading.Timer(delay, self.load, (retries - 1, delay * 2))
+            timer.daemon = True
+            timer.start()
+
+    def on_change(self, event: ChangeEvent) -> None:
+        """
+        utils.db_events 구독 콜백. calories 추가/삭제를 색인에 반영. 대량 변경(RELOADED)이면 비우고 다시 적재.
+        """
+        if event.table == "calories" and event.action == RELOADED:
+            with self.lock:
+                self.entries.clear()
+                self.postings.clear()
+                self.pending.clear()
+                self.loaded = False
+            self.load()
+            return
+        if event.table != "calories" or not event.foods:
+            return
+        with self.lock:
+            if self.loaded:
+                # 적재 전에 커밋됐지만 늦게 도착한 이벤트는 이미 집계에 들어 있음
+                if event.version is None or event.version > self.version:
+                    self._apply(event)
+            elif not self.load_failed:
+                self.pending.append(event)
+
+    def _apply(self, event: ChangeEvent) -> None:
+        sign = 1 if event.action == INSERTED else -1 if event.action == DELETED else 0
+        for food_name, calories in event.foods:
+            self._add(food_name, calories, sign)
+
+    def _add(self, food_name: str, calories, count: int) -> None:
+        key = normalize_food_name(food_name)
+        calories = _to_calories(calories)
+        if not key or calories is None or not count:
+            return
+        entry = self.entries.get(key)
+        if entry is None:
+            if count < 0:
+                return
+            entry = self.entries[key] = _FoodEntry()
+            for gram in _ngrams(key):
+                self.postings[gram].add(key)
+        name = str(food_name).strip()
+        entry.names[name] += count
+        entry.calories[calories] += count
+        entry.count += count
+        if count < 0:
+            # Counter 는 0 이하 값을 남겨 두므로 직접 정리
+            if entry.names[name] <= 0:
+                del entry.names[name]
+            if entry.calories[calories] <= 0:
+                del entry.calories[calories]
+            if entry.count <= 0:
+                self._remove_key(key)
+
+    def _remove_key(self, key: str) -> None:
+        del self.entries[key]
+        for gram in _ngrams(key):
+            keys = self.postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[gram]
+
+    def _suggestion(self, key: str) -> FoodSuggestion:
+        entry = self.entries[key]
+        return FoodSuggestion(entry.names.most_common(1)[0][0], entry.median(), entry.count)
+
+    def _candidates(self, key: str) -> Iterable[str]:
+        if len(key) < NGRAM:
+            return [candidate for candidate in self.entries if key in candidate]
+        grams = sorted(_ngrams(key), key=lambda gram: len(self.postings.get(gram, ())))
+        candidates = set(self.postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self.postings.get(gram, set())
+        # n-gram 이 모두 있어도 연속된 부분 문자열이 아닐 수 있으므로 확인
+        return [candidate for candidate in candidates if key in candidate]
+
+    def search(self, text: str, limit: int = 10) -> List[FoodSuggestion]:
+        """
+        이름에 text 가 포함된 음식을 최대 limit 개 반환. text 로 시작하는 이름, 자주 먹은 음식 순.
+        """
+        key = normalize_food_name(text)
+        if not key:
+            return []
+        with self.lock:
+            ranked = sorted(
+                self._candidates(key),
+                key=lambda candidate: (not candidate.startswith(key), -self.entries[candidate].count, candidate),
+            )
+            return [self._suggestion(candidate) for candidate in ranked[:limit]]
+
+    def lookup(self, food_name: str) -> Optional[FoodSuggestion]:
+        """
+        정규화한 이름이 정확히 같은 음식의 후보 반환. 기록이 없으면 None.
+        """
+        key = normalize_food_name(food_name)
+        with self.lock:
+            if key not in self.entries:
+                return None
+            return self._suggestion(key)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_food_index() -> FoodIndex:
+    """
+    처음 호출될 때 색인을 만들고 변경 이벤트를 구독한 뒤, 백그라운드 스레드에서 적재를 시작함.
+    적재가 끝나기 전의 검색은 빈 결과를 반환.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FoodIndex()
+            subscribe(_index.on_change)
+            threading.Thread(target=_index.load, name="food-index-load", daemon=True).start()
+    return _index
@@ -0,0 +1,115 @@
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.config import SIMILAR_IMAGE_MAX_DISTANCE
+from utils.db_events import INSERTED, RELOADED, ChangeEvent, subscribe
+from utils.db_handler import select_image_dhashes
+from utils.image_store import from_db_dhash
+from utils.log_config import get_logger
+from utils.tracing import span
+
+logger = get_logger(__name__)
+
+
+class SimilarImageIndex:
+    """
+    이전에 분석한 이미지의 지각 해시(64비트 dHash) 색인. 해밍 거리로 비슷한 사진을 찾음.
+    해시는 uint64 배열 하나에 모아 두고 XOR + popcount 를 numpy 로 한 번에 계산함.
+    (10만 건 기준 1ms 미만. 거리 10 안팎의 검색에서는 BK-tree 가 대부분의 노드를 방문해 훨씬 느림)
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.lock = threading.Lock()
+        self.dhashes = np.zeros(capacity, dtype=np.uint64)
+        self.image_hashes: List[str] = []
+        self.known = set()
+
+    def add(self, image_hash: str, dhash: int) -> None:
+        """
+        이미지 해시(SHA-256)와 부호 없는 dHash 를 추가. 이미 있는 이미지는 무시.
+        """
+        with self.lock:
+            self._add(image_hash, dhash)
+
+    def _add(self, image_hash: str, dhash: int) -> None:
+        if image_hash in self.known:
+            return
+        count = len(self.image_hashes)
+        if count == len(self.dhashes):
+            self.dhashes = np.concatenate([self.dhashes, np.zeros(count, dtype=np.uint64)])
+        self.dhashes[count] = dhash
+        self.image_hashes.append(image_hash)
+        self.known.add(image_hash)
+
+    def load(self) -> None:
+        """
+        DB 에 저장된 모든 이미지 해시를 적재.
+        """
+        try:
+            with span("image_index.load", "app") as args:
+                rows = select_image_dhashes()
+                with self.lock:
+                    for image_hash, dhash in rows:
+                        self._add(image_hash, from_db_dhash(dhash))
+                    args["images"] = len(self.image_hashes)
+            logger.info(f"비슷한 사진 색인 적재 완료: {len(self.image_hashes)}건")
+        except Exception as e:
+            logger.error(f"비슷한 사진 색인 적재 실패: {e}")
+
+    def on_change(self, event: ChangeEvent) -> None:
+        """
+        utils.db_events 구독 콜백. 새 gpt_requests 의 이미지를 색인에 추가.
+        대량 변경(RELOADED)이면 DB 전체를 다시 훑어 없는 이미지만 추가.
+        """
+        if event.table != "gpt_requests":
+            return
+        if event.action == RELOADED:
+            self.load()
+            return
+        if event.action != INSERTED:
+            return
+        try:
+            for image_hash, dhash in select_image_dhashes(event.ids):
+                self.add(image_hash, from_db_dhash(dhash))
+        except Exception as e:
+            logger.error(f"비슷한 사진 색인 갱신 실패: {e}")
+
+    def search(self, dhash: int, max_distance: int = SIMILAR_IMAGE_MAX_DISTANCE, limit: int = 5) -> List[Tuple[int, str]]:
+        """
+        해밍 거리가 max_distance 이하인 이미지를 가까운 순으로 최대 limit 개 (거리, 이미지 해시) 로 반환.
+        """
+        if max_distance < 0:
+            return []
+        with self.lock:
+            count = len(self.image_hashes)
+            distances = np.bitwise_count(np.bitwise_xor(self.dhashes[:count], np.uint64(dhash)))
+            matches = np.flatnonzero(distances <= max_distance)
+            matches = matches[np.argsort(distances[matches], kind="stable")[:limit]]
+            return [(int(distances[i]), self.image_hashes[i]) for i in matches]
+
+    def nearest(self, dhash: int, max_distance: int = SIMILAR_IMAGE_MAX_DISTANCE) -> Optional[Tuple[int, str]]:
+        matches = self.search(dhash, max_distance, limit=1)
+        return matches[0] if matches else None
+
+    def __len__(self):
+        with self.lock:
+            return len(self.image_hashes)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_image_index() -> SimilarImageIndex:
+    """
+    처음 호출될 때 색인을 만들고 변경 이벤트를 구독한 뒤, 백그라운드 스레드에서 적재를 시작함.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SimilarImageIndex()
+            subscribe(_index.on_change)
+            threading.Thread(target=_index.load, name="image-index-load", daemon=True).start()
+    return _index
@@ -0,0 +1,90 @@
+import io
+
+from PIL import Image, ImageOps
+
+from utils.config import IMAGE_FORMAT, IMAGE_MAX_EDGE, IMAGE_QUALITY
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+# OpenAI vision 의 low detail 은 512px 한 장으로 처리되므로, 그 이하라면 low 로 충분함
+LOW_DETAIL_MAX_EDGE = 512
+
+_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+class PreparedImage:
+    """
+    API 전송용으로 전처리된 이미지. 인코딩된 바이트와 MIME 타입, detail 레벨, 크기 정보를 가짐.
+    """
+
+    def __init__(self, data, mime_type, detail, original_bytes, width, height):
+        self.data = data
+        self.mime_type = mime_type
+        self.detail = detail
+        self.original_bytes = original_bytes
+        self.width = width
+        self.height = height
+
+    @property
+    def processed_bytes(self):
+        return len(self.data)
+
+
+def prepare_image(
+    image_data: bytes,
+    max_edge: int = IMAGE_MAX_EDGE,
+    image_format: str = IMAGE_FORMAT,
+    quality: int = IMAGE_QUALITY,
+) -> PreparedImage:
+    """
+    긴 변을 max_edge 로 제한하고 EXIF 를 제거한 뒤 JPEG/WebP 로 재인코딩.
+    최종 해상도에 맞는 detail 레벨(low/high)을 함께 결정.
+    """
+    if image_format not in _MIME_TYPES:
+        raise ValueError(f"지원하지 않는 이미지 포맷: {image_format}")
+
+    with Image.open(io.BytesIO(image_data)) as image:
+        # JPEG 는 max_edge 이상인 가장 작은 배율(1/2, 1/4, 1/8)로 디코딩해 원본 해상도 전체를 펼치지 않음.
+        # 회전 전에 적용해야 하므로 가로/세로 모두 max_edge 이상이 되도록 정사각형으로 요청
+        image.draft(None, (max_edge, max_edge))
+        # EXIF 회전 정보를 픽셀에 반영한 뒤 메타데이터 없이 새로 저장
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        width, height = image.size
+        buffer = io.BytesIO()
+        image.save(buffer, format=image_format, quality=quality, optimize=True)
+    data = buffer.getvalue()
+    mime_type = _MIME_TYPES[image_format]
+
+    detail = "low" if max(width, height) <= LOW_DETAIL_MAX_EDGE else "high"
+    prepared = PreparedImage(data, mime_type, detail, len(image_data), width, height)
+    logger.info(
+        f"이미지 전처리 완료 | {prepared.original_bytes:,} → {prepared.processed_bytes:,} bytes "
+        f"| {width}x{height} | {mime_type} | detail: {detail}"
+    )
+    return prepared
+
+
+# dHash 한 변의 비트 수. 8 이면 64비트 해시
+DHASH_SIZE = 8
+
+
+def compute_dhash(image_data: bytes, hash_size: int = DHASH_SIZE) -> int:
+    """
+    지각 해시(difference hash). 흑백 (hash_size+1)x hash_size 로 줄인 뒤 가로로 이웃한 픽셀의 밝기 비교를 비트로 담은 정수.
+    재저장, 크기 변경, 약간의 밝기 변화에는 거의 바뀌지 않고, 서로 다른 사진은 평균 절반 정도의 비트가 다름.
+    """
+    with Image.open(io.BytesIO(image_data)) as image:
+        # JPEG 는 필요한 크기 근처까지 축소 디코딩해 전체 해상도 디코딩을 피함
+        image.draft("L", (hash_size * 8, hash_size * 8))
+        image = ImageOps.exif_transpose(image).convert("L")
+        pixels = list(image.resize((hash_size + 1, hash_size), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
@@ -0,0 +1,132 @@
+import base64
+import hashlib
+import sqlite3
+from functools import cached_property
+from typing import Optional, Union
+
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def compute_image_hash(image_data: bytes) -> str:
+    """
+    이미지 바이트의 SHA-256 해시(hex). images 테이블의 키로 사용.
+    """
+    return hashlib.sha256(image_data).hexdigest()
+
+
+def to_db_dhash(dhash: int) -> int:
+    """
+    64비트 부호 없는 dHash 를 SQLite INTEGER(부호 있는 64비트)로 저장할 수 있게 변환.
+    """
+    return dhash - (1 << 64) if dhash >= 1 << 63 else dhash
+
+
+def from_db_dhash(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def compute_image_dhash(image_data: bytes) -> Optional[int]:
+    """
+    images.dhash 에 저장할 값. 이미지로 읽을 수 없는 데이터면 None.
+    """
+    dhash = IngestedImage(image_data).dhash
+    return None if dhash is None else to_db_dhash(dhash)
+
+
+class IngestedImage:
+    """
+    한 번 읽어 들인 이미지. 같은 바이트로 SHA-256, 지각 해시, API 전처리, DB 저장을 모두 처리해
+    파일을 다시 읽지 않음. data 는 변경 불가능한 bytes 라 io.BytesIO, hashlib, base64, sqlite3 가
+    복사본 없이 그대로 읽음. 해시는 처음 필요할 때 한 번만 계산.
+    release() 로 바이트를 놓으면 해시는 남기고, 다시 필요할 때 path 에서 읽음 (일괄 분석처럼 여러 장을 들고 있을 때).
+    그 사이 파일이 지워지거나 바뀌었으면 data 는 OSError/ValueError 를 냄.
+    """
+
+    def __init__(self, data: bytes, path: Optional[str] = None):
+        self._data = data
+        self.path = path
+        self.size = len(data)
+
+    @property
+    def released(self) -> bool:
+        return self._data is None
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            if compute_image_hash(data) != self.sha256:
+                raise ValueError(f"분석 후 이미지 파일이 바뀌었습니다: {self.path}")
+            return data
+        return self._data
+
+    @cached_property
+    def sha256(self) -> str:
+        return compute_image_hash(self._data)
+
+    @cached_property
+    def dhash(self) -> Optional[int]:
+        """
+        부호 없는 64비트 dHash. 이미지로 읽을 수 없으면 None.
+        """
+        # Pillow 는 처음 필요할 때 불러옴 (DB 모듈 import 만으로 시작 시간이 늘지 않도록)
+        from utils.image_processor import compute_dhash
+
+        try:
+            return compute_dhash(self._data)
+        except Exception as e:
+            logger.warning(f"지각 해시 계산 실패: {e}")
+            return None
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.data).decode("ascii")
+
+    def release(self) -> None:
+        """
+        해시를 계산해 둔 뒤 바이트 참조를 놓음. path 가 없으면 다시 읽을 수 없으므로 그대로 둠.
+        """
+        if self.path is not None and self._data is not None:
+            # 놓기 전에 저장에 필요한 해시를 계산해 둠
+            _ = self.sha256, self.dhash
+            self._data = None
+
+
+def store_image(conn: sqlite3.Connection, image: Union[bytes, IngestedImage, None]) -> Optional[str]:
+    """
+    이미지를 images 테이블에 한 번만 저장하고 해시를 반환. 같은 이미지는 다시 저장하지 않음.
+    처음 저장할 때 비슷한 사진 검색용 지각 해시(dhash)도 함께 저장함.
+    IngestedImage 를 받으면 이미 계산한 해시와 읽어 둔 바이트를 그대로 사용.
+    release() 한 이미지의 파일을 다시 읽을 수 없으면 경고만 남기고 None 을 반환해,
+    파일 하나 때문에 호출자의 트랜잭션(일괄 분석 결과 전체)이 롤백되지 않게 함.
+    호출자의 트랜잭션 안에서 실행되어야 함.
+    """
+    if image is None:
+        return None
+    if not isinstance(image, IngestedImage):
+        image = IngestedImage(image)
+    exists = conn.execute("SELECT 1 FROM images WHERE hash=?", (image.sha256,)).fetchone()
+    if exists is None:
+        try:
+            data = image.data
+        except (OSError, ValueError) as e:
+            if not image.released:
+                raise
+            logger.warning(f"이미지를 다시 읽지 못해 이미지 없이 저장: {e}")
+            return None
+        dhash = image.dhash
+        conn.execute(
+            "INSERT INTO images (hash, data, size, dhash) VALUES (?, ?, ?, ?)",
+            (image.sha256, data, image.size, None if dhash is None else to_db_dhash(dhash)),
+        )
+    return image.sha256
+
+
+def read_image_file(path: str) -> IngestedImage:
+    """
+    이미지 파일을 한 번 읽어 IngestedImage 로 반환. 분석, 해시, 저장은 모두 이 객체로 처리.
+    """
+    with open(path, "rb") as f:
+        return IngestedImage(f.read(), path)
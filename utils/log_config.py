@@ -1,14 +1,105 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+from utils.config import LOG_BACKUP_COUNT, LOG_FILE, LOG_LEVEL, LOG_MAX_BYTES
+
+LOG_FORMAT = "[%(asctime)s] %(levelname)s [%(name)s] %(message)s"
+
+_queue_handler = None
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def rate_limited(interval: float = 1.0):
+    """
+    hot path 로그용 extra. 같은 호출 위치의 로그는 interval 초에 한 번만 남기고, 생략된 건수는 다음 로그에 붙임.
+        logger.debug("셀 마우스오버: row=%d", row, extra=rate_limited(1.0))
+    """
+    return {"rate_limit": interval}
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    extra=rate_limited(...) 로 남긴 로그를 호출 위치(파일, 줄)별로 제한하는 필터.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.last_emitted = {}
+        self.suppressed = {}
+
+    def filter(self, record):
+        interval = getattr(record, "rate_limit", None)
+        if interval is None:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_emitted.get(key, float("-inf")) < interval:
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                return False
+            self.last_emitted[key] = now
+            skipped = self.suppressed.pop(key, 0)
+        if skipped:
+            record.msg = f"{record.msg} (이전 {skipped}건 생략)"
+        return True
+
+
+def _build_sinks():
+    formatter = logging.Formatter(LOG_FORMAT)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    handlers = [stream_handler]
+    if LOG_FILE:
+        log_dir = os.path.dirname(LOG_FILE)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    return handlers
+
+
+def _get_queue_handler():
+    """
+    모든 앱 로거가 공유하는 QueueHandler 를 처음 호출될 때 만들고 QueueListener 를 시작.
+    로그를 남기는 스레드(UI 포함)는 큐에 넣기만 하고, 콘솔/파일 출력은 리스너 스레드가 처리함.
+    """
+    global _queue_handler, _listener
+    with _setup_lock:
+        if _queue_handler is None:
+            log_queue = queue.SimpleQueue()
+            _queue_handler = logging.handlers.QueueHandler(log_queue)
+            _queue_handler.addFilter(RateLimitFilter())
+            _listener = logging.handlers.QueueListener(log_queue, *_build_sinks(), respect_handler_level=True)
+            _listener.start()
+            atexit.register(stop_logging)
+    return _queue_handler
+
+
+def stop_logging():
+    """
+    큐에 남은 로그를 모두 출력하고 리스너 스레드를 종료.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
 
 
 def get_logger(name: str = None):
     logger = logging.getLogger(name)
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "[%(asctime)s] %(levelname)s [%(name)s] %(message)s"
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+        logger.addHandler(_get_queue_handler())
+        logger.propagate = False
+    logger.setLevel(LOG_LEVEL)
     return logger
@@ -0,0 +1,181 @@
+import collections
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from utils.config import TRACE_ENABLED, TRACE_MAX_SPANS
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+# 이름별 지연 통계(p50/p95)에 사용할 최근 측정값 수
+STATS_WINDOW = 1000
+
+
+class Span:
+    """
+    측정된 구간 하나. start_us/duration_us 는 time.perf_counter 기준 마이크로초.
+    """
+
+    __slots__ = ("name", "category", "start_us", "duration_us", "thread_id", "args")
+
+    def __init__(self, name, category, start_us, duration_us, thread_id, args):
+        self.name = name
+        self.category = category
+        self.start_us = start_us
+        self.duration_us = duration_us
+        self.thread_id = thread_id
+        self.args = args
+
+
+def _percentile(sorted_values, ratio):
+    index = min(len(sorted_values) - 1, round(ratio * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+class Tracer:
+    """
+    스레드 안전한 구간(span) 기록기. 최근 max_spans 개 구간과 이름별 최근 측정값, 토큰 사용량을 메모리에 보관.
+    """
+
+    def __init__(self, max_spans: int = TRACE_MAX_SPANS, enabled: bool = TRACE_ENABLED):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.spans = collections.deque(maxlen=max_spans)
+        self.durations = {}
+        self.usage = collections.Counter()
+
+    @contextmanager
+    def span(self, name: str, category: str = "app", **args):
+        """
+        with 블록의 실행 시간을 기록. 블록 안에서 yield 된 dict 에 값을 넣으면 span 의 args 로 남음.
+        예외가 나도 기록하며, 이때 args["error"] 에 예외 타입 이름을 남김.
+        """
+        if not self.enabled:
+            yield args
+            return
+        started = time.perf_counter_ns()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            self.add(Span(name, category, started // 1000, elapsed // 1000, threading.get_ident(), args))
+
+    def record(self, name: str, category: str, started_ns: int, **args) -> None:
+        """
+        with 블록으로 감쌀 수 없는 구간(예: 요청 시작부터 첫 응답 조각까지)을 started_ns 부터 지금까지로 기록.
+        """
+        if self.enabled:
+            elapsed = time.perf_counter_ns() - started_ns
+            self.add(Span(name, category, started_ns // 1000, elapsed // 1000, threading.get_ident(), args))
+
+    def add(self, span: Span) -> None:
+        with self.lock:
+            self.spans.append(span)
+            durations = self.durations.get(span.name)
+            if durations is None:
+                durations = self.durations[span.name] = collections.deque(maxlen=STATS_WINDOW)
+            durations.append(span.duration_us)
+
+    def record_usage(self, usage: Any) -> None:
+        """
+        OpenAI 응답의 usage(prompt/completion/total_tokens)를 누적.
+        """
+        if usage is None:
+            return
+        with self.lock:
+            self.usage["requests"] += 1
+            for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                self.usage[field] += getattr(usage, field, None) or 0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        이름별 최근 측정값의 {count, p50_ms, p95_ms, max_ms} 반환.
+        """
+        with self.lock:
+            snapshot = {name: sorted(values) for name, values in self.durations.items()}
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": _percentile(values, 0.5) / 1000,
+                "p95_ms": _percentile(values, 0.95) / 1000,
+                "max_ms": values[-1] / 1000,
+            }
+            for name, values in snapshot.items()
+            if values
+        }
+
+    def token_usage(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.usage)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.spans.clear()
+            self.durations.clear()
+            self.usage.clear()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        chrome://tracing, Perfetto 에서 열 수 있는 Trace Event 형식(dict)으로 변환.
+        """
+        pid = os.getpid()
+        with self.lock:
+            spans = list(self.spans)
+            usage = dict(self.usage)
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start_us,
+                "dur": span.duration_us,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {key: value if isinstance(value, (int, float, str, bool)) else str(value) for key, value in span.args.items()},
+            }
+            for span in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"token_usage": usage}}
+
+    def export_chrome_trace(self, path: str) -> int:
+        """
+        기록된 구간을 Chrome trace JSON 파일로 저장. 저장한 구간 수 반환.
+        """
+        trace = self.to_chrome_trace()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False)
+        logger.info(f"Chrome trace 저장 완료: {path}, {len(trace['traceEvents'])}건")
+        return len(trace["traceEvents"])
+
+
+tracer = Tracer()
+
+
+def span(name: str, category: str = "app", **args):
+    return tracer.span(name, category, **args)
+
+
+def traced(name: Optional[str] = None, category: str = "app"):
+    """
+    함수 실행 시간을 span 으로 기록하는 데코레이터. name 을 생략하면 함수 이름 사용.
+    """
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator